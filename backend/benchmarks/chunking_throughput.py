@@ -0,0 +1,116 @@
+"""
+Benchmark: character chunker vs token-aware chunker
+
+Compares the previous fixed-offset character chunker with
+core.ai.chunking on a synthetic RFP (numbered sections, prose, tables).
+Reports throughput, chunk count, budget utilization, chunks over the
+token budget and chunks that start or end mid-word. Run from backend/:
+
+    python -m benchmarks.chunking_throughput --mb 5 --tokens 1000
+"""
+import argparse
+import random
+import time
+
+from core.ai import chunking
+
+WORDS = (
+    "vendor shall provide the services described herein including support maintenance "
+    "hosting security compliance reporting pricing milestones acceptance criteria "
+    "deliverables warranty liability termination confidentiality insurance"
+).split()
+
+
+def make_rfp(target_bytes: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    parts = []
+    size = 0
+    section = 0
+    while size < target_bytes:
+        section += 1
+        section_parts = [f"{section}. {rng.choice(WORDS).upper()} REQUIREMENTS"]
+        for _ in range(rng.randint(3, 8)):
+            sentences = [
+                " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 25))).capitalize() + "."
+                for _ in range(rng.randint(2, 6))
+            ]
+            section_parts.append(" ".join(sentences))
+        if rng.random() < 0.3:
+            rows = [f"{i} | {rng.choice(WORDS)} | {rng.randint(1, 500)}" for i in range(rng.randint(5, 20))]
+            section_parts.append("Item | Description | Qty\n" + "\n".join(rows))
+        parts.extend(section_parts)
+        size += sum(len(p) + 2 for p in section_parts)
+    return "\n\n".join(parts)
+
+
+def legacy_chunk_text(text: str, chunk_size: int = 4000, overlap: int = 200) -> list[str]:
+    """The previous DocumentProcessor.chunk_text"""
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = start + chunk_size
+        chunks.append(text[start:end])
+        start = end - overlap
+    return chunks
+
+
+VOCABULARY = set(WORDS) | {"item", "description", "qty", "requirements"}
+
+
+def _whole_word(word: str) -> bool:
+    word = word.strip(".|").lower()
+    return not word or word.isdigit() or word in VOCABULARY
+
+
+def measure(name: str, chunk, text: str, max_tokens: int) -> dict:
+    start = time.perf_counter()
+    chunks = chunk()
+    elapsed = time.perf_counter() - start
+    tokens = chunking.get_tokenizer().count_batch(chunks)
+    broken = sum(1 for c in chunks if not _whole_word(c.split(None, 1)[0]) or not _whole_word(c.rsplit(None, 1)[-1]))
+    return {
+        "name": name,
+        "mb_per_s": len(text) / 1e6 / elapsed,
+        "chunks": len(chunks),
+        "fill": sum(tokens) / (len(chunks) * max_tokens),
+        "over_budget": sum(1 for t in tokens if t > max_tokens),
+        "broken": broken,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=float, default=5.0)
+    parser.add_argument("--tokens", type=int, default=1000)
+    parser.add_argument("--overlap", type=int, default=50)
+    args = parser.parse_args()
+
+    text = make_rfp(int(args.mb * 1e6))
+    tokenizer = chunking.get_tokenizer()
+    print(f"{len(text) / 1e6:.1f} MB, budget {args.tokens} tokens, tokenizer={tokenizer.name}")
+
+    chars_per_token = len(text) / tokenizer.count(text)
+    results = [
+        measure(
+            "character",
+            lambda: legacy_chunk_text(text, int(args.tokens * chars_per_token), int(args.overlap * chars_per_token)),
+            text,
+            args.tokens,
+        ),
+        measure(
+            "token",
+            lambda: [c.text for c in chunking.chunk_text(text, args.tokens, args.overlap)],
+            text,
+            args.tokens,
+        ),
+    ]
+    print(f"{'chunker':<10} {'MB/s':>8} {'chunks':>7} {'fill':>6} {'over':>5} {'mid-word':>9}")
+    for r in results:
+        print(
+            f"{r['name']:<10} {r['mb_per_s']:>8.1f} {r['chunks']:>7} {r['fill']:>6.0%} "
+            f"{r['over_budget']:>5} {r['broken']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Shared benchmark helpers
+"""
+import asyncio
+import time
+from typing import List
+
+import httpx
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class LatencyProbe:
+    """
+    Hit a cheap endpoint on a fixed schedule while a workload runs.
+    Latency is measured from when each probe was *due*, so time spent
+    waiting on a blocked event loop is counted (no coordinated omission).
+    """
+
+    def __init__(self, client: httpx.AsyncClient, path: str = "/health", interval: float = 0.01):
+        self.client = client
+        self.path = path
+        self.interval = interval
+        self.latencies: List[float] = []
+        self._done = asyncio.Event()
+        self._task = None
+
+    async def _run(self):
+        due = time.perf_counter()
+        while True:
+            await self.client.get(self.path)
+            now = time.perf_counter()
+            self.latencies.append((now - due) * 1000)
+            if self._done.is_set():
+                break
+            due = max(due + self.interval, now)
+            await asyncio.sleep(max(0.0, due - now))
+
+    async def __aenter__(self):
+        self._task = asyncio.create_task(self._run())
+        await asyncio.sleep(0.05)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._done.set()
+        await self._task
+
+    def summary(self) -> dict:
+        return {
+            "samples": len(self.latencies),
+            "p50_ms": percentile(self.latencies, 50),
+            "p99_ms": percentile(self.latencies, 99),
+            "max_ms": max(self.latencies),
+        }
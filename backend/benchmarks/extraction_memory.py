@@ -0,0 +1,75 @@
+"""
+Benchmark: peak memory of PDF extraction modes (tracemalloc)
+
+Compares, for a synthetic PDF:
+  inline  - previous behaviour: PyPDF2 reader, page list and joined text in-process
+  pool    - DocumentProcessor.extract_text, then the text cut into compressed pages
+  stream  - DocumentService._extract (pages compressed as they are parsed), as uploads do
+
+tracemalloc only sees this process; parsing in pool workers is not counted,
+which is the point - the API process no longer holds the reader.
+Run from backend/:
+
+    python -m benchmarks.extraction_memory --pages 1000
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import PyPDF2
+
+from core.ai.document_processor import DocumentProcessor
+from shared.services.document_service import DocumentService
+from benchmarks.synthetic_pdf import make_pdf
+
+
+async def inline(pdf_path: Path, tmp: Path):
+    with open(pdf_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        pages = [{'page': n + 1, 'text': p.extract_text()} for n, p in enumerate(pdf_reader.pages)]
+        text = "\n\n".join(p['text'] for p in pages)
+    return len(text)
+
+
+async def pool(pdf_path: Path, tmp: Path):
+    result = await DocumentProcessor.extract_text(pdf_path)
+    pages = DocumentService._compress_pages(result)
+    return sum(page.char_count for page in pages)
+
+
+async def stream(pdf_path: Path, tmp: Path):
+    _, pages = await DocumentService._extract(pdf_path)
+    return sum(page.char_count for page in pages)
+
+
+async def measure(name, func, pdf_path: Path, tmp: Path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    chars = await func(pdf_path, tmp)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<8} {elapsed:>8.2f} {peak / 2**20:>10.1f} {chars:>12,}")
+
+
+async def main(pages: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        pdf_path = make_pdf(tmp / "rfp.pdf", pages)
+        await DocumentProcessor.inspect_pdf(pdf_path)  # warm the pool
+
+        print(f"{pages}-page PDF ({pdf_path.stat().st_size / 2**20:.1f} MiB)")
+        print(f"{'mode':<8} {'time s':>8} {'peak MiB':>10} {'chars':>12}")
+        for name, func in (("inline", inline), ("pool", pool), ("stream", stream)):
+            await measure(name, func, pdf_path, tmp)
+    DocumentProcessor.shutdown_executor()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.pages))
@@ -0,0 +1,87 @@
+"""
+Benchmark: /health latency while PDFs are being extracted
+
+Compares extraction inline on the event loop (previous behaviour) with the
+process-pool DocumentProcessor. Run from backend/:
+
+    python -m benchmarks.health_latency --uploads 8 --pages 100
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+
+from core.ai.document_processor import DocumentProcessor, _extract_pdf_pages
+from benchmarks.common import LatencyProbe
+from benchmarks.synthetic_pdf import make_pdf
+
+
+def build_app(mode: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    @app.post("/extract")
+    async def extract(path: str):
+        if mode == "inline":
+            pages = _extract_pdf_pages(path, 0, 10 ** 9)
+            return {"num_pages": len(pages)}
+        result = await DocumentProcessor.extract_text(Path(path))
+        return {"num_pages": result["num_pages"]}
+
+    return app
+
+
+async def run(mode: str, pdf_path: Path, uploads: int) -> dict:
+    transport = httpx.ASGITransport(app=build_app(mode))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def upload():
+            response = await client.post("/extract", params={"path": str(pdf_path)}, timeout=None)
+            response.raise_for_status()
+
+        async with LatencyProbe(client) as probe:
+            start = time.perf_counter()
+            await asyncio.gather(*[upload() for _ in range(uploads)])
+            wall = time.perf_counter() - start
+
+    latency = probe.summary()
+    return {
+        "mode": mode,
+        "wall_s": wall,
+        "health_samples": latency["samples"],
+        "health_p50_ms": latency["p50_ms"],
+        "health_p99_ms": latency["p99_ms"],
+        "health_max_ms": latency["max_ms"],
+    }
+
+
+async def main(uploads: int, pages: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = make_pdf(Path(tmp) / "rfp.pdf", pages)
+        # Warm the pool so process start-up is not counted
+        await DocumentProcessor.extract_text(pdf_path)
+
+        print(f"{uploads} concurrent uploads of a {pages}-page PDF")
+        print(f"{'mode':<8} {'wall s':>8} {'samples':>8} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        for mode in ("inline", "pool"):
+            r = await run(mode, pdf_path, uploads)
+            print(
+                f"{r['mode']:<8} {r['wall_s']:>8.2f} {r['health_samples']:>8} "
+                f"{r['health_p50_ms']:>9.1f} {r['health_p99_ms']:>9.1f} {r['health_max_ms']:>9.1f}"
+            )
+    DocumentProcessor.shutdown_executor()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--uploads", type=int, default=8)
+    parser.add_argument("--pages", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.uploads, args.pages))
@@ -0,0 +1,85 @@
+"""
+Benchmark: login throughput and /health latency during a login burst
+
+Compares bcrypt verification inline on the event loop (previous behaviour)
+with the bounded password executor in core.security. Run from backend/:
+
+    python -m benchmarks.login_throughput --logins 32
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI, HTTPException
+
+from core.config import settings
+from core.security import pwd_context, verify_and_update_password
+from benchmarks.common import LatencyProbe
+
+PASSWORD = "correct horse battery staple"
+
+
+def build_app(mode: str, hashed_password: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    @app.post("/login")
+    async def login():
+        if mode == "inline":
+            valid = pwd_context.verify(PASSWORD, hashed_password)
+        else:
+            valid, _ = await verify_and_update_password(PASSWORD, hashed_password)
+        if not valid:
+            raise HTTPException(status_code=401)
+        return {"ok": True}
+
+    return app
+
+
+async def run(mode: str, hashed_password: str, logins: int) -> dict:
+    transport = httpx.ASGITransport(app=build_app(mode, hashed_password))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def login():
+            response = await client.post("/login", timeout=None)
+            response.raise_for_status()
+
+        async with LatencyProbe(client) as probe:
+            start = time.perf_counter()
+            await asyncio.gather(*[login() for _ in range(logins)])
+            wall = time.perf_counter() - start
+
+    latency = probe.summary()
+    return {
+        "mode": mode,
+        "logins_per_s": logins / wall,
+        "health_samples": latency["samples"],
+        "health_p50_ms": latency["p50_ms"],
+        "health_p99_ms": latency["p99_ms"],
+        "health_max_ms": latency["max_ms"],
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=32)
+    args = parser.parse_args()
+
+    hashed_password = pwd_context.hash(PASSWORD)
+    print(f"bcrypt rounds={settings.BCRYPT_ROUNDS}, workers={settings.PASSWORD_HASH_WORKERS}, logins={args.logins}")
+
+    results = [await run(mode, hashed_password, args.logins) for mode in ("inline", "executor")]
+    print(f"{'mode':<10} {'logins/s':>9} {'samples':>8} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for r in results:
+        print(
+            f"{r['mode']:<10} {r['logins_per_s']:>9.1f} {r['health_samples']:>8} "
+            f"{r['health_p50_ms']:>9.1f} {r['health_p99_ms']:>9.1f} {r['health_max_ms']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
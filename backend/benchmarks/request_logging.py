@@ -0,0 +1,113 @@
+"""
+Benchmark: /health requests/sec under the request logging middleware
+
+Compares the previous BaseHTTPMiddleware logger (two synchronous log lines
+per request) with core.middleware.RequestLoggingMiddleware over an
+enqueued sink, with and without sampling. Log lines go to a temporary
+file. Run from backend/:
+
+    python -m benchmarks.request_logging --requests 5000 --concurrency 50
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI, Request
+from loguru import logger
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from core.middleware import RequestLoggingMiddleware
+
+
+class LegacyRequestLoggingMiddleware(BaseHTTPMiddleware):
+    """RequestLoggingMiddleware as it was before the ASGI rewrite"""
+    async def dispatch(self, request: Request, call_next):
+        request_id = str(uuid.uuid4())
+        request.state.request_id = request_id
+        start_time = time.time()
+        logger.info(f"📥 {request.method} {request.url.path}", request_id=request_id)
+        response = await call_next(request)
+        duration = time.time() - start_time
+        logger.info(
+            f"📤 {request.method} {request.url.path} - {response.status_code} ({duration:.3f}s)",
+            request_id=request_id
+        )
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
+STACKS = {
+    # name: (middleware, options, enqueue)
+    "none": (None, {}, False),
+    "legacy": (LegacyRequestLoggingMiddleware, {}, False),
+    "asgi-sync": (RequestLoggingMiddleware, {}, False),
+    "asgi": (RequestLoggingMiddleware, {}, True),
+    "asgi-sampled": (RequestLoggingMiddleware, {"sample_rate": 0.1}, True),
+}
+
+
+def build_app(name: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    middleware, options, _ = STACKS[name]
+    if middleware is not None:
+        app.add_middleware(middleware, **options)
+    return app
+
+
+async def run(name: str, log_path: Path, requests: int, concurrency: int) -> dict:
+    _, _, enqueue = STACKS[name]
+    logger.remove()
+    sink = logger.add(log_path, level="INFO", enqueue=enqueue)
+
+    transport = httpx.ASGITransport(app=build_app(name))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = requests
+
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                response = await client.get("/health")
+                response.raise_for_status()
+
+        await client.get("/health")  # warm up
+        start = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        wall = time.perf_counter() - start
+
+    await logger.complete()
+    logger.remove(sink)
+    lines = sum(1 for _ in open(log_path, encoding="utf-8")) if log_path.exists() else 0
+    log_path.unlink(missing_ok=True)
+    return {"stack": name, "requests_per_s": requests / wall, "log_lines": lines}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = [
+            await run(name, Path(directory) / f"{name}.log", args.requests, args.concurrency)
+            for name in STACKS
+        ]
+
+    print(f"requests={args.requests}, concurrency={args.concurrency}")
+    print(f"{'stack':<14} {'req/s':>9} {'log lines':>10}")
+    for r in results:
+        print(f"{r['stack']:<14} {r['requests_per_s']:>9.0f} {r['log_lines']:>10}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,129 @@
+"""
+Benchmark: serializing a listing of 1,000 evaluations
+
+Serves the same rows three ways and times whole requests (the query is
+left out: rows are built in memory):
+
+  before  model_validate per row, response_model re-validation, stdlib json
+  orjson  the same route code under core.responses.JSONResponse
+  fast    dump_rows + fast_response (no response models, orjson)
+
+Both the list projection used by GET /api/v1/rfp/ and full evaluations with
+their JSON columns (summary, requirements, risks, recommendations) are
+measured. Response bodies are checked to be identical apart from the
+timestamp. Run from backend/:
+
+    python -m benchmarks.response_serialization --rows 1000 --requests 50
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from typing import List
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse as StdlibJSONResponse
+
+from core.responses import JSONResponse, dump_rows, fast_response
+from projects.rfp_evaluation.schemas import RFPEvaluationListItem, RFPEvaluationResponse
+from shared.schemas.base import PaginatedResponse, PaginationMeta
+
+SCHEMAS = {"list": RFPEvaluationListItem, "full": RFPEvaluationResponse}
+
+
+def make_rows(count: int) -> List[SimpleNamespace]:
+    created = datetime(2024, 5, 1, 9, 30, 15, 123456)
+    return [
+        SimpleNamespace(
+            id=i,
+            document_id=i,
+            rfp_title=f"RFP {i}: Facilities management services",
+            rfp_type="services",
+            status="completed",
+            evaluation_summary="The vendor must provide facilities management across all sites. " * 12,
+            key_requirements=[
+                {"requirement": f"Requirement {j}", "category": "technical", "priority": "high", "page": j}
+                for j in range(15)
+            ],
+            compliance_score=72.5,
+            weighted_score=6.8,
+            risk_assessment={"risks": [
+                {"risk": f"Risk {j}", "severity": "medium", "mitigation": "Contractual penalty clause. " * 3}
+                for j in range(6)
+            ]},
+            recommendations=[f"Recommendation {j}: clarify the service levels." for j in range(8)],
+            ai_model_used="gpt-4o",
+            processing_time_ms=12345,
+            tokens_used=40210,
+            created_at=created,
+            updated_at=created,
+        )
+        for i in range(count)
+    ]
+
+
+def build_app(stack: str, schema, rows) -> FastAPI:
+    app = FastAPI(default_response_class=StdlibJSONResponse if stack == "before" else JSONResponse)
+    pagination = PaginationMeta(page=1, page_size=len(rows), total=len(rows))
+
+    @app.get("/evaluations", response_model=PaginatedResponse[schema])
+    async def list_evaluations():
+        if stack == "fast":
+            return fast_response(dump_rows(schema, rows), message="Evaluations retrieved", pagination=pagination)
+        return PaginatedResponse(
+            data=[schema.model_validate(row) for row in rows],
+            pagination=pagination,
+            message="Evaluations retrieved"
+        )
+
+    return app
+
+
+async def run(stack: str, schema, rows, requests: int) -> dict:
+    transport = httpx.ASGITransport(app=build_app(stack, schema, rows))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.get("/evaluations")  # warm up
+        response.raise_for_status()
+        durations = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            await client.get("/evaluations")
+            durations.append((time.perf_counter() - start) * 1000)
+    body = json.loads(response.content)
+    body.pop("timestamp")
+    return {
+        "stack": stack,
+        "median_ms": statistics.median(durations),
+        "min_ms": min(durations),
+        "bytes": len(response.content),
+        "body": body,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    print(f"rows={args.rows}, requests={args.requests}")
+    print(f"{'schema':<6} {'stack':<8} {'median ms':>10} {'min ms':>8} {'KB':>7} {'speedup':>8}")
+    for name, schema in SCHEMAS.items():
+        results = [await run(stack, schema, rows, args.requests) for stack in ("before", "orjson", "fast")]
+        baseline = results[0]
+        for r in results:
+            if r["body"] != baseline["body"]:
+                raise SystemExit(f"{name}/{r['stack']}: response differs from the 'before' stack")
+            print(
+                f"{name:<6} {r['stack']:<8} {r['median_ms']:>10.1f} {r['min_ms']:>8.1f} "
+                f"{r['bytes'] / 1024:>7.0f} {baseline['median_ms'] / r['median_ms']:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,56 @@
+"""
+Synthetic PDF generator for benchmarks
+Writes text-only PDFs without any extra dependency
+"""
+from pathlib import Path
+
+LOREM = (
+    "The contractor shall provide a fully managed service covering design, "
+    "implementation, hosting and support for the duration of the contract."
+)
+
+
+def make_pdf(path: Path, num_pages: int, lines_per_page: int = 40) -> Path:
+    """Write a PDF with `num_pages` pages of plain text"""
+    objects = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog_id = add(b"")  # filled in once the page tree exists
+    pages_id = add(b"")
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    page_ids = []
+    for page_num in range(1, num_pages + 1):
+        lines = [f"Page {page_num} requirement {n}: {LOREM}"[:110] for n in range(lines_per_page)]
+        text = " T* ".join(f"({line})Tj" for line in lines)
+        stream = f"BT /F1 9 Tf 12 TL 36 800 Td {text} ET".encode("latin-1")
+        content_id = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+            % (pages_id, font_id, content_id)
+        ))
+
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+    objects[catalog_id - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for obj_id, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (obj_id, body)
+
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog_id, xref_offset
+    )
+
+    path.write_bytes(bytes(out))
+    return path
@@ -0,0 +1,295 @@
+"""
+Token-aware Text Chunking
+Split documents into chunks that fit a model's token budget while keeping
+paragraphs, table rows, pages and section headings intact.
+
+Text is split once into blocks (paragraphs, headings, pages); block token
+counts are computed in one batched tiktoken call and packed greedily, so
+cost is linear in the input size. Only blocks larger than the budget are
+broken further: on lines, then sentences, then raw token boundaries. A
+block that follows a heading is fitted to what the heading leaves, so the
+heading starts the same chunk instead of a chunk of its own.
+"""
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Any, Iterable, List, Optional
+
+import tiktoken
+from loguru import logger
+
+DEFAULT_ENCODING = "cl100k_base"
+
+_BLANK_LINE_RE = re.compile(r"\n[ \t\r]*\n")
+_SENTENCE_RE = re.compile(r"(?<=[.!?;:])\s+")
+_HEADING_RE = re.compile(
+    r"^(?:#{1,6}\s+\S"  # markdown
+    r"|(?:\d+(?:\.\d+)*\.?|[A-Z]\.|[IVX]+\.)\s+[A-Z]"  # 1.2 Scope / A. Terms / IV. Pricing
+    r"|(?i:section|article|appendix|annex|schedule|part)\s+[\w.]+)"
+)
+_MAX_HEADING_CHARS = 80
+
+
+@dataclass
+class Chunk:
+    """A packed chunk of text with its token count and source location"""
+    text: str
+    tokens: int
+    start_page: Optional[int] = None
+    end_page: Optional[int] = None
+    section: Optional[str] = None  # nearest heading at or before the chunk
+
+
+@dataclass
+class _Block:
+    text: str
+    page: Optional[int]
+    heading: bool = False
+    tokens: int = 0
+
+
+class Tokenizer:
+    """
+    Token counting and splitting for one encoding.
+    Falls back to a ~4 characters/token estimate when no BPE encoding is
+    available (tiktoken downloads its files on first use, which fails on
+    air-gapped hosts).
+    """
+
+    APPROX_CHARS_PER_TOKEN = 4
+
+    def __init__(self, encoding: Optional[tiktoken.Encoding]):
+        self.encoding = encoding
+        self.name = encoding.name if encoding else "approximate"
+
+    def count_batch(self, texts: List[str]) -> List[int]:
+        if self.encoding is None:
+            return [-(-len(t) // self.APPROX_CHARS_PER_TOKEN) for t in texts]
+        return [len(tokens) for tokens in self.encoding.encode_ordinary_batch(texts)]
+
+    def count(self, text: str) -> int:
+        return self.count_batch([text])[0]
+
+    def split(self, text: str, max_tokens: int, first_tokens: Optional[int] = None) -> List[str]:
+        """Hard split on token boundaries (last resort for unbroken text); the first piece can be shorter"""
+        if self.encoding is None:
+            units, scale = text, self.APPROX_CHARS_PER_TOKEN
+        else:
+            units, scale = self.encoding.encode_ordinary(text), 1
+        bounds = [0, min(first_tokens or max_tokens, max_tokens) * scale]
+        while bounds[-1] < len(units):
+            bounds.append(bounds[-1] + max_tokens * scale)
+        pieces = [units[start:end] for start, end in zip(bounds, bounds[1:]) if start < len(units)]
+        return pieces if self.encoding is None else [self.encoding.decode(piece) for piece in pieces]
+
+
+@lru_cache(maxsize=16)
+def get_tokenizer(model: Optional[str] = None) -> Tokenizer:
+    """Tokenizer for a model name (unknown names, e.g. Azure deployments, use cl100k_base)"""
+    try:
+        try:
+            encoding = tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding(DEFAULT_ENCODING)
+        except KeyError:
+            encoding = tiktoken.get_encoding(DEFAULT_ENCODING)
+    except Exception as e:
+        logger.warning(f"tiktoken encoding unavailable ({e.__class__.__name__}); using approximate token counts")
+        encoding = None
+    return Tokenizer(encoding)
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Number of tokens `text` encodes to for `model`"""
+    return get_tokenizer(model).count(text)
+
+
+def _is_heading(line: str) -> bool:
+    if len(line) > _MAX_HEADING_CHARS or line[-1] in ".,;" or "|" in line or "\t" in line:
+        return False
+    if _HEADING_RE.match(line):
+        return True
+    letters = sum(c.isalpha() for c in line)
+    return letters >= 3 and line.isupper()
+
+
+def _split_blocks(text: str, page: Optional[int]) -> Iterable[_Block]:
+    """Paragraphs (runs of non-blank lines) with heading lines as their own blocks"""
+    for paragraph in _BLANK_LINE_RE.split(text):
+        lines: List[str] = []
+        for line in paragraph.split("\n"):
+            stripped = line.strip()
+            if not stripped:
+                continue
+            if _is_heading(stripped):
+                if lines:
+                    yield _Block("\n".join(lines), page)
+                    lines = []
+                yield _Block(stripped, page, heading=True)
+            else:
+                lines.append(line.rstrip())
+        if lines:
+            yield _Block("\n".join(lines), page)
+
+
+def _joined_tokens(blocks: List[_Block]) -> int:
+    """Tokens of blocks joined into one chunk (one per separator)"""
+    return sum(b.tokens for b in blocks) + max(len(blocks) - 1, 0)
+
+
+def _trailing_headings(blocks: List[_Block]) -> List[_Block]:
+    count = 0
+    while count < len(blocks) and blocks[-1 - count].heading:
+        count += 1
+    return blocks[len(blocks) - count:]
+
+
+def _fit_blocks(
+    blocks: List[_Block],
+    tokenizer: Tokenizer,
+    max_tokens: int,
+    fitted: Optional[List[_Block]] = None
+) -> List[_Block]:
+    """
+    Count tokens for all blocks, breaking up any that exceed the budget.
+    Blocks after headings get the budget the headings leave, since _pack
+    starts a chunk with them.
+    """
+    # Page headers/footers repeat on every page: count each distinct text once
+    unique = list(dict.fromkeys(b.text for b in blocks))
+    counts: Dict[str, int] = dict(zip(unique, tokenizer.count_batch(unique)))
+
+    fitted = [] if fitted is None else fitted
+    for block in blocks:
+        block.tokens = counts[block.text]
+        headings = _trailing_headings(fitted)
+        room = max_tokens - _joined_tokens(headings) - (1 if headings else 0)
+        if room < max_tokens // 2:  # headings too long to share a chunk: they stand alone
+            room = max_tokens
+        if block.tokens <= room or (block.heading and block.tokens <= max_tokens):
+            fitted.append(block)
+            continue
+        parts = block.text.split("\n")
+        if len(parts) == 1:
+            parts = _SENTENCE_RE.split(block.text)
+        if len(parts) > 1:
+            pieces = [_Block(p, block.page) for p in parts if p.strip()]
+            _fit_blocks(pieces, tokenizer, max_tokens, fitted)
+        elif block.tokens <= max_tokens:
+            fitted.append(block)  # one sentence: rather a heading on its own than cut it
+        else:
+            for n, piece in enumerate(tokenizer.split(block.text, max_tokens, first_tokens=room)):
+                limit = room if n == 0 else max_tokens
+                fitted.append(_Block(piece, block.page, tokens=min(tokenizer.count(piece), limit)))
+    return fitted
+
+
+def _pack(blocks: List[_Block], max_tokens: int, overlap_tokens: int, min_fill: float) -> List[Chunk]:
+    """Greedily pack blocks into chunks, preferring to break before headings"""
+    chunks: List[Chunk] = []
+    current: List[_Block] = []
+    size = 0
+    fresh = 0  # blocks in `current` not already emitted as overlap
+    section: Optional[str] = None
+    chunk_section: Optional[str] = None
+
+    def flush(carry_overlap: bool):
+        nonlocal current, size, fresh, chunk_section
+        if not fresh:
+            return
+        pages = [b.page for b in current if b.page is not None]
+        chunks.append(Chunk(
+            text="\n\n".join(b.text for b in current),
+            tokens=size,
+            start_page=min(pages) if pages else None,
+            end_page=max(pages) if pages else None,
+            section=chunk_section,
+        ))
+        carry: List[_Block] = []
+        carried = 0
+        if carry_overlap:
+            for block in reversed(current):
+                if carried + block.tokens + 1 > overlap_tokens:
+                    break
+                carry.append(block)
+                carried += block.tokens + 1
+        current = carry[::-1]
+        size = max(carried - 1, 0)
+        fresh = 0
+        chunk_section = section
+
+    for block in blocks:
+        if block.heading:
+            # A new section: close a reasonably full chunk instead of splitting the section
+            if fresh and size >= max_tokens * min_fill:
+                flush(carry_overlap=False)
+            section = block.text
+            if not fresh:
+                chunk_section = section
+
+        added = block.tokens + (1 if current else 0)
+        if size + added > max_tokens:
+            # Headings that end the chunk open the next one, with the text they head
+            lead = _trailing_headings(current[len(current) - fresh:])
+            if lead:
+                del current[-len(lead):]
+                fresh -= len(lead)
+                size = _joined_tokens(current)
+            flush(carry_overlap=not lead)
+            if lead:
+                current, size, fresh = lead, _joined_tokens(lead), len(lead)
+                chunk_section = section
+            added = block.tokens + (1 if current else 0)
+            if size + added > max_tokens:
+                flush(carry_overlap=False)  # only emits headings that left no room
+                current, size = [], 0
+                added = block.tokens
+        if not current:
+            chunk_section = section
+        current.append(block)
+        size += added
+        fresh += 1
+
+    flush(carry_overlap=False)
+    return chunks
+
+
+def chunk_pages(
+    pages: List[Dict[str, Any]],
+    max_tokens: int = 1000,
+    overlap_tokens: int = 50,
+    model: Optional[str] = None,
+    min_fill: float = 0.75
+) -> List[Chunk]:
+    """
+    Chunk a document given as [{page, text}] (DocumentProcessor PDF output).
+    Chunks carry the page span they were taken from. Overlap is made of
+    whole trailing blocks (never a cut paragraph) and is not carried
+    across section headings.
+    """
+    if max_tokens <= 0:
+        raise ValueError("max_tokens must be positive")
+    tokenizer = get_tokenizer(model)
+    blocks = [
+        block
+        for page in pages
+        for block in _split_blocks(page.get("text") or "", page.get("page"))
+    ]
+    # Running page headers look like headings; they are not sections
+    heading_pages: Dict[str, set] = {}
+    for block in blocks:
+        if block.heading and block.page is not None:
+            heading_pages.setdefault(block.text, set()).add(block.page)
+    for block in blocks:
+        if block.heading and len(heading_pages.get(block.text, ())) > 2:
+            block.heading = False
+    return _pack(_fit_blocks(blocks, tokenizer, max_tokens), max_tokens, overlap_tokens, min_fill)
+
+
+def chunk_text(
+    text: str,
+    max_tokens: int = 1000,
+    overlap_tokens: int = 50,
+    model: Optional[str] = None,
+    min_fill: float = 0.75
+) -> List[Chunk]:
+    """Chunk plain text; see `chunk_pages`"""
+    return chunk_pages([{"page": None, "text": text}], max_tokens, overlap_tokens, model, min_fill)
@@ -1,68 +1,257 @@
 """
 Document Processing Utilities
 Extract text from PDF, DOCX, TXT for AI processing
+
+Parsing is CPU-bound and synchronous (PyPDF2, python-docx), so it runs in a
+process pool rather than on the event loop. Large PDFs are split into page
+ranges that are extracted in parallel. For bounded memory, `stream_pdf`
+hands pages to the caller as they are parsed instead of materializing the
+document.
 """
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, AsyncIterator, Awaitable, Callable
 from pathlib import Path
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import multiprocessing
+import os
+import time
 import PyPDF2
 import docx
 from loguru import logger
 
+from core.ai import chunking
+from core.config import settings
+from core.metrics import metrics
+from core.profiling import record_span
+
+EXTRACTION_DURATION = metrics.histogram(
+    "aihub_extraction_duration_seconds", "Text extraction time by file format", ["format"]
+)
+EXTRACTION_PAGES = metrics.histogram(
+    "aihub_extraction_pages", "Pages per extracted PDF", ["format"],
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+)
+EXTRACTION_FAILURES = metrics.counter(
+    "aihub_extraction_failures_total", "Failed or timed out extractions by file format", ["format"]
+)
+
+
+def _pdf_metadata(pdf_reader: PyPDF2.PdfReader) -> Dict[str, str]:
+    """Convert PDF document info into a JSON-serializable dict"""
+    info = pdf_reader.metadata or {}
+    return {str(key).lstrip('/'): str(value) for key, value in info.items()}
+
+
+def _inspect_pdf(file_path: str) -> Dict[str, Any]:
+    """Worker: page count and metadata without extracting text"""
+    with open(file_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        return {
+            'num_pages': len(pdf_reader.pages),
+            'metadata': _pdf_metadata(pdf_reader)
+        }
+
+
+def _extract_pdf_pages(file_path: str, start: int, end: int) -> List[Dict[str, Any]]:
+    """Worker: extract text for pages [start, end)"""
+    with open(file_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        return [
+            {'page': page_num + 1, 'text': pdf_reader.pages[page_num].extract_text()}
+            for page_num in range(start, min(end, len(pdf_reader.pages)))
+        ]
+
+
+def _extract_docx(file_path: str) -> List[str]:
+    """Worker: extract non-empty paragraphs from DOCX"""
+    doc = docx.Document(file_path)
+    return [p.text for p in doc.paragraphs if p.text.strip()]
+
 
 class DocumentProcessor:
     """Process various document formats"""
     
+    _executor: Optional[ProcessPoolExecutor] = None
+    
+    @classmethod
+    def get_executor(cls) -> ProcessPoolExecutor:
+        """Lazily create the shared extraction process pool"""
+        if cls._executor is None:
+            max_workers = settings.EXTRACTION_MAX_WORKERS or os.cpu_count() or 1
+            # spawn: never fork the event loop, DB pool or open sockets
+            cls._executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"Extraction process pool started ({max_workers} workers)")
+        return cls._executor
+    
+    @classmethod
+    def shutdown_executor(cls):
+        """Stop the extraction pool, dropping queued work"""
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
+    
+    @classmethod
+    async def _run(cls, func, *args):
+        """Run a worker function in the process pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(cls.get_executor(), func, *args)
+    
     @staticmethod
-    async def extract_text(file_path: Path) -> Dict[str, Any]:
+    async def extract_text(file_path: Path, timeout: Optional[float] = None) -> Dict[str, Any]:
         """
         Extract text from document
         Returns: {text, pages, metadata}
+        Raises asyncio.TimeoutError if extraction exceeds the timeout;
+        cancelling the caller cancels any page ranges not yet started.
         """
         extension = file_path.suffix.lower()
         
         if extension == '.pdf':
-            return await DocumentProcessor._extract_from_pdf(file_path)
+            extractor = DocumentProcessor._extract_from_pdf(file_path)
         elif extension in ['.docx', '.doc']:
-            return await DocumentProcessor._extract_from_docx(file_path)
+            extractor = DocumentProcessor._extract_from_docx(file_path)
         elif extension == '.txt':
-            return await DocumentProcessor._extract_from_txt(file_path)
+            extractor = DocumentProcessor._extract_from_txt(file_path)
         else:
             raise ValueError(f"Unsupported file format: {extension}")
+        
+        return await DocumentProcessor._measure(extractor, file_path, timeout)
+    
+    @staticmethod
+    async def _measure(extractor: Awaitable[Dict[str, Any]], file_path: Path, timeout: Optional[float]) -> Dict[str, Any]:
+        """Await an extraction under the extraction timeout, recording its metrics"""
+        file_format = file_path.suffix.lower().lstrip('.')
+        timeout = timeout or settings.EXTRACTION_TIMEOUT_SECONDS
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(extractor, timeout=timeout)
+        except asyncio.TimeoutError:
+            EXTRACTION_FAILURES.inc(file_format)
+            logger.error(f"Extraction timed out after {timeout}s: {file_path.name}")
+            raise
+        except Exception:
+            EXTRACTION_FAILURES.inc(file_format)
+            raise
+        
+        record_span("extraction", time.perf_counter() - start)
+        EXTRACTION_DURATION.observe(time.perf_counter() - start, file_format)
+        if result.get('num_pages') is not None:
+            EXTRACTION_PAGES.observe(result['num_pages'], file_format)
+        return result
     
     @staticmethod
     async def _extract_from_pdf(file_path: Path) -> Dict[str, Any]:
-        """Extract text from PDF"""
+        """Extract text from PDF, in parallel page ranges for large files"""
         try:
-            text_content = []
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                num_pages = len(pdf_reader.pages)
-                
-                for page_num, page in enumerate(pdf_reader.pages):
-                    text_content.append({
-                        'page': page_num + 1,
-                        'text': page.extract_text()
-                    })
-                
-                full_text = "\n\n".join([p['text'] for p in text_content])
-                
-                return {
-                    'text': full_text,
-                    'pages': text_content,
-                    'num_pages': num_pages,
-                    'format': 'pdf',
-                    'metadata': pdf_reader.metadata
-                }
+            info = await DocumentProcessor.inspect_pdf(file_path)
+            num_pages = info['num_pages']
+            step = max(settings.EXTRACTION_PAGES_PER_TASK, 1)
+            
+            tasks = [
+                asyncio.ensure_future(
+                    DocumentProcessor._run(_extract_pdf_pages, str(file_path), start, start + step)
+                )
+                for start in range(0, num_pages, step)
+            ]
+            try:
+                ranges = await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                raise
+            
+            text_content = [page for page_range in ranges for page in page_range]
+            full_text = "\n\n".join([p['text'] for p in text_content])
+            
+            page_starts = []
+            position = 0
+            for page in text_content:
+                page_starts.append(position)
+                position += len(page['text']) + 2
+            
+            return {
+                'text': full_text,
+                'pages': text_content,
+                'page_starts': page_starts,
+                'num_pages': num_pages,
+                'format': 'pdf',
+                'metadata': info['metadata']
+            }
         except Exception as e:
             logger.error(f"PDF extraction error: {e}")
             raise
     
+    @staticmethod
+    async def inspect_pdf(file_path: Path) -> Dict[str, Any]:
+        """Page count and metadata of a PDF, without extracting text"""
+        return await DocumentProcessor._run(_inspect_pdf, str(file_path))
+    
+    @staticmethod
+    async def iter_pdf_pages(
+        file_path: Path,
+        num_pages: Optional[int] = None,
+        pages_per_batch: Optional[int] = None,
+        prefetch: int = 2
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield {page, text} dicts in page order as they are parsed
+        At most `prefetch` batches are in flight or held in memory, so
+        resident memory does not grow with the page count.
+        """
+        if num_pages is None:
+            num_pages = (await DocumentProcessor.inspect_pdf(file_path))['num_pages']
+        step = max(pages_per_batch or settings.EXTRACTION_PAGES_PER_TASK, 1)
+        starts = iter(range(0, num_pages, step))
+        pending: deque = deque()
+        
+        def submit_next():
+            start = next(starts, None)
+            if start is not None:
+                pending.append(asyncio.ensure_future(
+                    DocumentProcessor._run(_extract_pdf_pages, str(file_path), start, start + step)
+                ))
+        
+        for _ in range(max(prefetch, 1)):
+            submit_next()
+        
+        try:
+            while pending:
+                batch = await pending.popleft()
+                submit_next()
+                for page in batch:
+                    yield page
+        finally:
+            for future in pending:
+                future.cancel()
+    
+    @staticmethod
+    async def stream_pdf(
+        file_path: Path,
+        consume: Callable[[Dict[str, Any]], Awaitable[None]],
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Extract a PDF page by page, awaiting consume({page, text}) for each in order
+        Same timeout and metrics as extract_text, but the text is never
+        held whole. Returns {num_pages, format, metadata}.
+        """
+        async def extract() -> Dict[str, Any]:
+            info = await DocumentProcessor.inspect_pdf(file_path)
+            async for page in DocumentProcessor.iter_pdf_pages(file_path, num_pages=info['num_pages']):
+                await consume(page)
+            return {'num_pages': info['num_pages'], 'format': 'pdf', 'metadata': info['metadata']}
+        
+        return await DocumentProcessor._measure(extract(), file_path, timeout)
+    
     @staticmethod
     async def _extract_from_docx(file_path: Path) -> Dict[str, Any]:
         """Extract text from DOCX"""
         try:
-            doc = docx.Document(file_path)
-            paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
+            paragraphs = await DocumentProcessor._run(_extract_docx, str(file_path))
             full_text = "\n\n".join(paragraphs)
             
             return {
@@ -78,8 +267,7 @@ class DocumentProcessor:
     @staticmethod
     async def _extract_from_txt(file_path: Path) -> Dict[str, Any]:
         """Extract text from TXT"""
-        with open(file_path, 'r', encoding='utf-8') as file:
-            text = file.read()
+        text = await asyncio.to_thread(file_path.read_text, encoding='utf-8')
         
         return {
             'text': text,
@@ -87,19 +275,42 @@ class DocumentProcessor:
         }
     
     @staticmethod
-    def chunk_text(text: str, chunk_size: int = 4000, overlap: int = 200) -> list[str]:
+    def split_pages(text: str, page_starts: Optional[List[int]], strip: bool = True) -> List[Dict[str, Any]]:
+        """
+        Rebuild [{page, text}] from extracted text and page start offsets
+        Without offsets the whole text is returned as a single unnumbered page.
+        With strip=False the pages are exact slices that join_pages reassembles.
+        """
+        if not page_starts:
+            return [{'page': None, 'text': text}]
+        ends = page_starts[1:] + [len(text)]
+        return [
+            {'page': number, 'text': text[start:end].strip() if strip else text[start:end]}
+            for number, (start, end) in enumerate(zip(page_starts, ends), start=1)
+        ]
+    
+    @staticmethod
+    def join_pages(pages: List[Dict[str, Any]]) -> tuple[str, Optional[List[int]]]:
+        """Inverse of split_pages(strip=False): (text, page_starts)"""
+        if len(pages) == 1 and pages[0]['page'] is None:
+            return pages[0]['text'], None
+        page_starts = []
+        position = 0
+        for page in pages:
+            page_starts.append(position)
+            position += len(page['text'])
+        return "".join(page['text'] for page in pages), page_starts
+    
+    @staticmethod
+    def chunk_text(
+        text: str,
+        max_tokens: int = 1000,
+        overlap_tokens: int = 50,
+        model: Optional[str] = None
+    ) -> list[str]:
         """
         Split text into chunks for AI processing
-        Useful for large documents
+        Chunks are packed to `max_tokens` for the model's tokenizer and
+        break on paragraph and heading boundaries (see core.ai.chunking).
         """
-        chunks = []
-        start = 0
-        text_length = len(text)
-        
-        while start < text_length:
-            end = start + chunk_size
-            chunk = text[start:end]
-            chunks.append(chunk)
-            start = end - overlap
-        
-        return chunks
+        return [chunk.text for chunk in chunking.chunk_text(text, max_tokens, overlap_tokens, model)]
@@ -0,0 +1,143 @@
+"""
+Extraction Cache
+Content-addressed cache of document extraction results, keyed by the
+SHA-256 of the uploaded bytes.
+
+Lookup order:
+  1. On-disk LRU tier (compressed JSON, size bounded)
+  2. DB index - pages of any completed Document with the same content_hash
+A DB hit back-fills the disk tier. (De)compression and JSON coding run
+in a worker thread so large documents don't stall the event loop.
+"""
+import asyncio
+import json
+import zlib
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from loguru import logger
+
+from core.ai.document_processor import DocumentProcessor
+from core.cache import CacheStats, DiskCache
+from core.config import settings
+from shared.models.document import Document, DocumentPage
+
+
+class ExtractionCache:
+    """Reuse extracted text for byte-identical uploads"""
+
+    def __init__(self, directory: str, max_bytes: int, enabled: bool = True):
+        self.enabled = enabled
+        self.disk = DiskCache(directory, max_bytes)
+        self.stats = CacheStats()
+        self.db_hits = 0
+
+    async def lookup(self, content_hash: str, db: AsyncSession) -> Optional[Dict[str, Any]]:
+        """Return {text, page_starts, num_pages, metadata, format} for a known hash"""
+        return (await self.lookup_many([content_hash], db)).get(content_hash)
+
+    async def lookup_many(self, content_hashes: List[str], db: AsyncSession) -> Dict[str, Dict[str, Any]]:
+        """Cached extractions for many hashes: disk reads in parallel, one DB query"""
+        if not self.enabled or not content_hashes:
+            return {}
+        content_hashes = list(dict.fromkeys(content_hashes))
+
+        blobs = await asyncio.gather(*[self.disk.get(h) for h in content_hashes])
+        found: Dict[str, Dict[str, Any]] = await asyncio.to_thread(
+            self._decode_all,
+            {h: blob for h, blob in zip(content_hashes, blobs) if blob is not None}
+        )
+
+        remaining = [h for h in content_hashes if h not in found]
+        if remaining:
+            result = await db.execute(
+                select(Document)
+                .where(
+                    Document.content_hash.in_(remaining),
+                    Document.status == "completed",
+                    Document.text_length.is_not(None),
+                )
+                .order_by(Document.id.desc())
+            )
+            sources: Dict[str, Document] = {}
+            for document in result.scalars():
+                sources.setdefault(document.content_hash, document)
+            pages = await self._load_pages([d.id for d in sources.values()], db) if sources else {}
+            for content_hash, document in sources.items():
+                text, page_starts = await asyncio.to_thread(
+                    DocumentProcessor.join_pages, pages.get(document.id) or [{"page": None, "text": ""}]
+                )
+                found[content_hash] = {
+                    "text": text,
+                    "page_starts": page_starts,
+                    "num_pages": document.num_pages,
+                    "metadata": document.doc_metadata or {},
+                    "format": document.file_type,
+                }
+                self.db_hits += 1
+                await self.store(content_hash, found[content_hash])
+
+        self.stats.hits += len(found)
+        self.stats.misses += len(content_hashes) - len(found)
+        return found
+
+    @staticmethod
+    def _encode(payload: Dict[str, Any]) -> bytes:
+        return zlib.compress(json.dumps(payload).encode("utf-8"))
+
+    @staticmethod
+    def _decode_all(blobs: Dict[str, bytes]) -> Dict[str, Dict[str, Any]]:
+        return {content_hash: json.loads(zlib.decompress(blob)) for content_hash, blob in blobs.items()}
+
+    @staticmethod
+    def _decompress_pages(rows) -> Dict[int, List[Dict[str, Any]]]:
+        pages: Dict[int, List[Dict[str, Any]]] = {}
+        for row in rows:
+            pages.setdefault(row.document_id, []).append(
+                {"page": row.page_number, "text": zlib.decompress(row.compressed_text).decode("utf-8")}
+            )
+        return pages
+
+    @staticmethod
+    async def _load_pages(document_ids: List[int], db: AsyncSession) -> Dict[int, List[Dict[str, Any]]]:
+        """Decompressed pages of several documents in one query, decoded in a worker thread"""
+        result = await db.execute(
+            select(DocumentPage.document_id, DocumentPage.page_number, DocumentPage.compressed_text)
+            .where(DocumentPage.document_id.in_(document_ids))
+            .order_by(DocumentPage.document_id, DocumentPage.position)
+        )
+        return await asyncio.to_thread(ExtractionCache._decompress_pages, result.all())
+
+    async def store(self, content_hash: str, extraction: Dict[str, Any]):
+        """Persist an extraction result in the disk tier"""
+        if not self.enabled:
+            return
+        payload = {
+            "text": extraction.get("text", ""),
+            "page_starts": extraction.get("page_starts"),
+            "num_pages": extraction.get("num_pages"),
+            "metadata": extraction.get("metadata") or {},
+            "format": extraction.get("format"),
+        }
+        blob = await asyncio.to_thread(self._encode, payload)
+        try:
+            await self.disk.set(content_hash, blob)
+        except OSError as e:
+            logger.warning(f"Extraction cache write failed: {e}")
+            return
+        self.stats.stores += 1
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            **self.stats.as_dict(),
+            "db_hits": self.db_hits,
+            "disk": self.disk.info(),
+        }
+
+
+extraction_cache = ExtractionCache(
+    settings.EXTRACTION_CACHE_DIR,
+    settings.EXTRACTION_CACHE_MAX_BYTES,
+    enabled=settings.EXTRACTION_CACHE_ENABLED,
+)
@@ -0,0 +1,484 @@
+"""
+AI Providers
+Uniform chat-completion interface over OpenAI, Azure OpenAI and a local
+deterministic fake, sharing one pooled HTTP client.
+
+Every provider enforces its own concurrency limit and tokens-per-minute
+budget, so bursts queue locally instead of tripping upstream 429s.
+"""
+import asyncio
+import hashlib
+import json
+import re
+import time
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+from openai import AsyncOpenAI, AsyncAzureOpenAI
+from pydantic import BaseModel
+from loguru import logger
+
+from core.config import settings
+
+
+class Message(BaseModel):
+    """Chat message sent to a model"""
+    role: str  # system, user, assistant
+    content: str
+
+
+class ChatResponse(BaseModel):
+    """Normalized chat completion result"""
+    content: str
+    model: str
+    tokens_used: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency_ms: int = 0
+    time_to_first_token_ms: Optional[int] = None
+    finish_reason: Optional[str] = None  # "length" when cut off at max_tokens
+    cached: bool = False
+    provider: Optional[str] = None
+
+    @property
+    def billed_tokens(self) -> int:
+        """Tokens this call actually spent: none when served from cache"""
+        return 0 if self.cached else self.tokens_used or 0
+
+
+class EmbeddingResponse(BaseModel):
+    """Embedding vectors, in input order"""
+    vectors: List[List[float]]
+    model: str
+    tokens_used: int = 0
+    latency_ms: int = 0
+    provider: Optional[str] = None
+
+
+class StreamChunk(BaseModel):
+    """One streamed delta; the final chunk carries the full response"""
+    delta: str = ""
+    done: bool = False
+    response: Optional[ChatResponse] = None
+
+
+def estimate_tokens(messages: List[Message]) -> int:
+    """Cheap prompt token estimate (~4 characters per token)"""
+    return sum(len(m.content) for m in messages) // 4 + 4 * len(messages)
+
+
+# Shared HTTP client
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """One keep-alive connection pool for all provider SDK clients"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.AI_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.AI_HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=settings.AI_HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(settings.OPENAI_TIMEOUT_SECONDS, connect=10.0),
+        )
+    return _http_client
+
+
+async def close_http_client():
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+class RateLimiter:
+    """
+    Concurrency semaphore plus a tokens-per-minute token bucket.
+    Requests reserve an estimate up front and settle the difference
+    once the real usage is known. Waiters are served in FIFO order.
+    """
+
+    def __init__(self, max_concurrency: int, tokens_per_minute: int = 0):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.capacity = tokens_per_minute
+        self._available = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._queue_lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._available = min(
+            self.capacity,
+            self._available + (now - self._updated) * self.capacity / 60.0
+        )
+        self._updated = now
+
+    async def _reserve(self, tokens: int):
+        if not self.capacity:
+            return
+        tokens = min(tokens, self.capacity)
+        async with self._queue_lock:
+            self._refill()
+            while self._available < tokens:
+                wait = (tokens - self._available) * 60.0 / self.capacity
+                await asyncio.sleep(wait)
+                self._refill()
+            self._available -= tokens
+
+    def settle(self, reserved: int, actual: int):
+        """Return (or charge) the difference between estimate and usage"""
+        if not self.capacity:
+            return
+        self._refill()
+        self._available = min(self.capacity, self._available + min(reserved, self.capacity) - actual)
+
+    @asynccontextmanager
+    async def limit(self, estimated_tokens: int) -> AsyncIterator[None]:
+        await self._reserve(estimated_tokens)
+        async with self.semaphore:
+            yield
+
+
+class AIProvider(ABC):
+    """Base provider: rate limiting around a provider-specific call"""
+
+    name: str = "base"
+
+    def __init__(self, max_concurrency: int, tokens_per_minute: int = 0):
+        self.limiter = RateLimiter(max_concurrency, tokens_per_minute)
+
+    async def chat_completion(
+        self,
+        messages: List[Message],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        json_mode: bool = False,
+    ) -> ChatResponse:
+        reserved = estimate_tokens(messages) + max_tokens
+        async with self.limiter.limit(reserved):
+            start = time.perf_counter()
+            response = await self._complete(messages, model, temperature, max_tokens, json_mode)
+            response.latency_ms = int((time.perf_counter() - start) * 1000)
+        self.limiter.settle(reserved, response.tokens_used)
+        response.provider = self.name
+        return response
+
+    async def stream_chat_completion(
+        self,
+        messages: List[Message],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        json_mode: bool = False,
+    ) -> AsyncIterator[StreamChunk]:
+        """
+        Stream deltas as they arrive, ending with a done chunk.
+        Closing the iterator early aborts the upstream request; the
+        reservation is still settled, charging the prompt and what was
+        streamed so far.
+        """
+        prompt_tokens = estimate_tokens(messages)
+        reserved = prompt_tokens + max_tokens
+        final: Optional[ChatResponse] = None
+        streamed_chars = 0
+        async with self.limiter.limit(reserved):
+            try:
+                start = time.perf_counter()
+                first_token_ms = None
+                async for chunk in self._stream(messages, model, temperature, max_tokens, json_mode):
+                    if chunk.done:
+                        final = chunk.response
+                        break
+                    if first_token_ms is None and chunk.delta:
+                        first_token_ms = int((time.perf_counter() - start) * 1000)
+                    streamed_chars += len(chunk.delta)
+                    yield chunk
+                if final is not None:
+                    final.latency_ms = int((time.perf_counter() - start) * 1000)
+                    final.time_to_first_token_ms = first_token_ms
+                    final.provider = self.name
+            finally:
+                self.limiter.settle(reserved, final.tokens_used if final else prompt_tokens + streamed_chars // 4)
+        if final is not None:
+            yield StreamChunk(done=True, response=final)
+
+    async def embed(self, texts: List[str], model: str) -> EmbeddingResponse:
+        """Embed a batch of texts"""
+        reserved = sum(len(t) for t in texts) // 4 + len(texts)
+        async with self.limiter.limit(reserved):
+            start = time.perf_counter()
+            response = await self._embed(texts, model)
+            response.latency_ms = int((time.perf_counter() - start) * 1000)
+        self.limiter.settle(reserved, response.tokens_used)
+        response.provider = self.name
+        return response
+
+    @abstractmethod
+    async def _complete(
+        self,
+        messages: List[Message],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool = False,
+    ) -> ChatResponse:
+        ...
+
+    async def _stream(
+        self,
+        messages: List[Message],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool = False,
+    ) -> AsyncIterator[StreamChunk]:
+        """Default for providers without native streaming: one delta"""
+        response = await self._complete(messages, model, temperature, max_tokens, json_mode)
+        yield StreamChunk(delta=response.content)
+        yield StreamChunk(done=True, response=response)
+
+    @abstractmethod
+    async def _embed(self, texts: List[str], model: str) -> EmbeddingResponse:
+        ...
+
+
+class OpenAIProvider(AIProvider):
+    """api.openai.com"""
+
+    name = "openai"
+
+    def __init__(self, max_concurrency: int, tokens_per_minute: int = 0):
+        super().__init__(max_concurrency, tokens_per_minute)
+        self._client: Optional[AsyncOpenAI] = None
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        if self._client is None:
+            self._client = AsyncOpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                max_retries=settings.OPENAI_MAX_RETRIES,
+                http_client=get_http_client(),
+            )
+        return self._client
+
+    def _deployment(self, model: str) -> str:
+        return model
+
+    def _embedding_deployment(self, model: str) -> str:
+        return model
+
+    def _stream_options(self) -> Dict:
+        return {"stream_options": {"include_usage": True}}
+
+    @staticmethod
+    def _format_options(json_mode: bool) -> Dict:
+        return {"response_format": {"type": "json_object"}} if json_mode else {}
+
+    async def _complete(self, messages, model, temperature, max_tokens, json_mode=False) -> ChatResponse:
+        completion = await self.client.chat.completions.create(
+            model=self._deployment(model),
+            messages=[m.model_dump() for m in messages],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **self._format_options(json_mode),
+        )
+        usage = completion.usage
+        return ChatResponse(
+            content=completion.choices[0].message.content or "",
+            model=completion.model or model,
+            finish_reason=completion.choices[0].finish_reason,
+            tokens_used=usage.total_tokens if usage else 0,
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0,
+        )
+
+    async def _embed(self, texts, model) -> EmbeddingResponse:
+        result = await self.client.embeddings.create(
+            model=self._embedding_deployment(model),
+            input=texts,
+            encoding_format="float",
+        )
+        return EmbeddingResponse(
+            vectors=[item.embedding for item in sorted(result.data, key=lambda item: item.index)],
+            model=result.model or model,
+            tokens_used=result.usage.total_tokens if result.usage else 0,
+        )
+
+    async def _stream(self, messages, model, temperature, max_tokens, json_mode=False) -> AsyncIterator[StreamChunk]:
+        stream = await self.client.chat.completions.create(
+            model=self._deployment(model),
+            messages=[m.model_dump() for m in messages],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            **self._stream_options(),
+            **self._format_options(json_mode),
+        )
+        parts: List[str] = []
+        usage = None
+        finish_reason = None
+        model_name = model
+        try:
+            async for event in stream:
+                model_name = event.model or model_name
+                if event.usage:
+                    usage = event.usage
+                if event.choices and event.choices[0].finish_reason:
+                    finish_reason = event.choices[0].finish_reason
+                if event.choices and event.choices[0].delta.content:
+                    delta = event.choices[0].delta.content
+                    parts.append(delta)
+                    yield StreamChunk(delta=delta)
+        finally:
+            await stream.close()
+
+        content = "".join(parts)
+        prompt_tokens = usage.prompt_tokens if usage else estimate_tokens(messages)
+        completion_tokens = usage.completion_tokens if usage else len(content) // 4
+        yield StreamChunk(done=True, response=ChatResponse(
+            content=content,
+            model=model_name,
+            finish_reason=finish_reason,
+            tokens_used=prompt_tokens + completion_tokens,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+        ))
+
+
+class AzureOpenAIProvider(OpenAIProvider):
+    """Azure OpenAI; model names map to deployments"""
+
+    name = "azure-openai"
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        if self._client is None:
+            self._client = AsyncAzureOpenAI(
+                api_key=settings.AZURE_OPENAI_KEY,
+                azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
+                api_version=settings.AZURE_OPENAI_API_VERSION,
+                max_retries=settings.OPENAI_MAX_RETRIES,
+                http_client=get_http_client(),
+            )
+        return self._client
+
+    def _deployment(self, model: str) -> str:
+        return settings.AZURE_OPENAI_DEPLOYMENT or model
+
+    def _embedding_deployment(self, model: str) -> str:
+        return settings.AZURE_OPENAI_EMBEDDING_DEPLOYMENT or model
+
+    def _stream_options(self) -> Dict:
+        # Usage in streams needs a newer API version; estimate instead
+        return {}
+
+
+class FakeProvider(AIProvider):
+    """
+    Deterministic offline provider for tests and local runs.
+    Returns `responses[model]` if configured, otherwise a stable digest
+    of the prompt; token counts are estimated from the text. Embeddings
+    are hashed bags of words, so lexical overlap drives similarity.
+    """
+
+    EMBEDDING_DIMENSIONS = 256
+
+    name = "fake"
+
+    def __init__(
+        self,
+        max_concurrency: int = 100,
+        tokens_per_minute: int = 0,
+        responses: Optional[Dict[str, str]] = None,
+        latency_seconds: float = 0.0,
+    ):
+        super().__init__(max_concurrency, tokens_per_minute)
+        self.responses = responses or {}
+        self.latency_seconds = latency_seconds
+        self.calls = 0
+
+    async def _complete(self, messages, model, temperature, max_tokens, json_mode=False) -> ChatResponse:
+        self.calls += 1
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        if model in self.responses:
+            content = self.responses[model]
+        else:
+            digest = hashlib.sha256(
+                json.dumps([m.model_dump() for m in messages], sort_keys=True).encode("utf-8")
+            ).hexdigest()
+            content = json.dumps({"summary": f"fake-{digest[:16]}"})
+        finish_reason = "stop"
+        if len(content) > max_tokens * 4:
+            content, finish_reason = content[:max_tokens * 4], "length"
+        prompt_tokens = estimate_tokens(messages)
+        completion_tokens = min(len(content) // 4 + 1, max_tokens)
+        return ChatResponse(
+            content=content,
+            model=model,
+            finish_reason=finish_reason,
+            tokens_used=prompt_tokens + completion_tokens,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+        )
+
+    async def _embed(self, texts, model) -> EmbeddingResponse:
+        self.calls += 1
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        vectors = []
+        for text in texts:
+            vector = [0.0] * self.EMBEDDING_DIMENSIONS
+            for word in re.findall(r"\w+", text.lower()):
+                digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+                bucket = int.from_bytes(digest[:4], "little") % self.EMBEDDING_DIMENSIONS
+                vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+            vectors.append(vector)
+        return EmbeddingResponse(
+            vectors=vectors,
+            model=model,
+            tokens_used=sum(len(t) for t in texts) // 4,
+        )
+
+    async def _stream(self, messages, model, temperature, max_tokens, json_mode=False) -> AsyncIterator[StreamChunk]:
+        response = await self._complete(messages, model, temperature, max_tokens, json_mode)
+        for i in range(0, len(response.content), 16):
+            yield StreamChunk(delta=response.content[i:i + 16])
+            await asyncio.sleep(0)
+        yield StreamChunk(done=True, response=response)
+
+
+PROVIDERS = {
+    OpenAIProvider.name: OpenAIProvider,
+    AzureOpenAIProvider.name: AzureOpenAIProvider,
+    FakeProvider.name: FakeProvider,
+}
+
+_providers: Dict[str, AIProvider] = {}
+
+
+def get_provider(name: Optional[str] = None) -> AIProvider:
+    """Return the (process-wide) provider instance for `name`"""
+    name = name or settings.AI_PROVIDER
+    if name not in _providers:
+        if name not in PROVIDERS:
+            raise ValueError(f"Unknown AI provider: {name}")
+        _providers[name] = PROVIDERS[name](
+            max_concurrency=settings.AI_MAX_CONCURRENT_REQUESTS,
+            tokens_per_minute=settings.AI_TOKENS_PER_MINUTE,
+        )
+        logger.info(
+            f"AI provider '{name}' ready (concurrency={settings.AI_MAX_CONCURRENT_REQUESTS}, "
+            f"tpm={settings.AI_TOKENS_PER_MINUTE or 'unlimited'})"
+        )
+    return _providers[name]
+
+
+def register_provider(provider: AIProvider, name: Optional[str] = None):
+    """Install a provider instance (e.g. a configured FakeProvider in tests)"""
+    _providers[name or provider.name] = provider
@@ -0,0 +1,138 @@
+"""
+Streaming Utilities
+Server-Sent Events helpers and incremental JSON parsing of model output
+"""
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi.responses import StreamingResponse
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def format_sse(data: Any, event: Optional[str] = None) -> str:
+    """Encode one Server-Sent Event"""
+    payload = data if isinstance(data, str) else json.dumps(data, default=str)
+    lines = [f"event: {event}"] if event else []
+    lines.extend(f"data: {line}" for line in payload.splitlines() or [""])
+    return "\n".join(lines) + "\n\n"
+
+
+def sse_response(events: AsyncIterator[Dict[str, Any]]) -> StreamingResponse:
+    """
+    Wrap an async iterator of {"event", "data"} dicts as an SSE response.
+    When the client disconnects the iterator is closed, so producers can
+    cancel upstream work in their `finally` blocks.
+    """
+    async def body():
+        async for item in events:
+            yield format_sse(item.get("data"), item.get("event"))
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+class IncrementalJSONParser:
+    """
+    Parse a JSON object as it streams in.
+
+    Text is scanned once, tracking string/escape state and the container
+    stack. `snapshot()` returns the object parsed up to the last
+    structurally safe point (after a complete value), with open containers
+    closed, so callers can show partial results while tokens arrive.
+    Anything before the first '{' (e.g. a markdown fence) is ignored.
+    """
+
+    def __init__(self):
+        self._parts: List[str] = []
+        self._length = 0
+        self._started = False
+        self._in_string = False
+        self._escape = False
+        self._stack: List[str] = []
+        self._safe_end = 0
+        self._safe_stack: List[str] = []
+        self._start = 0
+        self._end = 0
+        self.complete = False
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def feed(self, chunk: str) -> bool:
+        """Consume more text; True if a new safe point was reached"""
+        advanced = False
+        offset = self._length
+        self._parts.append(chunk)
+        self._length += len(chunk)
+
+        for i, char in enumerate(chunk):
+            if self.complete:
+                break
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._start = offset + i
+                    self._stack.append(char)
+                    self._mark_safe(offset + i + 1)
+                    advanced = True
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._stack.append(char)
+                self._mark_safe(offset + i + 1)
+                advanced = True
+            elif char in "}]":
+                if self._stack:
+                    self._stack.pop()
+                self._mark_safe(offset + i + 1)
+                advanced = True
+                if not self._stack:
+                    self.complete = True
+                    self._end = offset + i + 1
+            elif char == ",":
+                self._mark_safe(offset + i)
+                advanced = True
+
+        return advanced
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    @property
+    def object_text(self) -> Optional[str]:
+        """Text of the complete object (fences and trailing prose dropped)"""
+        return self.text[self._start:self._end] if self.complete else None
+
+    def _mark_safe(self, end: int):
+        self._safe_end = end
+        self._safe_stack = list(self._stack)
+
+    def snapshot(self) -> Optional[Any]:
+        """Best-effort parse of everything up to the last safe point"""
+        if not self._started:
+            return None
+        body = self.text[self._start:self._safe_end].rstrip()
+        if body.endswith(","):
+            body = body[:-1]
+        closing = "".join(_CLOSERS[c] for c in reversed(self._safe_stack))
+        try:
+            return json.loads(body + closing)
+        except json.JSONDecodeError:
+            return None
@@ -0,0 +1,132 @@
+"""
+Structured Output
+Parse, repair and validate JSON returned by chat models.
+
+Models wrap JSON in markdown fences, leave trailing commas, and stop
+mid-object when they hit max_tokens. Responses are parsed strictly first;
+otherwise the first JSON object is located and, if truncated, closed at
+its last complete value. Truncated responses can then be finished with a
+continuation request instead of re-running the whole prompt.
+"""
+import json
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from core.ai.providers import ChatResponse, Message
+from core.ai.streaming import IncrementalJSONParser
+from core.config import settings
+
+T = TypeVar("T", bound=BaseModel)
+
+CONTINUE_PROMPT = (
+    "Your previous reply was cut off at the output limit. Continue the JSON exactly "
+    "where it stopped: output only the remaining characters, without repeating any "
+    "text, restarting the object or adding markdown."
+)
+
+
+@dataclass
+class ParsedJSON:
+    """Result of parsing model output"""
+    value: Any = None
+    found: bool = False  # the output contains a JSON object at all
+    complete: bool = False  # ...and it is closed
+    repaired: bool = False  # value was recovered from malformed or truncated text
+
+
+@dataclass
+class StructuredResponse:
+    """Validated model output; `data` is None if the output could not be used"""
+    data: Optional[BaseModel]
+    response: ChatResponse  # content and token usage across continuations
+    billed_tokens: int = 0  # tokens spent across continuations, without cache hits
+    continuations: int = 0
+    repaired: bool = False
+    error: Optional[str] = None
+
+
+def supports_json_mode(model: str) -> bool:
+    """Whether the model accepts response_format=json_object"""
+    return any(model.startswith(prefix) for prefix in settings.AI_JSON_MODE_MODELS)
+
+
+def _remove_trailing_commas(text: str) -> str:
+    """Drop commas directly before a closing bracket, outside strings"""
+    out: List[str] = []
+    in_string = escape = False
+    pending = None  # index in `out` of a comma that may be trailing
+    for char in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "}]" and pending is not None:
+            out[pending] = ""
+        if not char.isspace():
+            pending = len(out) if char == "," and not in_string else None
+        out.append(char)
+    return "".join(out)
+
+
+def _strip_fence(text: str) -> str:
+    """Remove a surrounding ``` / ```json fence"""
+    stripped = text.strip()
+    if stripped.startswith("```"):
+        stripped = stripped.split("\n", 1)[1] if "\n" in stripped else ""
+        if stripped.rstrip().endswith("```"):
+            stripped = stripped.rstrip()[:-3]
+    return stripped
+
+
+def parse_json(text: str) -> ParsedJSON:
+    """Parse a JSON object from model output, repairing what can be repaired"""
+    body = _strip_fence(text or "")
+    try:
+        return ParsedJSON(json.loads(body), found=True, complete=True)
+    except json.JSONDecodeError:
+        pass
+
+    parser = IncrementalJSONParser()
+    parser.feed(_remove_trailing_commas(body))
+    if not parser.started:
+        return ParsedJSON()
+    if parser.complete:
+        try:
+            return ParsedJSON(json.loads(parser.object_text), found=True, complete=True, repaired=True)
+        except json.JSONDecodeError:
+            return ParsedJSON(found=True, complete=True)
+    # Truncated: close open containers after the last complete value
+    return ParsedJSON(parser.snapshot(), found=True, repaired=True)
+
+
+def validate(parsed: ParsedJSON, schema: Type[T]) -> Tuple[Optional[T], Optional[str]]:
+    """Validate parsed output against a schema, returning (data, error)"""
+    if parsed.value is None:
+        return None, "no JSON object in model output" if not parsed.found else "unparseable JSON"
+    try:
+        return schema.model_validate(parsed.value), None
+    except ValidationError as e:
+        return None, f"{e.error_count()} validation errors: {e.errors()[0]['msg']}"
+
+
+def continuation_messages(messages: List[Message], partial: str) -> List[Message]:
+    """Messages asking the model to finish its truncated reply"""
+    return [
+        *messages,
+        Message(role="assistant", content=partial),
+        Message(role="user", content=CONTINUE_PROMPT),
+    ]
+
+
+def join_continuation(partial: str, continuation: str) -> str:
+    """Append a continuation, dropping a fence the model may open it with"""
+    if continuation.lstrip().startswith("```"):
+        continuation = _strip_fence(continuation)
+    return partial + continuation
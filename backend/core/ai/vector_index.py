@@ -0,0 +1,194 @@
+"""
+Vector Index
+Embedded NumPy vector index for chunk retrieval, persisted on disk.
+
+Vectors are L2-normalized float32, so cosine similarity is a dot product.
+Small indexes are searched exactly (one matrix-vector product). Large ones
+get an IVF layout: spherical k-means centroids with vectors stored
+contiguously per list, and a query scans only the `nprobe` nearest lists.
+"""
+import asyncio
+import hashlib
+import io
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from core.cache import DiskCache, TTLCache
+
+_KMEANS_ITERATIONS = 10
+_ASSIGN_BATCH = 8192
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Nearest centroid per vector, in batches to bound memory"""
+    return np.concatenate([
+        np.argmax(vectors[i:i + _ASSIGN_BATCH] @ centroids.T, axis=1)
+        for i in range(0, len(vectors), _ASSIGN_BATCH)
+    ])
+
+
+class VectorIndex:
+    """Cosine-similarity index over chunk embeddings with chunk metadata"""
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        chunks: List[Dict[str, Any]],
+        model: str,
+        centroids: Optional[np.ndarray] = None,
+        list_offsets: Optional[np.ndarray] = None,
+    ):
+        self.vectors = vectors
+        self.chunks = chunks
+        self.model = model
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    @property
+    def is_ann(self) -> bool:
+        return self.centroids is not None
+
+    @classmethod
+    def build(
+        cls,
+        vectors,
+        chunks: List[Dict[str, Any]],
+        model: str,
+        ann_min_vectors: int = 0,
+        seed: int = 0,
+    ) -> "VectorIndex":
+        """
+        Build an index; with ann_min_vectors > 0 and at least that many
+        vectors, cluster into ~sqrt(n) IVF lists
+        """
+        vectors = _normalize(vectors)
+        if len(vectors) != len(chunks):
+            raise ValueError("vectors and chunks must have the same length")
+        if not ann_min_vectors or len(vectors) < ann_min_vectors:
+            return cls(vectors, chunks, model)
+
+        rng = np.random.default_rng(seed)
+        nlist = max(1, int(np.sqrt(len(vectors))))
+        centroids = vectors[rng.choice(len(vectors), nlist, replace=False)]
+        for _ in range(_KMEANS_ITERATIONS):
+            assignment = _assign(vectors, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, vectors)
+            filled = np.bincount(assignment, minlength=nlist) > 0
+            centroids[filled] = _normalize(sums[filled])
+
+        assignment = _assign(vectors, centroids)
+        order = np.argsort(assignment, kind="stable")
+        list_offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=nlist))])
+        return cls(
+            np.ascontiguousarray(vectors[order]),
+            [chunks[i] for i in order],
+            model,
+            centroids=centroids,
+            list_offsets=list_offsets,
+        )
+
+    def search(self, query, top_k: int = 5, nprobe: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Return [(chunk position, cosine score)] best first"""
+        if not len(self):
+            return []
+        query = _normalize(query)
+        if self.is_ann and nprobe and nprobe < len(self.centroids):
+            lists = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+            candidates = np.concatenate([
+                np.arange(self.list_offsets[i], self.list_offsets[i + 1]) for i in lists
+            ])
+            scores = self.vectors[candidates] @ query
+        else:
+            candidates = None
+            scores = self.vectors @ query
+
+        k = min(top_k, len(scores))
+        if not k:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        positions = candidates[top] if candidates is not None else top
+        return [(int(p), float(scores[t])) for p, t in zip(positions, top)]
+
+    def to_bytes(self) -> bytes:
+        arrays = {
+            "vectors": self.vectors,
+            "meta": np.frombuffer(
+                json.dumps({"model": self.model, "chunks": self.chunks}).encode("utf-8"), dtype=np.uint8
+            ),
+        }
+        if self.is_ann:
+            arrays["centroids"] = self.centroids
+            arrays["list_offsets"] = self.list_offsets
+        buffer = io.BytesIO()
+        np.savez(buffer, **arrays)
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "VectorIndex":
+        with np.load(io.BytesIO(data), allow_pickle=False) as arrays:
+            meta = json.loads(arrays["meta"].tobytes())
+            return cls(
+                arrays["vectors"],
+                meta["chunks"],
+                meta["model"],
+                centroids=arrays["centroids"] if "centroids" in arrays else None,
+                list_offsets=arrays["list_offsets"] if "list_offsets" in arrays else None,
+            )
+
+
+class VectorIndexStore:
+    """
+    In-memory LRU of loaded indexes in front of a size-bounded on-disk tier.
+    Serialization and file I/O run in a worker thread.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, cache_entries: int = 32):
+        self.memory = TTLCache(cache_entries, ttl_seconds=3600)
+        self.disk = DiskCache(directory, max_bytes)
+
+    @staticmethod
+    def _disk_key(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[VectorIndex]:
+        index = self.memory.get(key)
+        if index is not None:
+            return index
+
+        disk_key = self._disk_key(key)
+        blob = await self.disk.get(disk_key)
+        if blob is None:
+            return None
+        try:
+            index = await asyncio.to_thread(VectorIndex.from_bytes, blob)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Discarding unreadable vector index {key}: {e}")
+            await self.disk.delete(disk_key)
+            return None
+        self.memory.set(key, index)
+        return index
+
+    async def set(self, key: str, index: VectorIndex):
+        self.memory.set(key, index)
+        try:
+            blob = await asyncio.to_thread(index.to_bytes)
+            await self.disk.set(self._disk_key(key), blob)
+        except OSError as e:
+            logger.warning(f"Vector index write failed for {key}: {e}")
+
+    def info(self) -> Dict[str, Any]:
+        return {"memory": self.memory.info(), "disk": self.disk.info()}
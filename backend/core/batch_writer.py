@@ -0,0 +1,119 @@
+"""
+Batched Writer
+In-process buffer that inserts log-style rows in bulk, off the request path
+"""
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from loguru import logger
+
+from core.database import AsyncSessionLocal
+
+
+class BatchWriter:
+    """
+    Buffer rows for one model and flush them with a single executemany
+    INSERT when `max_batch` rows are pending or every `flush_interval`
+    seconds. `add` never waits on the database: when the buffer holds
+    `max_pending` rows, new rows are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        model,
+        max_batch: int = 500,
+        flush_interval: float = 2.0,
+        max_pending: int = 10000,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+    ):
+        self.model = model
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._session_factory = session_factory
+        self._pending: List[Dict[str, Any]] = []
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.flushes = 0
+
+    @property
+    def name(self) -> str:
+        return self.model.__tablename__
+
+    def add(self, row: Dict[str, Any]) -> bool:
+        """Queue a row; False if it was dropped because the buffer is full"""
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning(f"{self.name} buffer full, {self.dropped} rows dropped")
+            return False
+        self._pending.append(row)
+        if len(self._pending) >= self.max_batch:
+            self._wakeup.set()
+        return True
+
+    def _take_pending(self) -> List[Dict[str, Any]]:
+        """Detach the buffered rows for insertion"""
+        rows, self._pending = self._pending, []
+        return rows
+
+    async def flush(self) -> int:
+        """Insert everything pending; returns the number of rows written"""
+        async with self._lock:
+            rows = self._take_pending()
+            written = 0
+            for i in range(0, len(rows), self.max_batch):
+                batch = rows[i:i + self.max_batch]
+                try:
+                    async with self._session_factory() as db:
+                        await db.execute(insert(self.model), batch)
+                        await db.commit()
+                except Exception as e:
+                    self.failed += len(rows) - i
+                    logger.error(f"{self.name} batch insert failed, {len(rows) - i} rows lost: {e}")
+                    break
+                written += len(batch)
+                self.flushes += 1
+            self.written += written
+            return written
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            start = time.perf_counter()
+            # Shielded: stop() waits for an in-progress insert instead of losing it
+            written = await asyncio.shield(self.flush())
+            if written:
+                logger.debug(f"{self.name}: {written} rows flushed in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"batch-writer-{self.name}")
+
+    async def stop(self):
+        """Stop the flush loop and write what is left"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "flushes": self.flushes,
+        }
@@ -0,0 +1,245 @@
+"""
+Caching Primitives
+In-memory TTL/LRU, size-bounded on-disk LRU and an optional shared
+(Redis) tier, with hit/miss counters
+"""
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+from loguru import logger
+
+from core.config import settings
+
+
+class CacheStats:
+    """Hit/miss counters shared by cache tiers"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class TTLCache:
+    """
+    In-process LRU cache with per-entry expiry.
+    Not thread-safe; intended for use from the event loop.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._data: "OrderedDict[Any, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Any) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.stats.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: Any, value: Any, ttl_seconds: Optional[float] = None):
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        self.stats.stores += 1
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+    def delete(self, key: Any):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def info(self) -> Dict[str, Any]:
+        return {**self.stats.as_dict(), "entries": len(self._data), "max_entries": self.max_entries}
+
+
+class DiskCache:
+    """
+    Content-addressed, size-bounded LRU cache of byte blobs on disk.
+
+    Entries live at <directory>/<key[:2]>/<key>. Recency is tracked in an
+    in-memory index seeded from file mtimes on first use, so eviction never
+    scans the directory. All file I/O runs in a worker thread.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._index: Optional["OrderedDict[str, int]"] = None
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def _load_index(self):
+        if self._index is not None:
+            return
+        entries = []
+        if self.directory.exists():
+            for path in self.directory.glob("*/*"):
+                if path.is_file() and not path.name.endswith(".tmp"):
+                    stat = path.stat()
+                    entries.append((stat.st_mtime, path.name, stat.st_size))
+        entries.sort()
+        self._index = OrderedDict((key, size) for _, key, size in entries)
+        self._size = sum(self._index.values())
+
+    def _get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            self._load_index()
+            if key not in self._index:
+                self.stats.misses += 1
+                return None
+            self._index.move_to_end(key)
+        try:
+            path = self._path(key)
+            data = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._size -= self._index.pop(key, 0)
+                self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return data
+
+    def _set(self, key: str, value: bytes):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{key}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(value)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._load_index()
+            self._size += len(value) - self._index.pop(key, 0)
+            self._index[key] = len(value)
+            self.stats.stores += 1
+            evicted = []
+            while self._size > self.max_bytes and len(self._index) > 1:
+                old_key, old_size = self._index.popitem(last=False)
+                self._size -= old_size
+                evicted.append(old_key)
+            self.stats.evictions += len(evicted)
+
+        for old_key in evicted:
+            try:
+                self._path(old_key).unlink()
+            except FileNotFoundError:
+                pass
+        if evicted:
+            logger.debug(f"Disk cache {self.directory}: evicted {len(evicted)} entries")
+
+    def _delete(self, key: str):
+        with self._lock:
+            self._load_index()
+            self._size -= self._index.pop(key, 0)
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: bytes):
+        await asyncio.to_thread(self._set, key, value)
+
+    async def delete(self, key: str):
+        await asyncio.to_thread(self._delete, key)
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            **self.stats.as_dict(),
+            "entries": len(self._index or {}),
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes,
+        }
+
+
+class SharedCache:
+    """
+    Optional cross-process cache tier backed by Redis.
+    Failures are logged and treated as misses so the shared tier can
+    never take authentication or requests down with it.
+    """
+
+    def __init__(self, url: str, prefix: str = "aihub:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("SHARED_CACHE_URL is set but the 'redis' package is not installed") from e
+        self.client = redis.from_url(url)
+        self.prefix = prefix
+        self.stats = CacheStats()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            value = await self.client.get(self.prefix + key)
+        except Exception as e:
+            logger.warning(f"Shared cache get failed: {e}")
+            value = None
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int):
+        try:
+            await self.client.set(self.prefix + key, value, ex=max(int(ttl_seconds), 1))
+            self.stats.stores += 1
+        except Exception as e:
+            logger.warning(f"Shared cache set failed: {e}")
+
+    async def delete(self, key: str):
+        try:
+            await self.client.delete(self.prefix + key)
+        except Exception as e:
+            logger.warning(f"Shared cache delete failed: {e}")
+
+    def info(self) -> Dict[str, Any]:
+        return self.stats.as_dict()
+
+
+_shared_cache: Optional[SharedCache] = None
+
+
+def get_shared_cache() -> Optional[SharedCache]:
+    """Shared tier if SHARED_CACHE_URL is configured, else None"""
+    global _shared_cache
+    if _shared_cache is None and settings.SHARED_CACHE_URL:
+        _shared_cache = SharedCache(settings.SHARED_CACHE_URL)
+    return _shared_cache
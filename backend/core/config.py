@@ -4,7 +4,7 @@ Environment-based settings with validation
 """
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, field_validator
-from typing import List, Union, Optional
+from typing import Dict, List, Union, Optional
 from enum import Enum
 from functools import lru_cache
 
@@ -36,6 +36,12 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    BCRYPT_ROUNDS: int = 12  # hashes with other costs are upgraded on login
+    PASSWORD_HASH_WORKERS: int = 4  # threads for bcrypt work
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000  # memoized JWT verifications
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_LOCAL_TTL_SECONDS: int = 5  # in-process tier when SHARED_CACHE_URL is set
+    USER_CACHE_MAX_ENTRIES: int = 10000
     
     # Authentication
     AUTH_PROVIDER: AuthProvider = AuthProvider.LOCAL
@@ -45,14 +51,149 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = Field(..., description="Database connection string")
+    DATABASE_READ_URL: Optional[str] = None  # replica for read-only routes (get_read_db); defaults to DATABASE_URL
     DB_POOL_SIZE: int = 20
     DB_MAX_OVERFLOW: int = 10
-    
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0  # wait for a free connection before failing
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # replace connections older than this (load balancer/firewall idle cuts)
+    DB_POOL_PRE_PING: bool = True  # check connections on checkout, so restarts/failovers don't surface as errors
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statements per connection; 0 behind pgbouncer (transaction mode)
+    DB_ECHO: bool = False  # log every SQL statement
+    PAGINATION_MAX_PAGE_SIZE: int = 100
+    PAGINATION_COUNT_LIMIT: int = 10000  # list totals above this are reported as estimates
+
+    # Background jobs
+    JOB_WORKER_CONCURRENCY: int = 4
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BACKOFF_SECONDS: float = 5.0
+    JOB_RETRY_BACKOFF_MAX_SECONDS: float = 300.0
+    JOB_POLL_INTERVAL_SECONDS: float = 2.0
+    JOB_TIMEOUT_SECONDS: int = 600
+
+    # RFP analysis (map-reduce over document chunks)
+    RFP_ANALYSIS_MODEL: str = "gpt-4"
+    RFP_ANALYSIS_CHUNK_TOKENS: int = 3000
+    RFP_ANALYSIS_CHUNK_OVERLAP_TOKENS: int = 120
+    RFP_ANALYSIS_CONCURRENCY: int = 5
+    RFP_STREAM_BUFFER_EVENTS: int = 256  # SSE backpressure window
+
+    # Document extraction (process pool)
+    EXTRACTION_MAX_WORKERS: int = 0  # 0 = one per CPU
+    EXTRACTION_TIMEOUT_SECONDS: int = 120
+    EXTRACTION_PAGES_PER_TASK: int = 50  # larger PDFs are split across workers
+
+    # Storage
+    UPLOAD_DIR: str = "uploads"
+    ALLOWED_UPLOAD_EXTENSIONS: List[str] = [".pdf", ".docx", ".doc", ".txt"]
+    MAX_UPLOAD_BYTES: int = 250 * 1024 * 1024  # per file
+    MAX_REQUEST_BYTES: int = 1024 * 1024 * 1024  # per request body, checked while streaming
+    UPLOAD_CHUNK_BYTES: int = 8 * 1024 * 1024  # suggested chunk size for resumable uploads
+    RESUMABLE_UPLOAD_TTL_SECONDS: int = 24 * 3600  # incomplete uploads are purged after this
+
+    # Bulk upload (multiple files and .zip archives per request)
+    BULK_UPLOAD_MAX_FILES: int = 100  # after expanding archives
+    BULK_UPLOAD_MAX_ARCHIVE_BYTES: int = 2 * 1024 * 1024 * 1024  # declared uncompressed size
+    BULK_UPLOAD_CONCURRENCY: int = 8  # files stored / extracted at once
+
+    # Extraction cache (content-addressed by SHA-256 of the upload)
+    EXTRACTION_CACHE_ENABLED: bool = True
+    EXTRACTION_CACHE_DIR: str = "cache/extraction"
+    EXTRACTION_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024  # 1 GB
+
+    # AI providers
+    AI_PROVIDER: str = "openai"  # openai, azure-openai, fake
+    AI_MAX_CONCURRENT_REQUESTS: int = 10  # per provider
+    AI_TOKENS_PER_MINUTE: int = 80000  # per provider, 0 = unlimited
+    AI_HTTP_MAX_CONNECTIONS: int = 100
+    AI_HTTP_MAX_KEEPALIVE: int = 20
+    AI_HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    AI_JSON_MODE_MODELS: List[str] = [  # model name prefixes accepting response_format=json_object
+        "gpt-4o", "gpt-4-turbo", "gpt-4-1106", "gpt-4-0125", "gpt-4.1", "gpt-5", "gpt-3.5-turbo-1106", "gpt-3.5-turbo-0125"
+    ]
+    AI_JSON_MAX_CONTINUATIONS: int = 2  # follow-up calls to finish truncated JSON
+
+    # OpenAI
+    OPENAI_API_KEY: Optional[str] = None
+    OPENAI_TIMEOUT_SECONDS: float = 120.0
+    OPENAI_MAX_RETRIES: int = 2
+
+    # Azure OpenAI
+    AZURE_OPENAI_KEY: Optional[str] = None
+    AZURE_OPENAI_ENDPOINT: Optional[str] = None
+    AZURE_OPENAI_API_VERSION: str = "2024-06-01"
+    AZURE_OPENAI_DEPLOYMENT: Optional[str] = None  # defaults to the model name
+    AZURE_OPENAI_EMBEDDING_DEPLOYMENT: Optional[str] = None  # defaults to the model name
+
+    # AI response cache
+    AI_RESPONSE_CACHE_ENABLED: bool = True
+    AI_RESPONSE_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    AI_RESPONSE_CACHE_MAX_ENTRIES: int = 512  # in-memory tier
+    AI_RESPONSE_CACHE_DIR: str = "cache/ai_responses"
+    AI_RESPONSE_CACHE_MAX_BYTES: int = 256 * 1024 * 1024  # persistent tier
+
+    # Retrieval (per-document vector index)
+    EMBEDDING_MODEL: str = "text-embedding-3-small"
+    EMBEDDING_BATCH_SIZE: int = 256  # texts per embeddings request
+    VECTOR_INDEX_DIR: str = "cache/vector_index"
+    VECTOR_INDEX_MAX_BYTES: int = 1024 * 1024 * 1024  # 1 GB on disk
+    VECTOR_INDEX_CHUNK_TOKENS: int = 400
+    VECTOR_INDEX_CHUNK_OVERLAP_TOKENS: int = 40
+    VECTOR_INDEX_ANN_MIN_VECTORS: int = 2000  # IVF index at or above this size, exact search below
+    VECTOR_INDEX_ANN_NPROBE: int = 8  # IVF lists scanned per query
+    VECTOR_INDEX_CACHE_ENTRIES: int = 32  # loaded indexes kept in memory
+    RFP_CRITERION_TOP_K: int = 5
+
+    # Criterion scoring (model calls also share the provider's global limits)
+    RFP_CRITERIA_CONCURRENCY: int = 8  # scoring calls in flight per evaluation
+    RFP_CRITERIA_PACK_SIZE: int = 4  # max criteria evaluated in one call
+    RFP_CRITERIA_PACK_MAX_TOKENS: int = 3000  # excerpt budget of a packed call
+    RFP_CRITERIA_PACK_MIN_OVERLAP: float = 0.6  # share of passages in common to pack together
+    RFP_CRITERIA_SMALL_TOKENS: int = 200  # only criteria this short are packed
+
+    # AI usage accounting (ai_request_logs, written in batches)
+    AI_USAGE_LOG_ENABLED: bool = True
+    AI_USAGE_LOG_BATCH_SIZE: int = 500  # rows per bulk insert
+    AI_USAGE_LOG_FLUSH_SECONDS: float = 2.0
+    AI_USAGE_LOG_MAX_PENDING: int = 20000  # rows buffered before new ones are dropped
+    # USD per 1M tokens as [input, output], matched on the longest model name prefix
+    AI_MODEL_PRICING: Dict[str, List[float]] = {
+        "gpt-4o-mini": [0.15, 0.60],
+        "gpt-4o": [2.50, 10.00],
+        "gpt-4-turbo": [10.00, 30.00],
+        "gpt-4": [30.00, 60.00],
+        "gpt-3.5-turbo": [0.50, 1.50],
+        "text-embedding-3-small": [0.02, 0.0],
+        "text-embedding-3-large": [0.13, 0.0],
+        "text-embedding-ada-002": [0.10, 0.0],
+    }
+
+    # Error logging (error_logs, written in batches)
+    ERROR_LOG_BATCH_SIZE: int = 200
+    ERROR_LOG_FLUSH_SECONDS: float = 2.0
+    ERROR_LOG_MAX_PENDING: int = 5000  # distinct errors buffered before new ones are dropped
+    ERROR_LOG_CLIENT_ERROR_SAMPLE_RATE: float = 1.0  # share of 4xx errors recorded
+
+    # Shared cache (optional, requires the redis package)
+    SHARED_CACHE_URL: Optional[str] = None  # e.g. redis://localhost:6379/0
+
     # CORS
     CORS_ORIGINS: Union[str, List[str]] = "http://localhost:5173,http://localhost:3000"
     
     # Logging
     LOG_LEVEL: str = "INFO"
+    LOG_ENQUEUE: bool = True  # write log lines from a background thread instead of the event loop
+    LOG_REQUEST_SAMPLE_RATE: float = 1.0  # share of successful requests logged
+    LOG_SLOW_REQUEST_MS: int = 1000  # requests slower than this are always logged
+    
+    # Metrics (/metrics)
+    METRICS_DIR: Optional[str] = None  # shared directory for merging uvicorn workers; unset = this process only
+    METRICS_FLUSH_SECONDS: float = 5.0
+    
+    # Profiling: span traces of slow requests/jobs, cProfile on demand
+    PROFILING_SLOW_MS: int = 10000  # save span timings of requests and jobs slower than this
+    PROFILING_HEADER_ENABLED: bool = False  # honour "X-Profile: 1" from any client (dev/staging)
+    PROFILING_DIR: str = "cache/profiles"
+    PROFILING_MAX_BYTES: int = 64 * 1024 * 1024
     
     @field_validator('CORS_ORIGINS', mode='before')
     @classmethod
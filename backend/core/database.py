@@ -1,22 +1,66 @@
 """
 Database Setup and Session Management
 """
+import time
+import uuid
 from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import declarative_base
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session, declarative_base
 from loguru import logger
 
 from core.config import settings
+from core.metrics import metrics
+from core.profiling import record_span
 
-# Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://"),
-    pool_size=settings.DB_POOL_SIZE,
-    max_overflow=settings.DB_MAX_OVERFLOW,
-    echo=settings.is_development,
-)
+# Create async engines
+DATABASE_URL = settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
+DATABASE_READ_URL = (settings.DATABASE_READ_URL or "").replace("postgresql://", "postgresql+asyncpg://") or None
+
+
+def _engine_options(url: str) -> dict:
+    """Pool and driver settings for a database URL"""
+    # SQLite (local runs, job queue without Postgres) uses its own pool class
+    if url.startswith("sqlite"):
+        return {}
+    options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if url.startswith("postgresql+asyncpg"):
+        connect_args = {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+        if settings.DB_STATEMENT_CACHE_SIZE == 0:
+            # pgbouncer in transaction mode: no statement caching, and unique
+            # statement names so backends shared between clients never clash
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+        options["connect_args"] = connect_args
+    return options
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    engine = create_async_engine(url, echo=settings.DB_ECHO, **_engine_options(url))
+    event.listen(engine.sync_engine, "before_cursor_execute", _query_started)
+    event.listen(engine.sync_engine, "after_cursor_execute", _query_finished)
+    return engine
+
+
+# Query time shows up as "db" spans in profiling traces
+def _query_started(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_started"] = time.perf_counter()
+
+
+def _query_finished(conn, cursor, statement, parameters, context, executemany):
+    record_span("db", time.perf_counter() - conn.info.pop("query_started", time.perf_counter()))
 
-# Create session factory
+
+engine = _create_engine(DATABASE_URL)
+replica_engine = _create_engine(DATABASE_READ_URL) if DATABASE_READ_URL else None
+
+# Create session factories
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -25,9 +69,53 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+
+
+class ReadOnlySession(Session):
+    """Session behind get_read_db; refuses to flush changes"""
+
+
+@event.listens_for(ReadOnlySession, "before_flush")
+def _reject_writes(session, flush_context, instances):
+    raise RuntimeError("Read-only session cannot write; use get_db")
+
+
+def _read_sessionmaker(bind: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(
+        bind.execution_options(isolation_level="AUTOCOMMIT"),
+        class_=AsyncSession,
+        sync_session_class=ReadOnlySession,
+        expire_on_commit=False,
+        autoflush=False,
+    )
+
+
+# Read-only sessions run in autocommit mode: no BEGIN/COMMIT round trips
+# around their queries. ReadSessionLocal goes to the replica when one is
+# configured; PrimaryReadSessionLocal always reads the primary.
+ReadSessionLocal = _read_sessionmaker(replica_engine or engine)
+PrimaryReadSessionLocal = _read_sessionmaker(engine)
+
 # Base for models
 Base = declarative_base()
 
+DB_POOL_SIZE = metrics.gauge("aihub_db_pool_size", "Connections the pool keeps open", ["engine"])
+DB_POOL_CHECKED_OUT = metrics.gauge("aihub_db_pool_checked_out", "Connections in use", ["engine"])
+DB_POOL_OVERFLOW = metrics.gauge("aihub_db_pool_overflow", "Connections open beyond pool_size", ["engine"])
+
+
+def _collect_pool_metrics():
+    for name, pooled in (("primary", engine), ("replica", replica_engine)):
+        pool = pooled.pool if pooled is not None else None
+        # Only queue pools track these (SQLite runs without a pool)
+        if hasattr(pool, "checkedout"):
+            DB_POOL_SIZE.set(pool.size(), name)
+            DB_POOL_CHECKED_OUT.set(pool.checkedout(), name)
+            DB_POOL_OVERFLOW.set(max(pool.overflow(), 0), name)
+
+
+metrics.add_collector(_collect_pool_metrics)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
@@ -45,6 +133,29 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Read-only database session dependency
+    Never commits, and its queries run without a transaction (on the
+    replica if DATABASE_READ_URL is set). Only for routes that do not
+    write, and that can tolerate replica lag.
+    Usage: db: AsyncSession = Depends(get_read_db)
+    """
+    async with ReadSessionLocal() as session:
+        yield session
+
+
+async def get_primary_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Read-only database session dependency on the primary
+    Like get_read_db, but never on the replica: for reads that must see
+    writes made moments before, e.g. status that clients poll.
+    Usage: db: AsyncSession = Depends(get_primary_read_db)
+    """
+    async with PrimaryReadSessionLocal() as session:
+        yield session
+
+
 async def init_database():
     """Initialize database - create all tables"""
     async with engine.begin() as conn:
@@ -55,4 +166,6 @@ async def init_database():
 async def close_database():
     """Close database connections"""
     await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
     logger.info("Database connections closed")
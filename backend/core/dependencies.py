@@ -8,6 +8,7 @@ from jose import JWTError
 
 from core.database import get_db
 from core.security import decode_token
+from core.user_cache import user_cache
 from shared.models.user import User
 from sqlalchemy import select
 
@@ -18,17 +19,33 @@ async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db)
 ) -> User:
-    """Get current authenticated user"""
+    """
+    Get current authenticated user
+    Served from the user cache when possible; the session is only
+    used (and a connection checked out) on a cache miss.
+    """
     try:
         payload = decode_token(credentials.credentials)
         user_id = int(payload.get("sub"))
         
+        user = await user_cache.get(user_id)
+        if user is not None:
+            return user
+        
         result = await db.execute(select(User).where(User.id == user_id))
         user = result.scalar_one_or_none()
         
         if not user:
             raise HTTPException(status_code=401, detail="User not found")
         
+        await user_cache.set(user)
         return user
     except (JWTError, ValueError):
         raise HTTPException(status_code=401, detail="Invalid token")
+
+
+async def get_admin_user(user: User = Depends(get_current_user)) -> User:
+    """Current user, required to have the admin role"""
+    if "admin" not in (user.roles or []):
+        raise HTTPException(status_code=403, detail="Admin role required")
+    return user
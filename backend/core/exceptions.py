@@ -6,6 +6,7 @@ from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from datetime import datetime
 from loguru import logger
+import traceback
 
 from shared.schemas.base import ErrorResponse, ErrorDetail
 
@@ -34,28 +35,41 @@ class ValidationException(AIHubException):
         super().__init__(message, "VALIDATION_ERROR", 422)
 
 
-async def log_error_to_db(request: Request, error: Exception):
-    """Log error to database"""
+class ConflictException(AIHubException):
+    def __init__(self, message: str):
+        super().__init__(message, "CONFLICT", 409)
+
+
+class PayloadTooLargeException(AIHubException):
+    def __init__(self, message: str):
+        super().__init__(message, "PAYLOAD_TOO_LARGE", 413)
+
+
+def log_error(request: Request, error: Exception, status_code: int = 500, stack_trace: str = None):
+    """
+    Queue an error for the error log
+    Rows are written in batches by the error log writer, so responses do
+    not wait on the database (and error storms do not add DB load).
+    """
     try:
         from shared.services.error_service import ErrorService
-        from core.database import AsyncSessionLocal
         
-        async with AsyncSessionLocal() as db:
-            await ErrorService.log_error(
-                error_code=getattr(error, 'code', 'UNKNOWN'),
-                message=str(error),
-                severity="error",
-                method=request.method,
-                path=request.url.path,
-                db=db
-            )
+        ErrorService.record_error(
+            error_code=getattr(error, 'code', 'UNKNOWN'),
+            message=str(error),
+            severity="error" if status_code >= 500 else "warning",
+            method=request.method,
+            path=request.url.path,
+            status_code=status_code,
+            stack_trace=stack_trace
+        )
     except Exception as e:
-        logger.error(f"Failed to log error to DB: {e}")
+        logger.error(f"Failed to queue error log: {e}")
 
 
 async def aihub_exception_handler(request: Request, exc: AIHubException):
     """Handle custom exceptions"""
-    await log_error_to_db(request, exc)
+    log_error(request, exc, exc.status_code)
     
     return JSONResponse(
         status_code=exc.status_code,
@@ -89,7 +103,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 async def generic_exception_handler(request: Request, exc: Exception):
     """Handle all other exceptions"""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    await log_error_to_db(request, exc)
+    log_error(request, exc, 500, "".join(traceback.format_exception(exc))[-4000:])
     
     return JSONResponse(
         status_code=500,
@@ -0,0 +1,299 @@
+"""
+Background Job Queue
+DB-persisted job table drained by an in-process asyncio worker pool
+"""
+import asyncio
+import random
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from loguru import logger
+
+from core.config import settings
+from core.database import AsyncSessionLocal
+from core.exceptions import AIHubException
+from core.profiling import save_if_slow, tracing
+from shared.models.job import Job
+
+JobHandler = Callable[[Dict[str, Any], AsyncSession], Awaitable[Any]]
+FailureHandler = Callable[[Dict[str, Any], str, AsyncSession], Awaitable[None]]
+
+
+class JobQueue:
+    """
+    Persisted job queue with bounded concurrency and retry with backoff.
+
+    Jobs live in the `jobs` table, so they survive restarts and can be
+    claimed safely by several uvicorn workers. Within a process, enqueue
+    wakes idle workers immediately instead of waiting for the next poll.
+    Works against any async SQLAlchemy backend (PostgreSQL, SQLite).
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        concurrency: int = settings.JOB_WORKER_CONCURRENCY,
+        poll_interval: float = settings.JOB_POLL_INTERVAL_SECONDS,
+    ):
+        self._session_factory = session_factory
+        self._concurrency = concurrency
+        self._poll_interval = poll_interval
+        self._handlers: Dict[str, JobHandler] = {}
+        self._failure_handlers: Dict[str, FailureHandler] = {}
+        self._workers: List[asyncio.Task] = []
+        self._in_flight: Dict[int, Job] = {}  # jobs claimed by this process
+        self._wakeup = asyncio.Event()
+        self._running = False
+
+    def handler(
+        self,
+        job_type: str,
+        on_failure: Optional[FailureHandler] = None
+    ) -> Callable[[JobHandler], JobHandler]:
+        """
+        Register a coroutine as the handler for a job type
+        on_failure(payload, error, db) runs once the job has failed for good
+        (no attempts left, or a client error that a retry cannot fix).
+        """
+        def decorator(func: JobHandler) -> JobHandler:
+            self._handlers[job_type] = func
+            if on_failure is not None:
+                self._failure_handlers[job_type] = on_failure
+            return func
+        return decorator
+
+    async def enqueue(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        db: AsyncSession,
+        user_id: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+    ) -> Job:
+        """Persist a new job and wake a worker"""
+        if job_type not in self._handlers:
+            raise ValueError(f"No handler registered for job type: {job_type}")
+
+        job = Job(
+            job_type=job_type,
+            payload=payload,
+            user_id=user_id,
+            status="queued",
+            attempts=0,
+            max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+            run_after=datetime.utcnow(),
+        )
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+
+        self._wakeup.set()
+        logger.info(f"📨 Job queued: {job.id} ({job_type})")
+        return job
+
+    async def start(self):
+        """Requeue orphaned jobs and start the worker pool"""
+        if self._running:
+            return
+        self._running = True
+        await self._requeue_stale_jobs()
+        self._workers = [
+            asyncio.create_task(self._worker_loop(n), name=f"job-worker-{n}")
+            for n in range(self._concurrency)
+        ]
+        logger.info(f"Job queue started with {self._concurrency} workers")
+
+    async def stop(self):
+        """Stop workers and return the jobs they were running to the queue"""
+        self._running = False
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        interrupted = list(self._in_flight.values())
+        self._in_flight.clear()
+        await self._requeue(interrupted, "Interrupted by shutdown")
+        logger.info("Job queue stopped")
+
+    async def _worker_loop(self, worker_id: int):
+        while self._running:
+            try:
+                job = await self._claim_next()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job worker {worker_id} failed to claim job: {e}")
+                job = None
+
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self._poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._execute(job)
+
+    async def _claim_next(self) -> Optional[Job]:
+        """
+        Atomically move the oldest due job from queued to running.
+        The conditional UPDATE makes the claim safe across workers and
+        processes without relying on SELECT ... FOR UPDATE support.
+        """
+        async with self._session_factory() as db:
+            now = datetime.utcnow()
+            result = await db.execute(
+                select(Job.id)
+                .where(
+                    Job.status == "queued",
+                    Job.run_after <= now,
+                    Job.job_type.in_(list(self._handlers)),
+                )
+                .order_by(Job.run_after)
+                .limit(self._concurrency)
+            )
+            for job_id in result.scalars().all():
+                claimed = await db.execute(
+                    update(Job)
+                    .where(Job.id == job_id, Job.status == "queued")
+                    .values(
+                        status="running",
+                        attempts=Job.attempts + 1,
+                        started_at=now,
+                        updated_at=now,
+                    )
+                )
+                await db.commit()
+                if claimed.rowcount == 1:
+                    return await db.get(Job, job_id)
+        return None
+
+    async def _execute(self, job: Job):
+        handler = self._handlers[job.job_type]
+        self._in_flight[job.id] = job
+        try:
+            with tracing(f"job-{job.id}", job.job_type) as trace:
+                async with self._session_factory() as db:
+                    result = await asyncio.wait_for(
+                        handler(job.payload or {}, db),
+                        timeout=settings.JOB_TIMEOUT_SECONDS,
+                    )
+        except asyncio.CancelledError:
+            # Shutdown: the job stays in _in_flight and stop() requeues it
+            raise
+        except Exception as e:
+            await save_if_slow(trace, status="failed", error=str(e) or e.__class__.__name__)
+            await self._record_failure(job, e)
+            self._in_flight.pop(job.id, None)
+            return
+
+        await save_if_slow(trace, status="completed")
+
+        await self._finish(job.id, status="completed", result=result)
+        self._in_flight.pop(job.id, None)
+        logger.info(f"✅ Job completed: {job.id} ({job.job_type})")
+
+    async def _record_failure(self, job: Job, error: Exception):
+        message = str(error) or error.__class__.__name__
+        if job.attempts < job.max_attempts and self._is_retryable(error):
+            delay = self._backoff(job.attempts)
+            async with self._session_factory() as db:
+                await db.execute(
+                    update(Job)
+                    .where(Job.id == job.id)
+                    .values(
+                        status="queued",
+                        error=message,
+                        run_after=datetime.utcnow() + timedelta(seconds=delay),
+                        updated_at=datetime.utcnow(),
+                    )
+                )
+                await db.commit()
+            logger.warning(
+                f"Job {job.id} failed (attempt {job.attempts}/{job.max_attempts}), "
+                f"retrying in {delay:.1f}s: {message}"
+            )
+        else:
+            await self._fail(job, message)
+
+    async def _fail(self, job: Job, message: str):
+        """Mark a job failed for good and run its failure handler"""
+        await self._finish(job.id, status="failed", error=message)
+        logger.error(f"❌ Job failed permanently: {job.id} ({job.job_type}): {message}")
+        on_failure = self._failure_handlers.get(job.job_type)
+        if on_failure is None:
+            return
+        try:
+            async with self._session_factory() as db:
+                await on_failure(job.payload or {}, message, db)
+        except Exception as e:
+            logger.error(f"Failure handler for job {job.id} ({job.job_type}) failed: {e}")
+
+    async def _finish(self, job_id: int, status: str, result: Any = None, error: str = None):
+        now = datetime.utcnow()
+        async with self._session_factory() as db:
+            await db.execute(
+                update(Job)
+                .where(Job.id == job_id)
+                .values(status=status, result=result, error=error, finished_at=now, updated_at=now)
+            )
+            await db.commit()
+
+    async def _requeue_stale_jobs(self):
+        """
+        Return jobs orphaned by a crashed process to the queue
+        Jobs of a process that shut down cleanly were requeued by its stop();
+        these are the ones still "running" well past the job timeout.
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.JOB_TIMEOUT_SECONDS * 2)
+        async with self._session_factory() as db:
+            result = await db.execute(
+                select(Job).where(Job.status == "running", Job.started_at < cutoff)
+            )
+            stale = result.scalars().all()
+        await self._requeue(stale, "Worker stopped while running the job")
+
+    async def _requeue(self, jobs: List[Job], reason: str):
+        """
+        Put interrupted jobs back in the queue
+        The interrupted run counts as an attempt (claiming incremented it),
+        so a job that keeps getting interrupted still fails after max_attempts.
+        """
+        if not jobs:
+            return
+        now = datetime.utcnow()
+        requeued = 0
+        async with self._session_factory() as db:
+            for job in jobs:
+                if job.attempts >= job.max_attempts:
+                    continue
+                result = await db.execute(
+                    update(Job)
+                    .where(Job.id == job.id, Job.status == "running")
+                    .values(status="queued", error=reason, run_after=now, updated_at=now)
+                )
+                requeued += result.rowcount
+            await db.commit()
+        for job in jobs:
+            if job.attempts >= job.max_attempts:
+                await self._fail(job, reason)
+        if requeued:
+            logger.warning(f"Requeued {requeued} interrupted jobs: {reason}")
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """Client errors (missing records, invalid input) fail the same way on every attempt"""
+        return not (isinstance(error, AIHubException) and 400 <= error.status_code < 500)
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """Exponential backoff with jitter"""
+        delay = settings.JOB_RETRY_BACKOFF_SECONDS * (2 ** (attempt - 1))
+        delay = min(delay, settings.JOB_RETRY_BACKOFF_MAX_SECONDS)
+        return delay * random.uniform(0.8, 1.2)
+
+
+job_queue = JobQueue()
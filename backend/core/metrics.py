@@ -0,0 +1,272 @@
+"""
+Metrics
+In-process counters, gauges and histograms, exposed at /metrics in the
+Prometheus text format.
+
+Recording is a dict lookup and an add on the event loop, with no locks.
+With several uvicorn workers, set METRICS_DIR to a directory shared by
+them: each worker writes a snapshot of its values there every
+METRICS_FLUSH_SECONDS, and whichever worker serves /metrics adds the
+other workers' snapshots to its own live values.
+"""
+import asyncio
+import json
+import math
+import os
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from core.config import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+Labels = Tuple[str, ...]
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, Any] = {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "type": self.kind,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+            "values": [[list(labels), value] for labels, value in self._values.items()],
+        }
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def set(self, value: float, *labels: str):
+        """Mirror a cumulative count kept elsewhere (collectors only)"""
+        self._values[labels] = value
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value: float, *labels: str):
+        self._values[labels] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels: str):
+        # One count per bucket (not cumulative) plus +Inf, then sum and count
+        series = self._values.get(labels)
+        if series is None:
+            series = self._values[labels] = [0] * (len(self.buckets) + 3)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {**super().snapshot(), "buckets": list(self.buckets)}
+
+
+class MetricsRegistry:
+    """Process-wide metrics, merged across workers on scrape"""
+
+    def __init__(self, directory: Optional[str] = None, flush_interval: float = 5.0):
+        self.directory = Path(directory) if directory else None
+        self.flush_interval = flush_interval
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._ratios: List[Tuple[str, str, str, str]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def _register(self, metric: Metric) -> Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], None]):
+        """Run collector before every snapshot, e.g. to set gauges from pool state"""
+        self._collectors.append(collector)
+
+    def add_ratio(self, name: str, documentation: str, numerator: str, other: str):
+        """
+        Gauge computed on scrape as numerator / (numerator + other) per label
+        set, after merging workers (e.g. cache hit ratio from hits and misses)
+        """
+        self._ratios.append((name, documentation, numerator, other))
+
+    def snapshot(self) -> Dict[str, Any]:
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.warning(f"Metrics collector {collector.__name__} failed: {e}")
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    # Multi-worker aggregation
+
+    def _own_file(self) -> Path:
+        return self.directory / f"metrics-{os.getpid()}.json"
+
+    def _write(self, snapshot: Dict[str, Any]):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._own_file()
+        temporary = path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(snapshot))
+        os.replace(temporary, path)
+
+    def _read_others(self) -> List[Dict[str, Any]]:
+        """Snapshots of the other live workers; files of workers gone quiet are removed"""
+        own = self._own_file()
+        cutoff = time.time() - 3 * self.flush_interval
+        snapshots = []
+        for path in self.directory.glob("metrics-*.json"):
+            if path == own:
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink(missing_ok=True)
+                    continue
+                snapshots.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await asyncio.to_thread(self._write, self.snapshot())
+            except OSError as e:
+                logger.warning(f"Metrics snapshot write failed: {e}")
+
+    async def start(self):
+        if self.directory is not None and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="metrics-snapshot")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            self._own_file().unlink(missing_ok=True)
+
+    # Exposition
+
+    async def render(self) -> str:
+        """All metrics in the Prometheus text format (version 0.0.4)"""
+        snapshots = [self.snapshot()]
+        if self.directory is not None and self.directory.exists():
+            snapshots += await asyncio.to_thread(self._read_others)
+        merged = _merge(snapshots)
+
+        for name, documentation, numerator, other in self._ratios:
+            if numerator not in merged or other not in merged:
+                continue
+            parts = dict(merged[other]["values"])
+            values = {}
+            for labels, count in merged[numerator]["values"].items():
+                total = count + parts.get(labels, 0.0)
+                values[labels] = round(count / total, 4) if total else 0.0
+            merged[name] = {
+                "type": "gauge",
+                "help": documentation,
+                "labelnames": merged[numerator]["labelnames"],
+                "values": values,
+            }
+
+        lines: List[str] = []
+        for name, family in merged.items():
+            lines.append(f"# HELP {name} {family['help']}")
+            lines.append(f"# TYPE {name} {family['type']}")
+            labelnames = family["labelnames"]
+            for labels, value in family["values"].items():
+                if family["type"] == "histogram":
+                    lines.extend(_histogram_lines(name, labelnames, labels, family["buckets"], value))
+                else:
+                    lines.append(f"{name}{_labels(labelnames, labels)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _merge(snapshots: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Sum values of the same series across worker snapshots"""
+    merged: Dict[str, Dict[str, Any]] = {}
+    for snapshot in snapshots:
+        for name, family in snapshot.items():
+            target = merged.setdefault(name, {**family, "values": {}})
+            values = target["values"]
+            for labels, value in family["values"]:
+                key = tuple(labels)
+                if family["type"] == "histogram":
+                    current = values.get(key)
+                    values[key] = list(value) if current is None else [a + b for a, b in zip(current, value)]
+                else:
+                    values[key] = values.get(key, 0.0) + value
+    return merged
+
+
+def _histogram_lines(name: str, labelnames, labels, buckets, series) -> List[str]:
+    lines = []
+    cumulative = 0
+    for bound, count in zip([*buckets, math.inf], series):
+        cumulative += count
+        le = "+Inf" if bound == math.inf else _number(bound)
+        lines.append(f"{name}_bucket{_labels([*labelnames, 'le'], [*labels, le])} {cumulative}")
+    lines.append(f"{name}_sum{_labels(labelnames, labels)} {_number(series[-2])}")
+    lines.append(f"{name}_count{_labels(labelnames, labels)} {series[-1]}")
+    return lines
+
+
+def _labels(names, values) -> str:
+    if not names:
+        return ""
+    escaped = (
+        str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        for value in values
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+metrics = MetricsRegistry(settings.METRICS_DIR, settings.METRICS_FLUSH_SECONDS)
@@ -1,40 +1,221 @@
 """
 Middleware Setup
 """
+import random
 import time
 import uuid
+from typing import Any, Dict
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from loguru import logger
 
 from core.config import settings
+from core.exceptions import PayloadTooLargeException, aihub_exception_handler
+from core.metrics import metrics
+from core.profiling import profiler, save_if_slow, tracing
 
+HTTP_REQUESTS = metrics.counter(
+    "aihub_http_requests_total", "HTTP requests by route and status", ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = metrics.histogram(
+    "aihub_http_request_duration_seconds", "HTTP request latency by route", ["method", "route"]
+)
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Log all requests"""
-    async def dispatch(self, request: Request, call_next):
+
+class RequestLoggingMiddleware:
+    """
+    Log one line per request with status and duration, and tag the
+    response with X-Request-ID
+    Plain ASGI rather than BaseHTTPMiddleware: no extra task or body
+    re-streaming per request, and streaming responses pass straight
+    through. Successful requests can be sampled; errors and slow requests
+    are always logged.
+    """
+    def __init__(self, app: ASGIApp, sample_rate: float = 1.0, slow_ms: float = 1000):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
         request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
+        scope.setdefault("state", {})["request_id"] = request_id
+        status_code = 500
+        start = time.perf_counter_ns()
+        
+        async def send_with_request_id(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [*message.get("headers", []), (b"x-request-id", request_id.encode())]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            duration_ms = (time.perf_counter_ns() - start) / 1_000_000
+            if (
+                status_code >= 400
+                or duration_ms >= self.slow_ms
+                or self.sample_rate >= 1
+                or random.random() < self.sample_rate
+            ):
+                logger.info(
+                    f"📤 {scope['method']} {scope['path']} - {status_code} ({duration_ms:.1f}ms)",
+                    request_id=request_id
+                )
+
+
+class ProfilingMiddleware:
+    """
+    Trace every request (see core.profiling): span timings of requests
+    slower than PROFILING_SLOW_MS are saved, and requests that ask for it
+    (X-Profile: 1) or match an armed profile run under cProfile. Results
+    are stored under the request id from RequestLoggingMiddleware.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        start_time = time.time()
+        request_id = scope.get("state", {}).get("request_id") or str(uuid.uuid4())
+        requested = any(name == b"x-profile" and value in (b"1", b"true") for name, value in scope["headers"])
+        profile = profiler.claim(scope["path"], requested)
+        status_code = 500
         
-        logger.info(f"📥 {request.method} {request.url.path}", request_id=request_id)
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
         
-        response = await call_next(request)
+        with tracing(request_id, f"{scope['method']} {scope['path']}") as trace:
+            try:
+                if profile is not None:
+                    profile.enable()
+                await self.app(scope, receive, send_with_status)
+            finally:
+                if profile is not None:
+                    profile.disable()
+                    profiler.release()
+                    await profiler.save(trace, profile, status=status_code)
+                else:
+                    await save_if_slow(trace, status=status_code)
+
+
+class MetricsMiddleware:
+    """
+    Count requests and record latency per route template (not raw path, so
+    IDs do not multiply series); requests that match no route share one label
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._route_paths: Dict[Any, str] = {}
+    
+    def _route_path(self, scope: Scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        path = self._route_paths.get(endpoint)
+        if path is None:
+            routes = getattr(scope.get("app"), "routes", [])
+            self._route_paths = {getattr(route, "endpoint", None): route.path for route in routes}
+            path = self._route_paths.setdefault(endpoint, "unmatched")
+        return path
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status_code = 500
+        start = time.perf_counter()
         
-        duration = time.time() - start_time
-        logger.info(
-            f"📤 {request.method} {request.url.path} - {response.status_code} ({duration:.3f}s)",
-            request_id=request_id
-        )
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
         
-        response.headers["X-Request-ID"] = request_id
-        return response
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = self._route_path(scope)
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - start, scope["method"], route)
+            HTTP_REQUESTS.inc(scope["method"], route, str(status_code))
+
+
+class BodySizeLimitMiddleware:
+    """
+    Reject request bodies larger than max_bytes
+    Declared Content-Length is checked up front; streamed (chunked) bodies
+    are counted as they are read, so oversized uploads are cut off without
+    being buffered or written out in full.
+    """
+    def __init__(self, app: ASGIApp, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        exc = PayloadTooLargeException(f"Request body exceeds the {self.max_bytes} byte limit")
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+            await self._reject(scope, receive, send, exc)
+            return
+        
+        received = 0
+        exceeded = False
+        response_started = False
+        
+        async def limited_receive() -> Message:
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    exceeded = True
+                    raise exc
+            return message
+        
+        async def checked_send(message: Message):
+            nonlocal response_started
+            # Form parsing turns read errors into a 400; answer 413 instead
+            if exceeded and not response_started:
+                return
+            response_started = True
+            await send(message)
+        
+        try:
+            await self.app(scope, limited_receive, checked_send)
+        except Exception:
+            if not exceeded or response_started:
+                raise
+        if exceeded and not response_started:
+            await self._reject(scope, receive, send, exc)
+    
+    @staticmethod
+    async def _reject(scope: Scope, receive: Receive, send: Send, exc: PayloadTooLargeException):
+        response = await aihub_exception_handler(Request(scope), exc)
+        response.headers["Connection"] = "close"
+        await response(scope, receive, send)
 
 
 def setup_middleware(app: FastAPI):
     """Setup all middleware"""
+    # Request size limit (innermost, so rejections still get CORS headers)
+    app.add_middleware(BodySizeLimitMiddleware, max_bytes=settings.MAX_REQUEST_BYTES)
+    
     # CORS
     app.add_middleware(
         CORSMiddleware,
@@ -44,5 +225,15 @@ def setup_middleware(app: FastAPI):
         allow_headers=["*"],
     )
     
+    # Span traces and on-demand profiles (inside request logging, which assigns the request id)
+    app.add_middleware(ProfilingMiddleware)
+    
     # Request logging
-    app.add_middleware(RequestLoggingMiddleware)
+    app.add_middleware(
+        RequestLoggingMiddleware,
+        sample_rate=settings.LOG_REQUEST_SAMPLE_RATE,
+        slow_ms=settings.LOG_SLOW_REQUEST_MS
+    )
+    
+    # Route latency and request counts (outermost, so it times the full stack)
+    app.add_middleware(MetricsMiddleware)
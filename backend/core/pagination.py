@@ -0,0 +1,82 @@
+"""
+Keyset Pagination
+Opaque cursors over (created_at, id), newest first.
+
+OFFSET makes the database walk and discard every skipped row, so deep
+pages get linearly slower; a cursor holds the sort key of the last row
+returned and the next page starts from it through the index.
+"""
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.exceptions import ValidationException
+
+
+@dataclass
+class Cursor:
+    """Position after the last row of a page"""
+    created_at: datetime
+    id: int
+    page: int  # number of the page this cursor leads to
+
+
+@dataclass
+class Page:
+    """One page of a keyset-paginated listing"""
+    items: List[Any]
+    page: int
+    total: int
+    total_estimated: bool = False
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    raw = json.dumps([cursor.created_at.isoformat(), cursor.id, cursor.page], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+_MAX_ID = 2**31 - 1  # Integer primary keys
+
+
+def decode_cursor(value: str) -> Cursor:
+    """Parse a client-supplied cursor; anything encode_cursor could not have produced is a 422"""
+    try:
+        raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+        created_at, row_id, page = json.loads(raw)
+        cursor = Cursor(datetime.fromisoformat(created_at), row_id, page)
+    except (ValueError, TypeError, RecursionError):
+        raise ValidationException("Invalid pagination cursor")
+    # Forged values that decode but would fail in the query: created_at
+    # columns are naive UTC, and a cursor always leads to page 2 or later
+    if (
+        cursor.created_at.tzinfo is not None
+        or type(cursor.id) is not int
+        or type(cursor.page) is not int
+        or not 0 < cursor.id <= _MAX_ID
+        or cursor.page < 2
+    ):
+        raise ValidationException("Invalid pagination cursor")
+    return cursor
+
+
+def after_cursor(query: Select, model, cursor: Optional[Cursor]) -> Select:
+    """Order newest first and start after cursor; the (created_at, id) row comparison can use an index"""
+    if cursor is not None:
+        query = query.where(tuple_(model.created_at, model.id) < (cursor.created_at, cursor.id))
+    return query.order_by(model.created_at.desc(), model.id.desc())
+
+
+async def count_capped(db: AsyncSession, query: Select, cap: int) -> Tuple[int, bool]:
+    """
+    Count the rows of query, stopping at cap
+    Returns (total, estimated); estimated means there are at least cap rows.
+    """
+    limited = query.with_only_columns(query.selected_columns[0]).order_by(None).limit(cap + 1).subquery()
+    total = await db.scalar(select(func.count()).select_from(limited))
+    return (cap, True) if total > cap else (total, False)
@@ -0,0 +1,182 @@
+"""
+Profiling
+Span timings for slow requests and jobs, and cProfile runs of single requests.
+
+Every request and job carries a Trace in a context variable; code marks
+its phases with `span("extraction")` etc., and database queries and model
+calls are recorded automatically. Traces of work slower than
+PROFILING_SLOW_MS are saved. A request can additionally be run under
+cProfile (X-Profile header or an armed admin toggle), one at a time per
+worker. Saved results are keyed by request id (X-Request-ID) or
+"job-<id>".
+"""
+import asyncio
+import cProfile
+import io
+import json
+import pstats
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from loguru import logger
+
+from core.cache import DiskCache
+from core.config import settings
+
+MAX_SPANS = 500  # per trace; beyond this only phase totals are kept
+
+_current: ContextVar[Optional["Trace"]] = ContextVar("profiling_trace", default=None)
+
+
+class Trace:
+    """Span timings of one request or job"""
+
+    def __init__(self, trace_id: str, name: str):
+        self.trace_id = trace_id
+        self.name = name
+        self.started = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self.phases: Dict[str, List[float]] = {}  # name -> [count, total seconds]
+        self.dropped_spans = 0
+
+    def add(self, name: str, start: float, duration: float):
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = [0, 0.0]
+        phase[0] += 1
+        phase[1] += duration
+        if len(self.spans) < MAX_SPANS:
+            self.spans.append({
+                "name": name,
+                "start_ms": round((start - self.started) * 1000, 2),
+                "duration_ms": round(duration * 1000, 2),
+            })
+        else:
+            self.dropped_spans += 1
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def as_dict(self, **extra) -> Dict[str, Any]:
+        return {
+            "id": self.trace_id,
+            "name": self.name,
+            "created_at": datetime.utcnow().isoformat(),
+            "duration_ms": round(self.elapsed_ms, 1),
+            **extra,
+            # Phases can overlap (concurrent model calls), so totals may exceed duration_ms
+            "phases": {
+                name: {"count": count, "total_ms": round(total * 1000, 1)}
+                for name, (count, total) in sorted(self.phases.items(), key=lambda p: -p[1][1])
+            },
+            "spans": self.spans,
+            "dropped_spans": self.dropped_spans,
+        }
+
+
+@contextmanager
+def tracing(trace_id: str, name: str) -> Iterator[Trace]:
+    """Collect spans of the enclosed work (and tasks it starts) into a new Trace"""
+    trace = Trace(trace_id, name)
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a phase of the current trace; a no-op outside one"""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, start, time.perf_counter() - start)
+
+
+def record_span(name: str, duration: float):
+    """Record work that just finished and took `duration` seconds"""
+    trace = _current.get()
+    if trace is not None:
+        end = time.perf_counter()
+        trace.add(name, end - duration, duration)
+
+
+class Profiler:
+    """
+    cProfile for single requests, one at a time per worker
+    cProfile follows the thread, so a profile also contains whatever else the
+    event loop ran meanwhile; work in the extraction process pool is not in
+    it (see the extraction span instead).
+    """
+
+    def __init__(self):
+        self.store = DiskCache(settings.PROFILING_DIR, settings.PROFILING_MAX_BYTES)
+        self.armed = 0
+        self.armed_prefix = "/"
+        self._active = False
+
+    def arm(self, count: int, path_prefix: str = "/"):
+        """Profile the next `count` requests whose path starts with path_prefix"""
+        self.armed = count
+        self.armed_prefix = path_prefix
+
+    def claim(self, path: str, requested: bool) -> Optional[cProfile.Profile]:
+        """A profiler for this request if it was requested or armed and none is running"""
+        if self._active:
+            return None
+        armed = self.armed > 0 and path.startswith(self.armed_prefix)
+        if not (armed or (requested and settings.PROFILING_HEADER_ENABLED)):
+            return None
+        if armed:
+            self.armed -= 1
+        self._active = True
+        return cProfile.Profile()
+
+    def release(self):
+        self._active = False
+
+    @staticmethod
+    def format(profile: cProfile.Profile, limit: int = 60) -> str:
+        output = io.StringIO()
+        pstats.Stats(profile, stream=output).sort_stats("cumulative").print_stats(limit)
+        return output.getvalue()
+
+    async def save(self, trace: Trace, profile: Optional[cProfile.Profile] = None, **extra):
+        """Store a trace (and profile) under its id"""
+        data = trace.as_dict(**extra)
+        data["profile"] = await asyncio.to_thread(self.format, profile) if profile is not None else None
+        try:
+            await self.store.set(_key(trace.trace_id), json.dumps(data).encode("utf-8"))
+        except OSError as e:
+            logger.warning(f"Profile write failed for {trace.trace_id}: {e}")
+            return
+        kind = "Profile" if profile is not None else "Slow trace"
+        logger.info(f"🐢 {kind} saved: {trace.trace_id} ({trace.name}, {data['duration_ms']:.0f}ms)")
+
+    async def get(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        blob = await self.store.get(_key(trace_id))
+        return json.loads(blob) if blob is not None else None
+
+
+def _key(trace_id: str) -> str:
+    # Keys become file names under PROFILING_DIR
+    return "".join(c for c in trace_id if c.isalnum() or c == "-")
+
+
+profiler = Profiler()
+
+
+async def save_if_slow(trace: Trace, **extra):
+    """Save a finished trace if it took longer than PROFILING_SLOW_MS"""
+    if trace.elapsed_ms >= settings.PROFILING_SLOW_MS:
+        await profiler.save(trace, **extra)
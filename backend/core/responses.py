@@ -0,0 +1,51 @@
+"""
+JSON Responses
+orjson rendering for every route, and a fast path for large listings.
+
+With a response_model, FastAPI re-validates what a route returns, dumps it
+to JSON-compatible dicts and only then renders it; for a page of rows with
+JSON columns that costs more than the query. The fast path skips both:
+rows read from the database are trusted, so their values go straight into
+the DataResponse/PaginatedResponse envelope and orjson renders them. Routes
+keep their response_model, which then only documents the shape.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Type
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+from shared.schemas.base import BaseResponse
+
+
+class JSONResponse(ORJSONResponse):
+    """orjson response; aware datetimes end in "Z", as pydantic renders them"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+        )
+
+
+def dump_rows(schema: Type[BaseModel], rows: Iterable[Any]) -> List[Dict[str, Any]]:
+    """
+    Rows (ORM objects or select() rows) as dicts shaped like schema, without
+    validation. Only for database rows whose column types already match
+    the schema's fields.
+    """
+    fields = tuple(schema.model_fields)
+    return [{field: getattr(row, field) for field in fields} for row in rows]
+
+
+def fast_response(data: Any, message: Optional[str] = None, **sections: BaseModel) -> JSONResponse:
+    """
+    Response envelope around already dumped data (see dump_rows)
+    Extra sections, e.g. pagination=PaginationMeta(...), follow data as
+    in the response schemas.
+    """
+    content = BaseResponse(message=message).model_dump()
+    content["data"] = data
+    for name, section in sections.items():
+        content[name] = section.model_dump()
+    return JSONResponse(content)
@@ -2,25 +2,59 @@
 Security - Password Hashing and JWT
 """
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import time
 from passlib.context import CryptContext
 from jose import jwt
 from loguru import logger
 
+from core.cache import TTLCache
 from core.config import settings
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    # Hashes at any other cost count as outdated and are rehashed on login
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
 
+# bcrypt releases the GIL, so a small thread pool runs hashes in parallel
+# while keeping CPU use bounded and the event loop free
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
 
-def hash_password(password: str) -> str:
-    """Hash a password"""
-    return pwd_context.hash(password)
 
+async def _run_password_work(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, func, *args)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify password"""
-    return pwd_context.verify(plain_password, hashed_password)
+
+async def hash_password(password: str) -> str:
+    """Hash a password (off the event loop)"""
+    return await _run_password_work(pwd_context.hash, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify password (off the event loop)"""
+    return await _run_password_work(pwd_context.verify, plain_password, hashed_password)
+
+
+async def verify_and_update_password(
+    plain_password: str,
+    hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify password; if the stored hash uses outdated settings, also
+    return a replacement hash to persist
+    """
+    return await _run_password_work(pwd_context.verify_and_update, plain_password, hashed_password)
 
 
 def create_access_token(data: Dict[str, Any]) -> str:
@@ -39,6 +73,18 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
+# Verified token payloads, each kept only until the token's own expiry
+_token_cache = TTLCache(settings.TOKEN_CACHE_MAX_ENTRIES, ttl_seconds=0)
+
+
 def decode_token(token: str) -> Dict[str, Any]:
-    """Decode JWT token"""
-    return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    """Decode JWT token (verification memoized until the token expires)"""
+    payload = _token_cache.get(token)
+    if payload is not None:
+        return payload
+    
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    expires_in = payload.get("exp", 0) - time.time()
+    if expires_in > 0:
+        _token_cache.set(token, payload, ttl_seconds=expires_in)
+    return payload
@@ -0,0 +1,120 @@
+"""
+Authenticated User Cache
+TTL-bounded in-process cache of users by id, with an optional shared tier.
+
+Entries are plain column snapshots; each hit builds a fresh, detached
+`User` from copies of them, so neither ORM instances nor mutable values
+(e.g. the roles list) are shared between concurrent requests.
+
+Code that writes a User awaits `user_cache.invalidate` after committing.
+As a backstop, ORM flushes and bulk update/delete statements on User drop
+the affected entries. Other workers' in-process tiers are not notified, so
+with a shared tier the local TTL is kept short (USER_CACHE_LOCAL_TTL_SECONDS).
+"""
+import asyncio
+import copy
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import DateTime, event, select
+from sqlalchemy.orm import Session
+from loguru import logger
+
+from core.cache import TTLCache, get_shared_cache
+from core.config import settings
+from shared.models.user import User
+
+_COLUMNS = {attr.key: attr.columns[0] for attr in User.__mapper__.column_attrs}
+
+
+def _snapshot(user: User) -> Dict[str, Any]:
+    return {key: copy.deepcopy(getattr(user, key)) for key in _COLUMNS}
+
+
+def _to_json(row: Dict[str, Any]) -> bytes:
+    return json.dumps(
+        {key: value.isoformat() if isinstance(value, datetime) else value for key, value in row.items()}
+    ).encode("utf-8")
+
+
+def _from_json(blob: bytes) -> Dict[str, Any]:
+    row = json.loads(blob)
+    for key, column in _COLUMNS.items():
+        if isinstance(column.type, DateTime) and row.get(key):
+            row[key] = datetime.fromisoformat(row[key])
+    return row
+
+
+class UserCache:
+    """Users by id for get_current_user"""
+
+    def __init__(self):
+        ttl = settings.USER_CACHE_LOCAL_TTL_SECONDS if settings.SHARED_CACHE_URL else settings.USER_CACHE_TTL_SECONDS
+        self.local = TTLCache(settings.USER_CACHE_MAX_ENTRIES, ttl)
+
+    async def get(self, user_id: int) -> Optional[User]:
+        row = self.local.get(user_id)
+        if row is None:
+            shared = get_shared_cache()
+            if shared is None:
+                return None
+            blob = await shared.get(f"user:{user_id}")
+            if blob is None:
+                return None
+            row = _from_json(blob)
+            self.local.set(user_id, row)
+        return User(**{key: copy.deepcopy(value) for key, value in row.items()})
+
+    async def set(self, user: User):
+        row = _snapshot(user)
+        self.local.set(user.id, row)
+        shared = get_shared_cache()
+        if shared is not None:
+            await shared.set(f"user:{user.id}", _to_json(row), settings.USER_CACHE_TTL_SECONDS)
+
+    async def invalidate(self, user_id: int):
+        self.local.delete(user_id)
+        shared = get_shared_cache()
+        if shared is not None:
+            await shared.delete(f"user:{user_id}")
+
+    def info(self) -> Dict[str, Any]:
+        return self.local.info()
+
+
+user_cache = UserCache()
+_pending: set = set()
+
+
+def _invalidate_soon(user_id: int):
+    """Drop the local entry now and the shared one from a background task"""
+    user_cache.local.delete(user_id)
+    if get_shared_cache() is None:
+        return
+    try:
+        task = asyncio.get_running_loop().create_task(user_cache.invalidate(user_id))
+    except RuntimeError:
+        logger.warning(f"Could not invalidate shared cache for user {user_id}: no running loop")
+        return
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_write(mapper, connection, target: User):
+    """Drop cached copies whenever a user row is flushed"""
+    _invalidate_soon(target.id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_on_bulk_write(state):
+    """Bulk update(User)/delete(User) bypass flush events: drop the rows they match"""
+    if not (state.is_update or state.is_delete) or state.bind_mapper is not User.__mapper__:
+        return
+    query = select(User.id)
+    if state.statement.whereclause is not None:
+        query = query.where(state.statement.whereclause)
+    for user_id in state.session.execute(query).scalars():
+        _invalidate_soon(user_id)
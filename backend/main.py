@@ -3,29 +3,75 @@ AI Hub - Main Application
 Enterprise GenAI Applications
 """
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
 from loguru import logger
 import sys
 
 from core.config import settings
 from core.database import init_database, close_database
+from core.jobs import job_queue
+from core.ai.document_processor import DocumentProcessor
+from core.ai.extraction_cache import extraction_cache
+from shared.services.openai_service import openai_service
+from shared.services.retrieval_service import retrieval_service
+from shared.services.usage_service import usage_service
+from shared.services.error_service import error_log_writer
+from core.ai.providers import close_http_client
+from core.user_cache import user_cache
 from core.exceptions import setup_exception_handlers
 from core.middleware import setup_middleware
+from core.responses import JSONResponse
+from core.metrics import metrics
 
 # Import routers
 from shared.services.auth_service import router as auth_router
+from shared.services.storage_service import router as upload_router
+from shared.services.usage_service import router as usage_router
+from shared.services.profiling_service import router as profiling_router
 from projects.rfp_evaluation.routes import router as rfp_router
 from projects.report_generation.routes import router as report_router
 
-# Setup logging
+# Setup logging (enqueue: sinks are written by a background thread)
 logger.remove()
 logger.add(
     sys.stdout,
     colorize=True,
     format="<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan> - <level>{message}</level>",
-    level=settings.LOG_LEVEL
+    level=settings.LOG_LEVEL,
+    enqueue=settings.LOG_ENQUEUE
 )
-logger.add("logs/app.log", rotation="500 MB", retention="30 days", level=settings.LOG_LEVEL)
+logger.add(
+    "logs/app.log",
+    rotation="500 MB",
+    retention="30 days",
+    level=settings.LOG_LEVEL,
+    enqueue=settings.LOG_ENQUEUE
+)
+
+
+# Cache hit/miss counters, mirrored into /metrics on scrape
+CACHE_STATS = {
+    "extraction": extraction_cache.stats,
+    "ai_responses_memory": openai_service.cache.memory.stats,
+    "ai_responses_disk": openai_service.cache.disk.stats,
+    "users": user_cache.local.stats,
+    "vector_indexes": retrieval_service.store.memory.stats,
+    "vector_indexes_disk": retrieval_service.store.disk.stats,
+    "retrieval_queries": retrieval_service.query_cache.stats,
+}
+CACHE_HITS = metrics.counter("aihub_cache_hits_total", "Cache hits", ["cache"])
+CACHE_MISSES = metrics.counter("aihub_cache_misses_total", "Cache misses", ["cache"])
+metrics.add_ratio("aihub_cache_hit_ratio", "Cache hits / lookups since start", CACHE_HITS.name, CACHE_MISSES.name)
+
+
+def _collect_cache_metrics():
+    for name, stats in CACHE_STATS.items():
+        CACHE_HITS.set(stats.hits, name)
+        CACHE_MISSES.set(stats.misses, name)
+
+
+metrics.add_collector(_collect_cache_metrics)
 
 
 @asynccontextmanager
@@ -33,13 +79,24 @@ async def lifespan(app: FastAPI):
     """Application lifecycle"""
     logger.info("🚀 Starting AI Hub - Enterprise GenAI Platform")
     await init_database()
+    await job_queue.start()
+    await usage_service.writer.start()
+    await error_log_writer.start()
+    await metrics.start()
     logger.info(f"✅ Environment: {settings.ENVIRONMENT}")
     logger.info(f"📝 API Docs: http://{settings.HOST}:{settings.PORT}/docs")
     logger.info("📊 Applications: RFP Evaluation, Report Generation")
     yield
     logger.info("🛑 Shutting down AI Hub...")
+    await job_queue.stop()
+    await usage_service.writer.stop()
+    await error_log_writer.stop()
+    await metrics.stop()
+    DocumentProcessor.shutdown_executor()
+    await close_http_client()
     await close_database()
     logger.info("✅ Shutdown complete")
+    await logger.complete()
 
 
 # Create app
@@ -60,6 +117,7 @@ app = FastAPI(
     - Audit logging
     """,
     lifespan=lifespan,
+    default_response_class=JSONResponse,
     docs_url="/docs" if settings.is_development else None,
     redoc_url="/redoc" if settings.is_development else None,
 )
@@ -75,9 +133,22 @@ async def health_check():
         "status": "healthy",
         "version": settings.APP_VERSION,
         "environment": settings.ENVIRONMENT,
-        "applications": ["rfp_evaluation", "report_generation"]
+        "applications": ["rfp_evaluation", "report_generation"],
+        "caches": {
+            "extraction": extraction_cache.info(),
+            "ai_responses": openai_service.cache.info(),
+            "users": user_cache.info(),
+            "retrieval": retrieval_service.info()
+        },
+        "usage_log": usage_service.writer.info(),
+        "error_log": error_log_writer.info()
     }
 
+# Metrics (Prometheus text format)
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics_endpoint():
+    return PlainTextResponse(await metrics.render(), media_type="text/plain; version=0.0.4")
+
 # Root
 @app.get("/")
 async def root():
@@ -101,6 +172,9 @@ async def root():
 
 # Register applications
 app.include_router(auth_router, prefix="/api/v1/auth", tags=["Authentication"])
+app.include_router(upload_router, prefix="/api/v1/uploads", tags=["Uploads"])
+app.include_router(usage_router, prefix="/api/v1/usage", tags=["Usage"])
+app.include_router(profiling_router, prefix="/api/v1/profiling", tags=["Profiling"])
 app.include_router(rfp_router, prefix="/api/v1/rfp", tags=["RFP Evaluation"])
 app.include_router(report_router, prefix="/api/v1/reports", tags=["Report Generation"])
 
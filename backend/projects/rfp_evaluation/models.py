@@ -1,7 +1,7 @@
 """
 RFP Evaluation Models
 """
-from sqlalchemy import Column, String, Integer, ForeignKey, JSON, Float, Text
+from sqlalchemy import Column, String, Integer, ForeignKey, JSON, Float, Text, Index
 from sqlalchemy.orm import relationship
 from shared.models.base import BaseModel
 
@@ -9,6 +9,10 @@ from shared.models.base import BaseModel
 class RFPEvaluation(BaseModel):
     """RFP Evaluation Project"""
     __tablename__ = "rfp_evaluations"
+    __table_args__ = (
+        # Listing a user's evaluations newest first (keyset pagination on created_at, id)
+        Index("ix_rfp_evaluations_user_created", "user_id", "created_at", "id"),
+    )
     
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     document_id = Column(Integer, ForeignKey("documents.id"), nullable=False)
@@ -24,6 +28,7 @@ class RFPEvaluation(BaseModel):
     evaluation_summary = Column(Text, nullable=True)
     key_requirements = Column(JSON, default=[])
     compliance_score = Column(Float, nullable=True)  # 0-100
+    weighted_score = Column(Float, nullable=True)  # 0-10, weighted mean of criterion scores
     risk_assessment = Column(JSON, default={})
     recommendations = Column(JSON, default=[])
     
@@ -40,10 +40,64 @@ Provide:
 2. Assessment: Brief explanation of the score
 3. Evidence: Quote relevant sections from the document
 
-Format:
+Respond in JSON format:
 {{
   "score": 8.5,
   "assessment": "...",
   "evidence": "..."
 }}
 """
+
+RFP_CRITERIA_BATCH_EVALUATION = """Evaluate each of the following RFP criteria based on the document:
+
+**Criteria**:
+{criteria}
+
+**RFP Document Excerpts**:
+{relevant_text}
+
+For every criterion provide:
+1. Score (0-10): How well is this criterion addressed?
+2. Assessment: Brief explanation of the score
+3. Evidence: Quote relevant sections from the document
+
+Respond in JSON format (one entry per criterion id):
+{{
+  "results": [
+    {{"id": 1, "score": 8.5, "assessment": "...", "evidence": "..."}}
+  ]
+}}
+"""
+
+RFP_CHUNK_ANALYSIS_PROMPT = """You are an expert RFP analyst. The following is part {chunk_number} of {total_chunks} of a larger RFP document.
+Analyze ONLY this part and provide:
+
+1. **Key Requirements**: List all major requirements mentioned in this part
+2. **Compliance Assessment**: Evaluate how well standard offerings would meet these requirements (0-100 score)
+3. **Risk Assessment**: Identify potential risks (technical, financial, timeline)
+4. **Recommendations**: Provide strategic recommendations for responding to this part
+
+RFP Document (part {chunk_number} of {total_chunks}):
+{rfp_text}
+
+Provide your analysis in JSON format:
+{{
+  "key_requirements": ["requirement 1", "requirement 2", ...],
+  "compliance_score": 85,
+  "risk_assessment": {{
+    "technical_risks": ["risk 1", ...],
+    "financial_risks": ["risk 1", ...],
+    "timeline_risks": ["risk 1", ...]
+  }},
+  "recommendations": ["recommendation 1", ...],
+  "summary": "Assessment of this part..."
+}}
+"""
+
+RFP_SUMMARY_REDUCE_PROMPT = """You are an expert RFP analyst. An RFP document was analyzed in {total_chunks} parts.
+Below are the assessments of each part, in document order.
+
+{chunk_summaries}
+
+Write a single overall assessment of the whole RFP in 3-6 sentences. Respond with the assessment text only.
+"""
@@ -1,14 +1,28 @@
 """
 RFP Evaluation API Routes
 """
-from fastapi import APIRouter, Depends, UploadFile, File, Form
+from typing import List, Optional
+from fastapi import APIRouter, Depends, UploadFile, File, Form, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import get_db
+from core.config import settings
+from core.database import get_db, get_primary_read_db, get_read_db
 from core.dependencies import get_current_user
+from core.responses import dump_rows, fast_response
+from core.ai.streaming import sse_response
 from shared.schemas.base import DataResponse, PaginatedResponse, PaginationMeta
+from shared.schemas.job import JobResponse
 from shared.models.user import User
-from .schemas import RFPUploadRequest, RFPEvaluationResponse
+from .schemas import (
+    RFPUploadRequest,
+    RFPResumableUploadRequest,
+    RFPEvaluationResponse,
+    RFPEvaluationListItem,
+    RFPAnalysisJobResponse,
+    RFPBulkUploadResponse,
+    RFPCriteriaCreateRequest,
+    RFPCriterionResponse
+)
 from .services import RFPEvaluationService
 
 router = APIRouter()
@@ -35,19 +49,148 @@ async def upload_rfp(
     )
 
 
-@router.post("/{evaluation_id}/analyze", response_model=DataResponse[RFPEvaluationResponse])
+@router.post("/upload/resumable", response_model=DataResponse[RFPEvaluationResponse])
+async def upload_rfp_resumable(
+    request: RFPResumableUploadRequest,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create an evaluation from a completed resumable upload
+    For large tender packs: send the file in chunks via /api/v1/uploads first
+    """
+    evaluation = await RFPEvaluationService.create_evaluation_from_upload(request, user, db)
+    return DataResponse(
+        data=RFPEvaluationResponse.model_validate(evaluation),
+        message="RFP uploaded successfully. Use /analyze endpoint to start evaluation."
+    )
+
+
+@router.post("/upload/bulk", response_model=DataResponse[RFPBulkUploadResponse])
+async def upload_rfps_bulk(
+    files: List[UploadFile] = File(...),
+    rfp_type: str = Form(None),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Upload several RFP documents (or .zip archives of them) at once
+    Returns a per-file status; each created evaluation is titled after its file
+    """
+    result = await RFPEvaluationService.create_evaluations_bulk(
+        [(f.file, f.filename) for f in files], rfp_type, user, db
+    )
+    return DataResponse(
+        data=result,
+        message=f"{result.created} of {len(result.items)} RFPs uploaded"
+    )
+
+
+@router.post(
+    "/{evaluation_id}/analyze",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=DataResponse[RFPAnalysisJobResponse]
+)
 async def analyze_rfp(
     evaluation_id: int,
+    refresh: bool = False,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Run AI analysis on uploaded RFP
+    Queue AI analysis on uploaded RFP
+    Poll /jobs/{job_id} or the evaluation itself for the result
+    refresh=true bypasses cached model responses
     """
-    evaluation = await RFPEvaluationService.analyze_rfp(evaluation_id, user, db)
+    job = await RFPEvaluationService.queue_analysis(evaluation_id, user, db, use_cache=not refresh)
     return DataResponse(
-        data=RFPEvaluationResponse.model_validate(evaluation),
-        message="RFP analysis completed"
+        data=RFPAnalysisJobResponse(job_id=job.id, evaluation_id=evaluation_id, status=job.status),
+        message="RFP analysis queued"
+    )
+
+
+@router.get("/{evaluation_id}/analyze/stream")
+async def stream_analysis(
+    evaluation_id: int,
+    refresh: bool = False,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Run AI analysis and stream tokens as Server-Sent Events
+    Events: start, token, partial, chunk, complete | error
+    """
+    evaluation, rfp_text = await RFPEvaluationService.start_stream(evaluation_id, user, db)
+    return sse_response(
+        RFPEvaluationService.stream_analysis(
+            evaluation.id, rfp_text, use_cache=not refresh, user_id=user.id
+        )
+    )
+
+
+@router.post(
+    "/{evaluation_id}/criteria",
+    status_code=status.HTTP_201_CREATED,
+    response_model=DataResponse[List[RFPCriterionResponse]]
+)
+async def add_criteria(
+    evaluation_id: int,
+    request: RFPCriteriaCreateRequest,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Add evaluation criteria"""
+    criteria = await RFPEvaluationService.add_criteria(evaluation_id, request.criteria, user, db)
+    return DataResponse(
+        data=[RFPCriterionResponse.model_validate(c) for c in criteria],
+        message="Criteria added"
+    )
+
+
+@router.get("/{evaluation_id}/criteria", response_model=DataResponse[List[RFPCriterionResponse]])
+async def list_criteria(
+    evaluation_id: int,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """List evaluation criteria with their scores"""
+    criteria = await RFPEvaluationService.list_criteria(evaluation_id, user, db)
+    return fast_response(dump_rows(RFPCriterionResponse, criteria), message="Criteria retrieved")
+
+
+@router.post(
+    "/{evaluation_id}/criteria/score",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=DataResponse[RFPAnalysisJobResponse]
+)
+async def score_criteria(
+    evaluation_id: int,
+    refresh: bool = False,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Queue scoring of all criteria
+    Poll /jobs/{job_id}; scores appear on /{evaluation_id}/criteria
+    """
+    job = await RFPEvaluationService.queue_criteria_scoring(evaluation_id, user, db, use_cache=not refresh)
+    return DataResponse(
+        data=RFPAnalysisJobResponse(job_id=job.id, evaluation_id=evaluation_id, status=job.status),
+        message="Criteria scoring queued"
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=DataResponse[JobResponse])
+async def get_analysis_job(
+    job_id: int,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_primary_read_db)
+):
+    """Get analysis or criteria scoring job status"""
+    job = await RFPEvaluationService.get_analysis_job(job_id, user, db)
+    return DataResponse(
+        data=JobResponse.model_validate(job),
+        message="Job retrieved"
     )
 
 
@@ -55,7 +198,7 @@ async def analyze_rfp(
 async def get_evaluation(
     evaluation_id: int,
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_primary_read_db)
 ):
     """Get RFP evaluation by ID"""
     evaluation = await RFPEvaluationService.get_evaluation(evaluation_id, user, db)
@@ -65,22 +208,29 @@ async def get_evaluation(
     )
 
 
-@router.get("/", response_model=PaginatedResponse[RFPEvaluationResponse])
+@router.get("/", response_model=PaginatedResponse[RFPEvaluationListItem])
 async def list_evaluations(
-    skip: int = 0,
-    limit: int = 10,
+    cursor: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=settings.PAGINATION_MAX_PAGE_SIZE),
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """List all RFP evaluations"""
-    evaluations = await RFPEvaluationService.list_evaluations(user, db, skip, limit)
+    """
+    List RFP evaluations, newest first
+    Pass `pagination.next_cursor` as `cursor` to fetch the next page. Fetch
+    an evaluation by ID for its summary and analysis results.
+    """
+    page = await RFPEvaluationService.list_evaluations(user, db, cursor, limit)
     
-    return PaginatedResponse(
-        data=[RFPEvaluationResponse.model_validate(e) for e in evaluations],
+    return fast_response(
+        dump_rows(RFPEvaluationListItem, page.items),
+        message="Evaluations retrieved",
         pagination=PaginationMeta(
-            page=skip // limit + 1,
+            page=page.page,
             page_size=limit,
-            total=len(evaluations)
-        ),
-        message="Evaluations retrieved"
+            total=page.total,
+            total_estimated=page.total_estimated,
+            has_more=page.next_cursor is not None,
+            next_cursor=page.next_cursor
+        )
     )
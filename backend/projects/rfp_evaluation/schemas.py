@@ -0,0 +1,209 @@
+"""
+RFP Evaluation Schemas
+"""
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+import json
+
+
+class RFPUploadRequest(BaseModel):
+    rfp_title: str = Field(..., min_length=1, max_length=500)
+    rfp_type: Optional[str] = None
+
+
+class RFPResumableUploadRequest(RFPUploadRequest):
+    """Create an evaluation from a completed resumable upload (/api/v1/uploads)"""
+    upload_id: str
+
+
+class RFPEvaluationResponse(BaseModel):
+    id: int
+    document_id: int
+    rfp_title: str
+    rfp_type: Optional[str] = None
+    status: str
+
+    evaluation_summary: Optional[str] = None
+    key_requirements: Optional[List[Any]] = []
+    compliance_score: Optional[float] = None
+    weighted_score: Optional[float] = None
+    risk_assessment: Optional[Dict[str, Any]] = {}
+    recommendations: Optional[List[Any]] = []
+
+    ai_model_used: Optional[str] = None
+    processing_time_ms: Optional[int] = None
+    tokens_used: Optional[int] = 0
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class RFPEvaluationListItem(BaseModel):
+    """List projection: scalar columns only, without the summary and JSON results"""
+    id: int
+    document_id: int
+    rfp_title: str
+    rfp_type: Optional[str] = None
+    status: str
+
+    compliance_score: Optional[float] = None
+    weighted_score: Optional[float] = None
+
+    ai_model_used: Optional[str] = None
+    processing_time_ms: Optional[int] = None
+    tokens_used: Optional[int] = 0
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class RFPBulkUploadItem(BaseModel):
+    """Per-file result of a bulk upload"""
+    filename: str
+    status: str  # created, failed
+    evaluation_id: Optional[int] = None
+    document_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class RFPBulkUploadResponse(BaseModel):
+    created: int
+    failed: int
+    items: List[RFPBulkUploadItem]
+
+
+class RFPAnalysisJobResponse(BaseModel):
+    """Returned when an analysis is queued"""
+    job_id: int
+    evaluation_id: int
+    status: str
+
+
+class RFPCriterionCreate(BaseModel):
+    criterion_name: str = Field(..., min_length=1, max_length=255)
+    criterion_type: Optional[str] = None
+    description: Optional[str] = None
+    weight: float = Field(1.0, ge=0)
+
+
+class RFPCriteriaCreateRequest(BaseModel):
+    criteria: List[RFPCriterionCreate] = Field(..., min_length=1, max_length=500)
+
+
+class RFPCriterionResponse(BaseModel):
+    id: int
+    evaluation_id: int
+    criterion_name: str
+    criterion_type: Optional[str] = None
+    description: Optional[str] = None
+    weight: Optional[float] = 1.0
+    score: Optional[float] = None
+    ai_assessment: Optional[str] = None
+    supporting_text: Optional[str] = None
+    page_references: Optional[List[int]] = []
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+# Model output (validated by the structured output layer)
+
+def _to_float(value) -> Optional[float]:
+    """Numbers, numeric strings ("85", "85%", "8/10") or None"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.split("/")[0].strip().rstrip("%"))
+        except ValueError:
+            return None
+    return None
+
+
+class RFPAnalysisOutput(BaseModel):
+    """JSON returned for an RFP (or RFP part) analysis"""
+    summary: str = ""
+    key_requirements: List[Any] = []
+    compliance_score: Optional[float] = None
+    risk_assessment: Dict[str, Any] = {}
+    recommendations: List[Any] = []
+
+    @field_validator("compliance_score", mode="before")
+    @classmethod
+    def parse_score(cls, v):
+        return _to_float(v)
+
+    @field_validator("summary", mode="before")
+    @classmethod
+    def parse_summary(cls, v):
+        return "" if v is None else v if isinstance(v, str) else json.dumps(v)
+
+    @field_validator("key_requirements", "recommendations", mode="before")
+    @classmethod
+    def parse_list(cls, v):
+        return [] if v is None else v if isinstance(v, list) else [v]
+
+    @field_validator("risk_assessment", mode="before")
+    @classmethod
+    def parse_risks(cls, v):
+        # Categories hold lists of risks; models also answer "None identified"
+        if isinstance(v, list):
+            return {"risks": v}
+        if not isinstance(v, dict):
+            return {"risks": [v]} if v else {}
+        return {
+            category: items if isinstance(items, list) else [items]
+            for category, items in v.items()
+            if items is not None
+        }
+
+
+class RFPCriterionOutput(BaseModel):
+    """JSON returned for one criterion; score clamped to 0-10"""
+    score: Optional[float] = None
+    assessment: Optional[str] = None
+    evidence: Optional[str] = None
+
+    @field_validator("score", mode="before")
+    @classmethod
+    def parse_score(cls, v):
+        score = _to_float(v)
+        return None if score is None else max(0.0, min(10.0, score))
+
+    @field_validator("assessment", "evidence", mode="before")
+    @classmethod
+    def parse_text(cls, v):
+        return v if v is None or isinstance(v, str) else json.dumps(v)
+
+
+class RFPCriteriaBatchItem(RFPCriterionOutput):
+    id: Optional[int] = None
+
+    @field_validator("id", mode="before")
+    @classmethod
+    def parse_id(cls, v):
+        try:
+            return int(v)
+        except (TypeError, ValueError):
+            return None
+
+
+class RFPCriteriaBatchOutput(BaseModel):
+    """JSON returned for a pack of criteria"""
+    results: List[RFPCriteriaBatchItem] = []
+
+    @model_validator(mode="before")
+    @classmethod
+    def wrap_list(cls, v):
+        return {"results": v} if isinstance(v, list) else v
+
+    @field_validator("results", mode="before")
+    @classmethod
+    def drop_non_objects(cls, v):
+        return [item for item in v if isinstance(item, dict)] if isinstance(v, list) else []
@@ -2,20 +2,55 @@
 RFP Evaluation Services
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 from loguru import logger
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Optional
+import asyncio
 import json
 import time
 
 from shared.models.user import User
 from shared.models.document import Document
+from shared.models.job import Job
 from shared.services.openai_service import openai_service
 from shared.services.document_service import DocumentService
+from shared.services.storage_service import storage_service
+from shared.services.usage_service import usage_scope
+from shared.services.retrieval_service import RetrievedChunk, retrieval_service
 from core.ai.providers import Message
+from core.ai.document_processor import DocumentProcessor
+from core.ai.streaming import IncrementalJSONParser
+from core.ai.structured import StructuredResponse, supports_json_mode
+from core.database import AsyncSessionLocal
+from core.pagination import Cursor, Page, after_cursor, count_capped, decode_cursor, encode_cursor
+from core.profiling import span
+from core.config import settings
 from core.exceptions import NotFoundException, ValidationException
+from core.jobs import job_queue
 from .models import RFPEvaluation, RFPCriterion
-from .schemas import RFPUploadRequest, RFPEvaluationResponse
-from .prompts import RFP_ANALYSIS_PROMPT
+from .schemas import (
+    RFPUploadRequest,
+    RFPResumableUploadRequest,
+    RFPEvaluationResponse,
+    RFPCriterionCreate,
+    RFPBulkUploadItem,
+    RFPBulkUploadResponse,
+    RFPAnalysisOutput,
+    RFPCriterionOutput,
+    RFPCriteriaBatchOutput
+)
+from .prompts import (
+    RFP_ANALYSIS_PROMPT,
+    RFP_CHUNK_ANALYSIS_PROMPT,
+    RFP_CRITERIA_BATCH_EVALUATION,
+    RFP_CRITERION_EVALUATION,
+    RFP_SUMMARY_REDUCE_PROMPT
+)
+
+RFP_ANALYSIS_JOB = "rfp_analysis"
+RFP_CRITERIA_JOB = "rfp_criteria_scoring"
 
 
 class RFPEvaluationService:
@@ -36,7 +71,31 @@ class RFPEvaluationService:
         document = await DocumentService.upload_document(
             file, filename, user, "rfp_evaluation", db
         )
-        
+        return await RFPEvaluationService._create_for_document(document, request, user, db)
+    
+    @staticmethod
+    async def create_evaluation_from_upload(
+        request: RFPResumableUploadRequest,
+        user: User,
+        db: AsyncSession
+    ) -> RFPEvaluation:
+        """
+        Create an evaluation from a completed resumable upload
+        """
+        session = await storage_service.get_session(request.upload_id, user)
+        stored = await storage_service.complete_session(session, "rfp_evaluation")
+        document = await DocumentService.process_stored(
+            stored, session.filename, user, "rfp_evaluation", db
+        )
+        return await RFPEvaluationService._create_for_document(document, request, user, db)
+    
+    @staticmethod
+    async def _create_for_document(
+        document: Document,
+        request: RFPUploadRequest,
+        user: User,
+        db: AsyncSession
+    ) -> RFPEvaluation:
         # Wait for text extraction
         if document.status != "completed":
             raise ValidationException("Document processing failed")
@@ -58,89 +117,598 @@ class RFPEvaluationService:
         return evaluation
     
     @staticmethod
-    async def analyze_rfp(
-        evaluation_id: int,
+    async def create_evaluations_bulk(
+        files: list[tuple[BinaryIO, str]],
+        rfp_type: Optional[str],
         user: User,
         db: AsyncSession
-    ) -> RFPEvaluation:
+    ) -> RFPBulkUploadResponse:
         """
-        Run AI analysis on RFP
+        Upload many RFPs (or zip archives of them) at once
+        Files are stored and extracted in parallel, then all documents and
+        evaluations are written in one transaction. Titles come from file names.
         """
-        start_time = time.time()
+        results = await DocumentService.ingest_many(files, user, "rfp_evaluation", db)
         
-        # Get evaluation
-        result = await db.execute(
-            select(RFPEvaluation)
-            .where(RFPEvaluation.id == evaluation_id, RFPEvaluation.user_id == user.id)
+        evaluations = {}
+        for result in results:
+            if result.document is not None and result.document.status == "completed":
+                evaluations[id(result)] = RFPEvaluation(
+                    user_id=user.id,
+                    document_id=result.document.id,
+                    rfp_title=Path(result.filename).stem[:500] or result.filename[:500],
+                    rfp_type=rfp_type,
+                    status="pending"
+                )
+        db.add_all(evaluations.values())
+        await db.commit()
+        
+        items = []
+        for result in results:
+            evaluation = evaluations.get(id(result))
+            items.append(RFPBulkUploadItem(
+                filename=result.filename,
+                status="created" if evaluation else "failed",
+                evaluation_id=evaluation.id if evaluation else None,
+                document_id=result.document.id if result.document else None,
+                error=None if evaluation else (result.error or "Document processing failed")
+            ))
+        
+        created = sum(item.status == "created" for item in items)
+        logger.info(f"✅ RFP bulk upload: {created} evaluations created, {len(items) - created} failed")
+        
+        return RFPBulkUploadResponse(created=created, failed=len(items) - created, items=items)
+    
+    @staticmethod
+    async def queue_analysis(
+        evaluation_id: int,
+        user: User,
+        db: AsyncSession,
+        use_cache: bool = True
+    ) -> Job:
+        """
+        Queue AI analysis as a background job
+        use_cache=False forces fresh model calls instead of cached responses
+        """
+        evaluation = await RFPEvaluationService.get_evaluation(evaluation_id, user, db)
+        
+        if evaluation.status == "processing":
+            raise ValidationException("RFP analysis already in progress")
+        
+        evaluation.status = "pending"
+        job = await job_queue.enqueue(
+            RFP_ANALYSIS_JOB,
+            {"evaluation_id": evaluation.id, "user_id": user.id, "use_cache": use_cache},
+            db,
+            user_id=user.id
         )
-        evaluation = result.scalar_one_or_none()
         
-        if not evaluation:
-            raise NotFoundException("RFP Evaluation")
+        logger.info(f"RFP analysis queued: evaluation {evaluation.id}, job {job.id}")
         
-        # Get document
+        return job
+    
+    @staticmethod
+    async def get_analysis_job(
+        job_id: int,
+        user: User,
+        db: AsyncSession
+    ) -> Job:
+        """Get analysis job by ID"""
         result = await db.execute(
-            select(Document).where(Document.id == evaluation.document_id)
+            select(Job).where(
+                Job.id == job_id,
+                Job.user_id == user.id,
+                Job.job_type.in_([RFP_ANALYSIS_JOB, RFP_CRITERIA_JOB])
+            )
         )
-        document = result.scalar_one_or_none()
+        job = result.scalar_one_or_none()
         
-        if not document or not document.extracted_text:
-            raise ValidationException("Document text not available")
+        if not job:
+            raise NotFoundException("Analysis job")
+        
+        return job
+    
+    @staticmethod
+    async def analyze_rfp(
+        evaluation_id: int,
+        user: User,
+        db: AsyncSession,
+        use_cache: bool = True
+    ) -> RFPEvaluation:
+        """
+        Run AI analysis on RFP
+        """
+        start_time = time.time()
+        
+        evaluation, rfp_text = await RFPEvaluationService._load_for_analysis(evaluation_id, user, db)
         
         # Update status
         evaluation.status = "processing"
         await db.commit()
         
         try:
-            # Prepare prompt
-            prompt = RFP_ANALYSIS_PROMPT.format(rfp_text=document.extracted_text[:15000])
+            with span("chunking"):
+                chunks = await RFPEvaluationService._split(rfp_text)
             
-            # Call AI
-            messages = [Message(role="user", content=prompt)]
-            response = await openai_service.chat_completion(
-                messages=messages,
-                model="gpt-4",
-                temperature=0.3,
-                max_tokens=2000
-            )
+            # Map: analyze every chunk concurrently
+            semaphore = asyncio.Semaphore(settings.RFP_ANALYSIS_CONCURRENCY)
+            with span("analysis.map"):
+                chunk_results = await asyncio.gather(*[
+                    RFPEvaluationService._analyze_chunk(chunk, n, len(chunks), semaphore, use_cache)
+                    for n, chunk in enumerate(chunks, start=1)
+                ])
             
-            # Parse AI response
-            try:
-                analysis = json.loads(response.content)
-            except:
-                # If not JSON, create structured response
-                analysis = {
-                    "summary": response.content,
-                    "key_requirements": [],
-                    "compliance_score": None,
-                    "risk_assessment": {},
-                    "recommendations": []
-                }
+            # Reduce: merge partial analyses
+            with span("analysis.reduce"):
+                analysis, tokens_used = await RFPEvaluationService._reduce(chunk_results, chunks, use_cache)
             
             # Update evaluation
-            evaluation.evaluation_summary = analysis.get("summary", "")
-            evaluation.key_requirements = analysis.get("key_requirements", [])
-            evaluation.compliance_score = analysis.get("compliance_score")
-            evaluation.risk_assessment = analysis.get("risk_assessment", {})
-            evaluation.recommendations = analysis.get("recommendations", [])
-            evaluation.ai_model_used = response.model
-            evaluation.tokens_used = response.tokens_used
-            evaluation.processing_time_ms = int((time.time() - start_time) * 1000)
-            evaluation.status = "completed"
+            RFPEvaluationService._apply_analysis(
+                evaluation, analysis, chunk_results[0]["model"], tokens_used, start_time
+            )
             
             await db.commit()
             await db.refresh(evaluation)
             
-            logger.info(f"RFP analysis completed: {evaluation.id}")
+            logger.info(
+                f"RFP analysis completed: {evaluation.id} "
+                f"({len(chunks)} chunks, {tokens_used} tokens, "
+                f"{evaluation.processing_time_ms}ms wall / "
+                f"{sum(r['latency_ms'] for r in chunk_results)}ms model time)"
+            )
             
             return evaluation
-            
+        
         except Exception as e:
+            # Left "processing": the job is retried, or marks it failed for good (_analysis_failed)
             logger.error(f"RFP analysis failed: {e}")
-            evaluation.status = "failed"
-            await db.commit()
             raise
     
+    @staticmethod
+    async def start_stream(
+        evaluation_id: int,
+        user: User,
+        db: AsyncSession
+    ) -> tuple[RFPEvaluation, str]:
+        """
+        Validate an evaluation for streaming; returns the RFP text
+        stream_analysis moves it to "processing" once the stream starts.
+        """
+        evaluation, rfp_text = await RFPEvaluationService._load_for_analysis(evaluation_id, user, db)
+        
+        if evaluation.status == "processing":
+            raise ValidationException("RFP analysis already in progress")
+        
+        return evaluation, rfp_text
+    
+    @staticmethod
+    async def stream_analysis(
+        evaluation_id: int,
+        rfp_text: str,
+        use_cache: bool = True,
+        user_id: Optional[int] = None
+    ) -> AsyncIterator[dict]:
+        """
+        Run AI analysis, yielding SSE events as tokens arrive:
+        start, token, partial, chunk, then complete or error.
+        The final result is persisted before `complete` is sent. If the
+        consumer goes away, in-flight model calls are cancelled.
+        """
+        start_time = time.time()
+        # Claimed here rather than before the response: a client that is gone
+        # before the stream starts leaves nothing stuck in "processing"
+        if not await RFPEvaluationService._claim_for_stream(evaluation_id):
+            yield {"event": "error", "data": {"message": "RFP analysis already in progress"}}
+            return
+        final_status = "pending"  # abandoned by the client unless set below
+        chunks: list[str] = []
+        tasks: list[asyncio.Task] = []
+        producers = None
+        semaphore = asyncio.Semaphore(settings.RFP_ANALYSIS_CONCURRENCY)
+        # Bounded: a slow client slows token consumption upstream
+        events: asyncio.Queue = asyncio.Queue(maxsize=settings.RFP_STREAM_BUFFER_EVENTS)
+        
+        async def run_chunk(chunk: str, chunk_number: int) -> dict:
+            parser = IncrementalJSONParser()
+            last_partial = 0.0
+            response = None
+            messages = [Message(role="user", content=_chunk_prompt(chunk, chunk_number, len(chunks)))]
+            async with semaphore:
+                async for part in openai_service.stream_chat_completion(
+                    messages=messages,
+                    model=settings.RFP_ANALYSIS_MODEL,
+                    temperature=0.3,
+                    max_tokens=2000,
+                    use_cache=use_cache,
+                    json_mode=supports_json_mode(settings.RFP_ANALYSIS_MODEL)
+                ):
+                    if part.done:
+                        response = part.response
+                        break
+                    await events.put({"event": "token", "data": {"chunk": chunk_number, "delta": part.delta}})
+                    if parser.feed(part.delta) and time.monotonic() - last_partial >= 0.25:
+                        last_partial = time.monotonic()
+                        await events.put({
+                            "event": "partial",
+                            "data": {"chunk": chunk_number, "analysis": parser.snapshot()}
+                        })
+            
+            if response is None:
+                raise RuntimeError(f"Stream for chunk {chunk_number} ended without a result")
+            result = await openai_service.finish_structured(
+                messages, response, RFPAnalysisOutput, settings.RFP_ANALYSIS_MODEL, 0.3, 2000, use_cache
+            )
+            
+            await events.put({
+                "event": "chunk",
+                "data": {
+                    "chunk": chunk_number,
+                    "tokens_used": result.billed_tokens,
+                    "latency_ms": response.latency_ms,
+                    "time_to_first_token_ms": response.time_to_first_token_ms,
+                    "continuations": result.continuations
+                }
+            })
+            return {
+                "analysis": _analysis_result(result),
+                "model": response.model,
+                "tokens_used": result.billed_tokens,
+                "latency_ms": response.latency_ms
+            }
+        
+        try:
+            chunks = await RFPEvaluationService._split(rfp_text)
+            yield {"event": "start", "data": {"evaluation_id": evaluation_id, "chunks": len(chunks)}}
+            
+            with usage_scope(user_id, "rfp_analysis"):
+                tasks = [
+                    asyncio.create_task(run_chunk(chunk, n))
+                    for n, chunk in enumerate(chunks, start=1)
+                ]
+            producers = asyncio.gather(*tasks)
+            
+            while True:
+                next_event = asyncio.ensure_future(events.get())
+                done, _ = await asyncio.wait({next_event, producers}, return_when=asyncio.FIRST_COMPLETED)
+                if next_event in done:
+                    yield next_event.result()
+                    continue
+                next_event.cancel()
+                break
+            while not events.empty():
+                yield events.get_nowait()
+            
+            chunk_results = producers.result()
+            with usage_scope(user_id, "rfp_analysis"):
+                analysis, tokens_used = await RFPEvaluationService._reduce(chunk_results, chunks, use_cache)
+            
+            async with AsyncSessionLocal() as db:
+                evaluation = await db.get(RFPEvaluation, evaluation_id)
+                RFPEvaluationService._apply_analysis(
+                    evaluation, analysis, chunk_results[0]["model"], tokens_used, start_time
+                )
+                await db.commit()
+                await db.refresh(evaluation)
+            final_status = None
+            
+            logger.info(f"RFP streamed analysis completed: {evaluation_id} ({tokens_used} tokens)")
+            yield {
+                "event": "complete",
+                "data": RFPEvaluationResponse.model_validate(evaluation).model_dump(mode="json")
+            }
+        except Exception as e:
+            logger.error(f"RFP streamed analysis failed: {e}")
+            final_status = "failed"
+            yield {"event": "error", "data": {"message": str(e)}}
+        finally:
+            for task in tasks:
+                task.cancel()
+            if producers is not None:
+                producers.cancel()
+                producers.add_done_callback(lambda f: f.cancelled() or f.exception())
+            if final_status:
+                # Detached: the stream's own task may already be cancelled
+                _spawn(RFPEvaluationService._set_status(evaluation_id, final_status))
+    
+    @staticmethod
+    async def _claim_for_stream(evaluation_id: int) -> bool:
+        """Atomically move an evaluation to "processing"; False if it already is"""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(RFPEvaluation)
+                .where(RFPEvaluation.id == evaluation_id, RFPEvaluation.status != "processing")
+                .values(status="processing")
+            )
+            await db.commit()
+        return result.rowcount == 1
+    
+    @staticmethod
+    async def _set_status(evaluation_id: int, status: str):
+        async with AsyncSessionLocal() as db:
+            evaluation = await db.get(RFPEvaluation, evaluation_id)
+            if evaluation and evaluation.status == "processing":
+                evaluation.status = status
+                await db.commit()
+    
+    @staticmethod
+    async def _load_for_analysis(
+        evaluation_id: int,
+        user: User,
+        db: AsyncSession
+    ) -> tuple[RFPEvaluation, str]:
+        """Get evaluation and its document text, ensuring text is available"""
+        evaluation = await RFPEvaluationService.get_evaluation(evaluation_id, user, db)
+        
+        rfp_text = await DocumentService.get_text(evaluation.document_id, db)
+        # Scanned or image-only PDFs extract to page breaks and nothing else
+        if not rfp_text.strip():
+            raise ValidationException("Document text not available")
+        
+        return evaluation, rfp_text
+    
+    @staticmethod
+    async def _split(text: str) -> list[str]:
+        # Tokenizing megabytes of text is CPU work; keep it off the event loop
+        return await asyncio.to_thread(
+            DocumentProcessor.chunk_text,
+            text,
+            max_tokens=settings.RFP_ANALYSIS_CHUNK_TOKENS,
+            overlap_tokens=settings.RFP_ANALYSIS_CHUNK_OVERLAP_TOKENS,
+            model=settings.RFP_ANALYSIS_MODEL
+        )
+    
+    @staticmethod
+    async def _reduce(chunk_results: list[dict], chunks: list[str], use_cache: bool) -> tuple[dict, int]:
+        """Reduce step: merge chunk analyses and roll up token usage"""
+        analysis = _merge_analyses([r["analysis"] for r in chunk_results], [len(c) for c in chunks])
+        tokens_used = sum(r["tokens_used"] for r in chunk_results)
+        
+        if len(chunk_results) > 1:
+            summary, summary_tokens = await RFPEvaluationService._reduce_summaries(
+                [r["analysis"].get("summary", "") for r in chunk_results],
+                use_cache
+            )
+            analysis["summary"] = summary
+            tokens_used += summary_tokens
+        
+        return analysis, tokens_used
+    
+    @staticmethod
+    def _apply_analysis(
+        evaluation: RFPEvaluation,
+        analysis: dict,
+        model: str,
+        tokens_used: int,
+        start_time: float
+    ):
+        evaluation.evaluation_summary = analysis.get("summary", "")
+        evaluation.key_requirements = analysis.get("key_requirements", [])
+        evaluation.compliance_score = analysis.get("compliance_score")
+        evaluation.risk_assessment = analysis.get("risk_assessment", {})
+        evaluation.recommendations = analysis.get("recommendations", [])
+        evaluation.ai_model_used = model
+        evaluation.tokens_used = tokens_used
+        evaluation.processing_time_ms = int((time.time() - start_time) * 1000)
+        evaluation.status = "completed"
+    
+    @staticmethod
+    async def _analyze_chunk(
+        chunk: str,
+        chunk_number: int,
+        total_chunks: int,
+        semaphore: asyncio.Semaphore,
+        use_cache: bool = True
+    ) -> dict:
+        """Map step: analyze a single chunk of the RFP"""
+        prompt = _chunk_prompt(chunk, chunk_number, total_chunks)
+        
+        async with semaphore:
+            chunk_start = time.time()
+            result = await openai_service.structured_completion(
+                messages=[Message(role="user", content=prompt)],
+                schema=RFPAnalysisOutput,
+                model=settings.RFP_ANALYSIS_MODEL,
+                temperature=0.3,
+                max_tokens=2000,
+                use_cache=use_cache
+            )
+            latency_ms = int((time.time() - chunk_start) * 1000)
+        response = result.response
+        
+        logger.debug(
+            f"RFP chunk {chunk_number}/{total_chunks} analyzed "
+            f"({response.tokens_used} tokens, {result.continuations} continuations, {latency_ms}ms)"
+        )
+        
+        return {
+            "analysis": _analysis_result(result),
+            "model": response.model,
+            "tokens_used": result.billed_tokens,
+            "latency_ms": latency_ms
+        }
+    
+    @staticmethod
+    async def _reduce_summaries(summaries: list[str], use_cache: bool = True) -> tuple[str, int]:
+        """Reduce step: combine per-chunk summaries into one assessment"""
+        chunk_summaries = "\n\n".join(
+            f"Part {n}: {summary}" for n, summary in enumerate(summaries, start=1) if summary
+        )
+        response = await openai_service.chat_completion(
+            messages=[Message(role="user", content=RFP_SUMMARY_REDUCE_PROMPT.format(
+                total_chunks=len(summaries),
+                chunk_summaries=chunk_summaries
+            ))],
+            model=settings.RFP_ANALYSIS_MODEL,
+            temperature=0.3,
+            max_tokens=500,
+            use_cache=use_cache
+        )
+        return response.content.strip(), response.billed_tokens
+    
+    @staticmethod
+    async def add_criteria(
+        evaluation_id: int,
+        criteria: list[RFPCriterionCreate],
+        user: User,
+        db: AsyncSession
+    ) -> list[RFPCriterion]:
+        """Add evaluation criteria in one insert"""
+        evaluation = await RFPEvaluationService.get_evaluation(evaluation_id, user, db)
+        rows = [RFPCriterion(evaluation_id=evaluation.id, **c.model_dump()) for c in criteria]
+        db.add_all(rows)
+        await db.commit()
+        
+        logger.info(f"RFP criteria added: evaluation {evaluation.id}, {len(rows)} criteria")
+        return rows
+    
+    @staticmethod
+    async def list_criteria(
+        evaluation_id: int,
+        user: User,
+        db: AsyncSession
+    ) -> list[RFPCriterion]:
+        """List criteria of an evaluation"""
+        evaluation = await RFPEvaluationService.get_evaluation(evaluation_id, user, db)
+        result = await db.execute(
+            select(RFPCriterion)
+            .where(RFPCriterion.evaluation_id == evaluation.id)
+            .order_by(RFPCriterion.id)
+        )
+        return result.scalars().all()
+    
+    @staticmethod
+    async def queue_criteria_scoring(
+        evaluation_id: int,
+        user: User,
+        db: AsyncSession,
+        use_cache: bool = True
+    ) -> Job:
+        """Queue scoring of all criteria as a background job"""
+        evaluation = await RFPEvaluationService.get_evaluation(evaluation_id, user, db)
+        job = await job_queue.enqueue(
+            RFP_CRITERIA_JOB,
+            {"evaluation_id": evaluation.id, "user_id": user.id, "use_cache": use_cache},
+            db,
+            user_id=user.id
+        )
+        
+        logger.info(f"RFP criteria scoring queued: evaluation {evaluation.id}, job {job.id}")
+        return job
+    
+    @staticmethod
+    async def score_criteria(
+        evaluation_id: int,
+        user: User,
+        db: AsyncSession,
+        use_cache: bool = True
+    ) -> dict:
+        """
+        Score every criterion of an evaluation concurrently
+        Passages for all criteria are retrieved with one embedding request;
+        short criteria sharing context are packed into one model call.
+        Scores are written with a single bulk UPDATE and one commit, and the
+        weight-averaged score is stored on the evaluation.
+        """
+        start_time = time.time()
+        evaluation = await RFPEvaluationService.get_evaluation(evaluation_id, user, db)
+        document = await db.get(Document, evaluation.document_id)
+        
+        result = await db.execute(
+            select(RFPCriterion)
+            .where(RFPCriterion.evaluation_id == evaluation.id)
+            .order_by(RFPCriterion.id)
+        )
+        criteria = result.scalars().all()
+        if not criteria:
+            raise ValidationException("Evaluation has no criteria to score")
+        
+        passages = await retrieval_service.retrieve_many(document, [_criterion_query(c) for c in criteria])
+        packs = _pack_criteria(criteria, passages)
+        semaphore = asyncio.Semaphore(settings.RFP_CRITERIA_CONCURRENCY)
+        
+        pack_results = await asyncio.gather(*[
+            RFPEvaluationService._score_pack(
+                [criteria[i] for i in pack], [passages[i] for i in pack], semaphore, use_cache
+            )
+            for pack in packs
+        ])
+        scored = {cid: value for results, _ in pack_results for cid, value in results.items()}
+        tokens_used = sum(tokens for _, tokens in pack_results)
+        
+        now = datetime.utcnow()
+        await db.execute(
+            update(RFPCriterion),
+            [
+                {"id": c.id, "updated_at": now, **_criterion_values(scored[c.id], hits)}
+                for c, hits in zip(criteria, passages)
+            ]
+        )
+        scores = {cid: value["score"] for cid, value in scored.items()}
+        evaluation.weighted_score = _weighted_score(criteria, scores)
+        await db.commit()
+        
+        processing_time_ms = int((time.time() - start_time) * 1000)
+        logger.info(
+            f"RFP criteria scored: evaluation {evaluation.id}, {len(criteria)} criteria in "
+            f"{len(packs)} calls, weighted score {evaluation.weighted_score}, "
+            f"{tokens_used} tokens, {processing_time_ms}ms"
+        )
+        return {
+            "evaluation_id": evaluation.id,
+            "criteria": len(criteria),
+            "model_calls": len(packs),
+            "weighted_score": evaluation.weighted_score,
+            "tokens_used": tokens_used,
+            "processing_time_ms": processing_time_ms
+        }
+    
+    @staticmethod
+    async def _score_pack(
+        criteria: list[RFPCriterion],
+        passages: list[list[RetrievedChunk]],
+        semaphore: asyncio.Semaphore,
+        use_cache: bool = True
+    ) -> tuple[dict[int, dict], int]:
+        """Score one criterion, or a pack of them in a single call"""
+        if len(criteria) == 1:
+            prompt, max_tokens, schema = _criterion_prompt(criteria[0], passages[0]), 600, RFPCriterionOutput
+        else:
+            prompt, max_tokens = _criteria_batch_prompt(criteria, passages), 300 * len(criteria) + 100
+            schema = RFPCriteriaBatchOutput
+        
+        async with semaphore:
+            result = await openai_service.structured_completion(
+                messages=[Message(role="user", content=prompt)],
+                schema=schema,
+                model=settings.RFP_ANALYSIS_MODEL,
+                temperature=0.2,
+                max_tokens=max_tokens,
+                use_cache=use_cache
+            )
+        tokens_used = result.billed_tokens
+        
+        if len(criteria) == 1:
+            return {criteria[0].id: _criterion_output(result)}, tokens_used
+        
+        results = {
+            item.id: item.model_dump(exclude={"id"})
+            for item in (result.data.results if result.data else [])
+            if item.id is not None
+        }
+        missing = [i for i, c in enumerate(criteria) if c.id not in results]
+        if missing:
+            # The model skipped some criteria: score those on their own
+            logger.warning(f"Packed scoring missed {len(missing)} of {len(criteria)} criteria, retrying singly")
+            retries = await asyncio.gather(*[
+                RFPEvaluationService._score_pack([criteria[i]], [passages[i]], semaphore, use_cache)
+                for i in missing
+            ])
+            for retry_results, retry_tokens in retries:
+                results.update(retry_results)
+                tokens_used += retry_tokens
+        
+        return {c.id: results[c.id] for c in criteria}, tokens_used
+    
     @staticmethod
     async def get_evaluation(
         evaluation_id: int,
@@ -163,15 +731,282 @@ class RFPEvaluationService:
     async def list_evaluations(
         user: User,
         db: AsyncSession,
-        skip: int = 0,
+        cursor: Optional[str] = None,
         limit: int = 10
-    ) -> list[RFPEvaluation]:
-        """List all evaluations for user"""
-        result = await db.execute(
-            select(RFPEvaluation)
-            .where(RFPEvaluation.user_id == user.id)
-            .order_by(RFPEvaluation.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+    ) -> Page:
+        """
+        List evaluations for user, newest first
+        Keyset-paginated on (created_at, id) and projected to the list
+        columns, so page N costs the same as page 1.
+        """
+        position = decode_cursor(cursor) if cursor else None
+        owned = select(RFPEvaluation.id).where(RFPEvaluation.user_id == user.id)
+        
+        query = after_cursor(
+            select(*_LIST_COLUMNS).where(RFPEvaluation.user_id == user.id), RFPEvaluation, position
         )
-        return result.scalars().all()
+        rows = (await db.execute(query.limit(limit + 1))).all()
+        total, estimated = await count_capped(db, owned, settings.PAGINATION_COUNT_LIMIT)
+        
+        page = position.page if position else 1
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(Cursor(rows[-1].created_at, rows[-1].id, page + 1))
+        
+        return Page(items=rows, page=page, total=total, total_estimated=estimated, next_cursor=next_cursor)
+
+
+async def _analysis_failed(payload: dict, error: str, db: AsyncSession):
+    """Analysis job out of attempts (or rejected): the evaluation is failed"""
+    evaluation = await db.get(RFPEvaluation, payload["evaluation_id"])
+    if evaluation and evaluation.status in ("pending", "processing"):
+        evaluation.status = "failed"
+        await db.commit()
+
+
+@job_queue.handler(RFP_ANALYSIS_JOB, on_failure=_analysis_failed)
+async def run_analysis_job(payload: dict, db: AsyncSession) -> dict:
+    """Background worker entry point for RFP analysis"""
+    user = await db.get(User, payload["user_id"])
+    if not user:
+        raise NotFoundException("User")
+    
+    with usage_scope(user.id, "rfp_analysis"):
+        evaluation = await RFPEvaluationService.analyze_rfp(
+            payload["evaluation_id"], user, db, use_cache=payload.get("use_cache", True)
+        )
+    
+    return {
+        "evaluation_id": evaluation.id,
+        "status": evaluation.status,
+        "tokens_used": evaluation.tokens_used,
+        "processing_time_ms": evaluation.processing_time_ms
+    }
+
+
+@job_queue.handler(RFP_CRITERIA_JOB)
+async def run_criteria_job(payload: dict, db: AsyncSession) -> dict:
+    """Background worker entry point for criterion scoring"""
+    user = await db.get(User, payload["user_id"])
+    if not user:
+        raise NotFoundException("User")
+    
+    with usage_scope(user.id, "rfp_criteria"):
+        return await RFPEvaluationService.score_criteria(
+            payload["evaluation_id"], user, db, use_cache=payload.get("use_cache", True)
+        )
+
+
+# Columns served by list_evaluations (RFPEvaluationListItem)
+_LIST_COLUMNS = [
+    RFPEvaluation.id,
+    RFPEvaluation.document_id,
+    RFPEvaluation.rfp_title,
+    RFPEvaluation.rfp_type,
+    RFPEvaluation.status,
+    RFPEvaluation.compliance_score,
+    RFPEvaluation.weighted_score,
+    RFPEvaluation.ai_model_used,
+    RFPEvaluation.processing_time_ms,
+    RFPEvaluation.tokens_used,
+    RFPEvaluation.created_at,
+    RFPEvaluation.updated_at,
+]
+
+_background_tasks: set = set()
+
+
+def _spawn(coro):
+    """Run a coroutine detached from the current task, keeping a reference"""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _chunk_prompt(chunk: str, chunk_number: int, total_chunks: int) -> str:
+    """Whole-document prompt for a single chunk, per-part prompt otherwise"""
+    if total_chunks == 1:
+        return RFP_ANALYSIS_PROMPT.format(rfp_text=chunk)
+    return RFP_CHUNK_ANALYSIS_PROMPT.format(
+        rfp_text=chunk,
+        chunk_number=chunk_number,
+        total_chunks=total_chunks
+    )
+
+
+def _analysis_result(result: StructuredResponse) -> dict:
+    """Analysis dict from structured output; raw text as summary if unusable"""
+    if result.data is not None:
+        return result.data.model_dump()
+    return RFPAnalysisOutput(summary=result.response.content).model_dump()
+
+
+def _criterion_query(criterion: RFPCriterion) -> str:
+    """Retrieval query for a criterion"""
+    return "\n".join(
+        part for part in (criterion.criterion_name, criterion.criterion_type, criterion.description) if part
+    )
+
+
+def _format_passages(passages: list[RetrievedChunk]) -> str:
+    """Retrieved chunks in document order, labelled with their pages"""
+    ordered = sorted(passages, key=lambda p: (p.start_page or 0, p.text))
+    blocks = []
+    for passage in ordered:
+        if passage.start_page is None:
+            label = "[Excerpt]"
+        elif passage.end_page and passage.end_page != passage.start_page:
+            label = f"[Pages {passage.start_page}-{passage.end_page}]"
+        else:
+            label = f"[Page {passage.start_page}]"
+        blocks.append(f"{label}\n{passage.text}")
+    return "\n\n---\n\n".join(blocks)
+
+
+def _criterion_prompt(criterion: RFPCriterion, passages: list[RetrievedChunk]) -> str:
+    return RFP_CRITERION_EVALUATION.format(
+        criterion_name=criterion.criterion_name,
+        criterion_type=criterion.criterion_type or "general",
+        criterion_description=criterion.description or "",
+        relevant_text=_format_passages(passages) or "(no relevant passages found)"
+    )
+
+
+def _criterion_output(result: StructuredResponse) -> dict:
+    """Criterion result from structured output; raw text as assessment if unusable"""
+    if result.data is not None:
+        return result.data.model_dump()
+    return {"score": None, "assessment": result.response.content, "evidence": None}
+
+
+def _criterion_values(result: dict, passages: list[RetrievedChunk]) -> dict:
+    """Column values for a scored criterion"""
+    return {
+        "score": result["score"],
+        "ai_assessment": result["assessment"],
+        "supporting_text": result["evidence"] or (passages[0].text if passages else None),
+        "page_references": sorted({page for passage in passages for page in passage.pages}),
+    }
+
+
+def _pack_criteria(criteria: list[RFPCriterion], passages: list[list[RetrievedChunk]]) -> list[list[int]]:
+    """
+    Group criteria (by index) into model calls
+    Short criteria whose retrieved passages mostly coincide share a call,
+    as long as the union of their passages fits the pack token budget.
+    """
+    packs: list[dict] = []
+    for i, (criterion, hits) in enumerate(zip(criteria, passages)):
+        positions = {p.position for p in hits}
+        tokens = {p.position: p.tokens for p in hits}
+        small = len(_criterion_query(criterion)) // 4 <= settings.RFP_CRITERIA_SMALL_TOKENS
+        
+        target = None
+        if small and positions:
+            for pack in packs:
+                if not pack["small"] or len(pack["members"]) >= settings.RFP_CRITERIA_PACK_SIZE:
+                    continue
+                shared = len(positions & pack["positions"]) / len(positions)
+                added = sum(t for p, t in tokens.items() if p not in pack["positions"])
+                if (
+                    shared >= settings.RFP_CRITERIA_PACK_MIN_OVERLAP
+                    and pack["tokens"] + added <= settings.RFP_CRITERIA_PACK_MAX_TOKENS
+                ):
+                    target = pack
+                    break
+        
+        if target is None:
+            target = {"members": [], "positions": set(), "tokens": 0, "small": small}
+            packs.append(target)
+        target["members"].append(i)
+        target["tokens"] += sum(t for p, t in tokens.items() if p not in target["positions"])
+        target["positions"] |= positions
+    
+    return [pack["members"] for pack in packs]
+
+
+def _criteria_batch_prompt(criteria: list[RFPCriterion], passages: list[list[RetrievedChunk]]) -> str:
+    unique = {p.position: p for hits in passages for p in hits}
+    listing = "\n".join(
+        f"- [id {c.id}] **{c.criterion_name}** ({c.criterion_type or 'general'})"
+        + (f": {c.description}" if c.description else "")
+        for c in criteria
+    )
+    return RFP_CRITERIA_BATCH_EVALUATION.format(
+        criteria=listing,
+        relevant_text=_format_passages(list(unique.values())) or "(no relevant passages found)"
+    )
+
+
+def _weighted_score(criteria: list[RFPCriterion], scores: dict[int, float]) -> Optional[float]:
+    """Weighted mean (0-10) over scored criteria"""
+    weighted = [
+        (scores[c.id], c.weight if c.weight is not None else 1.0)
+        for c in criteria
+        if scores.get(c.id) is not None
+    ]
+    total_weight = sum(w for _, w in weighted)
+    if not total_weight:
+        return None
+    return round(sum(score * w for score, w in weighted) / total_weight, 2)
+
+
+def _dedupe_key(item) -> str:
+    """Normalize an item for de-duplication across chunks"""
+    if not isinstance(item, str):
+        item = json.dumps(item, sort_keys=True)
+    return " ".join(item.lower().split()).strip(" .;:-")
+
+
+def _merge_unique(lists) -> list:
+    """Concatenate lists preserving first-seen order, dropping duplicates (a non-list counts as one item)"""
+    seen = set()
+    merged = []
+    for items in lists:
+        if not isinstance(items, list):
+            items = [] if items is None else [items]
+        for item in items:
+            key = _dedupe_key(item)
+            if key and key not in seen:
+                seen.add(key)
+                merged.append(item)
+    return merged
+
+
+def _merge_analyses(analyses: list[dict], weights: list[int]) -> dict:
+    """
+    Merge per-chunk analyses into a single result
+    Lists are de-duplicated; compliance score is a length-weighted average
+    """
+    if len(analyses) == 1:
+        return analyses[0]
+    
+    risk_categories = []
+    for analysis in analyses:
+        for category in (analysis.get("risk_assessment") or {}):
+            if category not in risk_categories:
+                risk_categories.append(category)
+    
+    scored = [
+        (float(a["compliance_score"]), w)
+        for a, w in zip(analyses, weights)
+        if isinstance(a.get("compliance_score"), (int, float))
+    ]
+    compliance_score = (
+        round(sum(score * w for score, w in scored) / sum(w for _, w in scored), 1)
+        if scored else None
+    )
+    
+    return {
+        "key_requirements": _merge_unique(a.get("key_requirements") for a in analyses),
+        "compliance_score": compliance_score,
+        "risk_assessment": {
+            category: _merge_unique(
+                (a.get("risk_assessment") or {}).get(category) for a in analyses
+            )
+            for category in risk_categories
+        },
+        "recommendations": _merge_unique(a.get("recommendations") for a in analyses),
+        "summary": "\n\n".join(a.get("summary", "") for a in analyses if a.get("summary"))
+    }
@@ -0,0 +1,116 @@
+"""
+One-off: move legacy documents.extracted_text into document_pages
+
+Extracted text used to live in documents.extracted_text, with page_starts
+holding the offset of each PDF page. create_all creates document_pages but
+does not alter existing tables, so documents extracted before the move have
+no pages and no text_length: analysis rejects them with "Document text not
+available" and the extraction cache skips them.
+
+This adds documents.text_length if it is missing, then stores each legacy
+text as compressed pages exactly like a new extraction. Only documents
+without text_length are touched, and each batch commits on its own, so an
+interrupted run can simply be restarted. The legacy columns are left in
+place; drop them once the backfill is done. Run from backend/ with the
+application's DATABASE_URL:
+
+    python -m scripts.backfill_document_pages --batch-size 200
+"""
+import argparse
+import asyncio
+
+from loguru import logger
+from sqlalchemy import JSON, Integer, Text, column, inspect, select, table, text, update
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from core.database import close_database, engine
+from shared.models.document import DocumentPage
+from shared.services.document_service import DocumentService
+
+# The model no longer maps the legacy columns
+legacy_documents = table(
+    "documents",
+    column("id", Integer),
+    column("extracted_text", Text),
+    column("page_starts", JSON),
+    column("text_length", Integer),
+)
+
+
+async def _columns(db_engine: AsyncEngine) -> set:
+    """Columns of the documents table (none if it does not exist yet)"""
+    def read(sync_conn) -> set:
+        inspector = inspect(sync_conn)
+        if not inspector.has_table("documents"):
+            return set()
+        return {c["name"] for c in inspector.get_columns("documents")}
+
+    async with db_engine.connect() as conn:
+        return await conn.run_sync(read)
+
+
+async def backfill(db_engine: AsyncEngine, batch_size: int = 200) -> int:
+    """Backfill every legacy document; returns how many were moved"""
+    columns = await _columns(db_engine)
+    if "extracted_text" not in columns:
+        logger.info("documents has no extracted_text column: nothing to backfill")
+        return 0
+    async with db_engine.begin() as conn:
+        await conn.run_sync(DocumentPage.__table__.create, checkfirst=True)
+    if "text_length" not in columns:
+        async with db_engine.begin() as conn:
+            await conn.execute(text("ALTER TABLE documents ADD COLUMN text_length INTEGER"))
+        logger.info("Added documents.text_length")
+
+    session_factory = async_sessionmaker(db_engine, expire_on_commit=False)
+    docs = legacy_documents.c
+    moved = last_id = 0
+    while True:
+        async with session_factory() as db:
+            rows = (await db.execute(
+                select(docs.id, docs.extracted_text, docs.page_starts)
+                .where(docs.id > last_id, docs.extracted_text.is_not(None), docs.text_length.is_(None))
+                .order_by(docs.id)
+                .limit(batch_size)
+            )).all()
+            if not rows:
+                break
+            compressed = await asyncio.to_thread(lambda: [
+                DocumentService._compress_pages({"text": row.extracted_text, "page_starts": row.page_starts})
+                for row in rows
+            ])
+            for row, pages in zip(rows, compressed):
+                db.add_all([
+                    DocumentPage(
+                        document_id=row.id,
+                        position=position,
+                        page_number=page.page_number,
+                        char_count=page.char_count,
+                        compressed_text=page.data
+                    )
+                    for position, page in enumerate(pages)
+                ])
+                await db.execute(
+                    update(legacy_documents).where(docs.id == row.id).values(text_length=len(row.extracted_text))
+                )
+            await db.commit()
+        moved += len(rows)
+        last_id = rows[-1].id
+        logger.info(f"Backfilled {moved} documents (up to id {last_id})")
+    return moved
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    try:
+        moved = await backfill(engine, args.batch_size)
+    finally:
+        await close_database()
+    logger.info(f"Done: {moved} documents moved to document_pages")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,5 +1,7 @@
 from shared.models.base import Base
 from shared.models.user import User
 from shared.models.error_log import ErrorLog
+from shared.models.job import Job
+from shared.models.ai_request_log import AIRequestLog
 
-__all__ = ["Base", "User", "ErrorLog"]
+__all__ = ["Base", "User", "ErrorLog", "Job", "AIRequestLog"]
@@ -0,0 +1,30 @@
+"""AI Request Log Model"""
+from sqlalchemy import Column, String, Integer, Float, Boolean, ForeignKey, Index
+from shared.models.base import BaseModel
+
+
+class AIRequestLog(BaseModel):
+    """One model call (chat, stream or embedding), including cache hits"""
+    __tablename__ = "ai_request_logs"
+    __table_args__ = (
+        # Usage reports: per user over a time range, and all users over a range
+        Index("ix_ai_request_logs_user_created", "user_id", "created_at"),
+        Index("ix_ai_request_logs_created", "created_at"),
+    )
+
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    feature = Column(String(100), nullable=True)  # rfp_analysis, rfp_criteria, retrieval, ...
+    request_type = Column(String(20), nullable=False)  # chat, stream, embedding
+
+    provider = Column(String(50), nullable=True)
+    model = Column(String(100), nullable=False)
+    prompt_tokens = Column(Integer, default=0, nullable=False)
+    completion_tokens = Column(Integer, default=0, nullable=False)
+    total_tokens = Column(Integer, default=0, nullable=False)
+    latency_ms = Column(Integer, default=0, nullable=False)
+    time_to_first_token_ms = Column(Integer, nullable=True)
+    cache_hit = Column(Boolean, default=False, nullable=False)
+    cost_usd = Column(Float, default=0.0, nullable=False)
+
+    status = Column(String(20), default="success", nullable=False)  # success, error
+    error = Column(String(500), nullable=True)
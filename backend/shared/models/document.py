@@ -2,7 +2,10 @@
 Document Models
 Store uploaded documents and their metadata
 """
-from sqlalchemy import Column, String, Integer, JSON, ForeignKey, Text
+import zlib
+
+from sqlalchemy import Column, String, Integer, JSON, ForeignKey, LargeBinary, Index
+from sqlalchemy.orm import relationship
 from shared.models.base import BaseModel
 
 
@@ -18,15 +21,44 @@ class Document(BaseModel):
     file_path = Column(String(500), nullable=False)
     file_size = Column(Integer, nullable=False)  # bytes
     file_type = Column(String(50), nullable=False)  # pdf, docx, txt
+    content_hash = Column(String(64), index=True, nullable=True)  # SHA-256 of file bytes
     
     # Processing
     status = Column(String(50), default="uploaded")  # uploaded, processing, completed, failed
-    extracted_text = Column(Text, nullable=True)
+    text_length = Column(Integer, nullable=True)  # characters of extracted text
     
     # Metadata
     num_pages = Column(Integer, nullable=True)
-    metadata = Column(JSON, default={})
+    # 'metadata' is reserved on declarative models; keep the column name
+    doc_metadata = Column("metadata", JSON, default={})
     
     # Project context
     project_type = Column(String(50), nullable=True)  # rfp_evaluation, report_generation
     project_id = Column(Integer, nullable=True)  # Link to specific project record
+    
+    # Extracted text lives in document_pages so that loading a Document never
+    # pulls it; read it through DocumentService.get_pages / get_text
+    pages = relationship(
+        "DocumentPage",
+        lazy="raise",
+        cascade="all, delete-orphan",
+        order_by="DocumentPage.position"
+    )
+
+
+class DocumentPage(BaseModel):
+    """Extracted text of one page, zlib-compressed at rest"""
+    __tablename__ = "document_pages"
+    __table_args__ = (
+        Index("ix_document_pages_document_position", "document_id", "position", unique=True),
+    )
+    
+    document_id = Column(Integer, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False)
+    position = Column(Integer, nullable=False)  # order within the document, from 0
+    page_number = Column(Integer, nullable=True)  # PDF page; None for formats without pages
+    char_count = Column(Integer, nullable=False, default=0)
+    compressed_text = Column(LargeBinary, nullable=False)
+    
+    @property
+    def text(self) -> str:
+        return zlib.decompress(self.compressed_text).decode("utf-8")
@@ -13,3 +13,7 @@ class ErrorLog(BaseModel):
     path = Column(String(500))
     user_id = Column(Integer, nullable=True)
     stack_trace = Column(Text)
+    # Identical errors folded into this row. create_all does not add columns to
+    # an existing table; existing databases need a one-off:
+    #   ALTER TABLE error_logs ADD COLUMN occurrences INTEGER NOT NULL DEFAULT 1
+    occurrences = Column(Integer, default=1, server_default="1", nullable=False)
@@ -0,0 +1,30 @@
+"""
+Background Job Model
+Persisted queue entries for long-running work (AI analysis, etc.)
+"""
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, ForeignKey, JSON, Text, DateTime
+from shared.models.base import BaseModel
+
+
+class Job(BaseModel):
+    """Queued unit of background work"""
+    __tablename__ = "jobs"
+
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+
+    # Job details
+    job_type = Column(String(100), nullable=False, index=True)  # rfp_analysis, ...
+    payload = Column(JSON, default={})
+
+    # Execution
+    status = Column(String(50), default="queued", index=True)  # queued, running, completed, failed
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    run_after = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    # Outcome
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
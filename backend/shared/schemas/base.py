@@ -34,6 +34,9 @@ class PaginationMeta(BaseModel):
     page: int = 1
     page_size: int = 10
     total: int = 0
+    total_estimated: bool = False  # total is a lower bound (count stopped at the limit)
+    has_more: bool = False
+    next_cursor: Optional[str] = None  # pass as `cursor` to fetch the next page
 
 
 class PaginatedResponse(BaseResponse, Generic[T]):
@@ -0,0 +1,22 @@
+"""Background Job Schemas"""
+from pydantic import BaseModel
+from typing import Any, Dict, Optional
+from datetime import datetime
+
+
+class JobResponse(BaseModel):
+    id: int
+    job_type: str
+    status: str
+    payload: Optional[Dict[str, Any]] = {}
+    attempts: int
+    max_attempts: int
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    run_after: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
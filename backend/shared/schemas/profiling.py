@@ -0,0 +1,12 @@
+"""Profiling Schemas"""
+from pydantic import BaseModel, Field
+
+
+class ProfilingArmRequest(BaseModel):
+    count: int = Field(1, ge=0, le=100)  # 0 disarms
+    path_prefix: str = "/api/v1/"
+
+
+class ProfilingStatus(BaseModel):
+    armed: int
+    path_prefix: str
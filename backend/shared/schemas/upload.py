@@ -0,0 +1,21 @@
+"""Resumable Upload Schemas"""
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+
+class UploadCreateRequest(BaseModel):
+    filename: str = Field(..., min_length=1, max_length=255)
+    total_size: int = Field(..., gt=0)
+
+
+class UploadSessionResponse(BaseModel):
+    upload_id: str
+    filename: str
+    total_size: int
+    received: int
+    complete: bool
+    chunk_size: int  # suggested size of each PUT
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
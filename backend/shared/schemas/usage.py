@@ -0,0 +1,26 @@
+"""AI Usage Schemas"""
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+
+class UsageRow(BaseModel):
+    """Aggregated usage for one group (model, or user and model)"""
+    user_id: Optional[int] = None
+    model: Optional[str] = None
+    requests: int = 0
+    cache_hits: int = 0
+    errors: int = 0
+    prompt_tokens: int = 0  # billed calls only; cache hits are counted in tokens_saved
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    tokens_saved: int = 0
+    cost_usd: float = 0.0
+    avg_latency_ms: Optional[float] = None
+
+
+class UsageReport(BaseModel):
+    since: datetime
+    until: datetime
+    rows: List[UsageRow]
+    totals: UsageRow
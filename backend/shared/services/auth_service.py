@@ -7,11 +7,12 @@ from fastapi import APIRouter, Depends
 from shared.models.user import User
 from shared.schemas.user import UserCreate, UserLogin, TokenResponse, UserResponse
 from shared.schemas.base import DataResponse
-from core.security import hash_password, verify_password, create_access_token, create_refresh_token
+from core.security import hash_password, verify_and_update_password, create_access_token, create_refresh_token
 from core.exceptions import UnauthorizedException, ValidationException
 from core.config import settings
 from core.database import get_db
 from core.dependencies import get_current_user
+from core.user_cache import user_cache
 
 
 class AuthService:
@@ -27,7 +28,7 @@ class AuthService:
         user = User(
             email=user_data.email,
             full_name=user_data.full_name,
-            hashed_password=hash_password(user_data.password),
+            hashed_password=await hash_password(user_data.password),
             roles=["user"]
         )
         db.add(user)
@@ -43,9 +44,20 @@ class AuthService:
         result = await db.execute(select(User).where(User.email == credentials.email))
         user = result.scalar_one_or_none()
         
-        if not user or not verify_password(credentials.password, user.hashed_password):
+        if not user or not user.hashed_password:
             raise UnauthorizedException("Invalid credentials")
         
+        valid, new_hash = await verify_and_update_password(credentials.password, user.hashed_password)
+        if not valid:
+            raise UnauthorizedException("Invalid credentials")
+        
+        # Transparently upgrade hashes made with outdated settings
+        if new_hash:
+            user.hashed_password = new_hash
+            await db.commit()
+            await user_cache.invalidate(user.id)
+            logger.info(f"Password hash upgraded: {user.email}")
+        
         # Create tokens
         token_data = {"sub": str(user.id), "email": user.email, "roles": user.roles}
         access_token = create_access_token(token_data)
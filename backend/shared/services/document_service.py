@@ -0,0 +1,324 @@
+"""
+Document Service
+Store uploads and extract their text
+"""
+import asyncio
+import zipfile
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from loguru import logger
+
+from shared.models.document import Document, DocumentPage
+from shared.models.user import User
+from shared.services.storage_service import StoredFile, storage_service
+from core.ai.document_processor import DocumentProcessor
+from core.ai.extraction_cache import extraction_cache
+from core.config import settings
+from core.exceptions import ValidationException
+from core.profiling import span
+
+
+@dataclass
+class IngestResult:
+    """Outcome of one file in a bulk upload"""
+    filename: str
+    document: Optional[Document] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class _CompressedPage:
+    page_number: Optional[int]
+    char_count: int
+    data: bytes
+
+
+@dataclass
+class _Upload:
+    file: BinaryIO
+    filename: str
+    lock: Optional[asyncio.Lock] = None  # entries of one archive share a file handle
+
+
+class DocumentService:
+    """Document upload and processing"""
+    
+    @staticmethod
+    def _validate_extension(filename: str) -> str:
+        extension = Path(filename).suffix.lower()
+        if extension not in settings.ALLOWED_UPLOAD_EXTENSIONS:
+            raise ValidationException(f"Unsupported file format: {extension}")
+        return extension
+    
+    @staticmethod
+    def _new_document(stored: StoredFile, filename: str, user: User, project_type: str) -> Document:
+        return Document(
+            user_id=user.id,
+            filename=stored.filename,
+            original_filename=filename,
+            file_path=str(stored.path),
+            file_size=stored.size,
+            file_type=Path(filename).suffix.lower().lstrip("."),
+            content_hash=stored.sha256,
+            status="processing",
+            project_type=project_type
+        )
+    
+    @staticmethod
+    def _compress_page(page_number: Optional[int], text: str) -> _CompressedPage:
+        return _CompressedPage(page_number, len(text), zlib.compress(text.encode("utf-8")))
+    
+    @staticmethod
+    def _compress_pages(extraction: dict) -> List[_CompressedPage]:
+        """Split extracted text into pages and compress each (CPU work, run in a thread)"""
+        pages = DocumentProcessor.split_pages(extraction.get("text", ""), extraction.get("page_starts"), strip=False)
+        return [DocumentService._compress_page(page["page"], page["text"]) for page in pages]
+    
+    @staticmethod
+    async def _extract(path: Path) -> Tuple[dict, List[_CompressedPage]]:
+        """
+        Extract a stored file into compressed pages
+        PDFs are compressed page by page as the pool parses them, so their
+        full text is never in memory; the pages come out exactly as
+        _compress_pages would cut extract_text's output. Other formats are
+        extracted whole and also returned for the extraction cache.
+        """
+        if path.suffix.lower() != ".pdf":
+            extraction = await DocumentProcessor.extract_text(path)
+            return extraction, await asyncio.to_thread(DocumentService._compress_pages, extraction)
+        
+        pages: List[_CompressedPage] = []
+        previous: Optional[Dict[str, Any]] = None
+        
+        async def consume(page: Dict[str, Any]):
+            # A page's slice runs up to the next page: "\n\n" joins it to the next one
+            nonlocal previous
+            if previous is not None:
+                pages.append(await asyncio.to_thread(
+                    DocumentService._compress_page, previous["page"], previous["text"] + "\n\n"
+                ))
+            previous = page
+        
+        extraction = await DocumentProcessor.stream_pdf(path, consume)
+        if previous is not None:
+            pages.append(await asyncio.to_thread(DocumentService._compress_page, previous["page"], previous["text"]))
+        return extraction, pages
+    
+    @staticmethod
+    async def _cache_extraction(content_hash: str, extraction: dict):
+        """Keep a whole extraction on the cache's disk tier; streamed PDFs are served by their pages in the DB tier"""
+        if "text" in extraction:
+            await extraction_cache.store(content_hash, extraction)
+    
+    @staticmethod
+    def _apply_extraction(document: Document, extraction: dict, pages: List[_CompressedPage]):
+        document.pages = [
+            DocumentPage(position=position, page_number=page.page_number, char_count=page.char_count, compressed_text=page.data)
+            for position, page in enumerate(pages)
+        ]
+        document.text_length = sum(page.char_count for page in pages)
+        document.num_pages = extraction.get("num_pages")
+        document.doc_metadata = extraction.get("metadata") or {}
+        document.status = "completed"
+    
+    @staticmethod
+    async def _load_pages(
+        document_id: int,
+        db: AsyncSession,
+        page_numbers: Optional[List[int]] = None
+    ) -> List[Dict[str, Any]]:
+        query = select(DocumentPage.page_number, DocumentPage.compressed_text).where(
+            DocumentPage.document_id == document_id
+        )
+        if page_numbers is not None:
+            query = query.where(DocumentPage.page_number.in_(page_numbers))
+        rows = (await db.execute(query.order_by(DocumentPage.position))).all()
+        
+        def decompress() -> List[Dict[str, Any]]:
+            return [{"page": row.page_number, "text": zlib.decompress(row.compressed_text).decode("utf-8")} for row in rows]
+        
+        return await asyncio.to_thread(decompress)
+    
+    @staticmethod
+    async def get_pages(
+        document_id: int,
+        db: AsyncSession,
+        page_numbers: Optional[List[int]] = None
+    ) -> List[Dict[str, Any]]:
+        """Extracted text as [{page, text}] like DocumentProcessor.split_pages, optionally only some pages"""
+        pages = await DocumentService._load_pages(document_id, db, page_numbers)
+        for page in pages:
+            if page["page"] is not None:
+                page["text"] = page["text"].strip()
+        return pages
+    
+    @staticmethod
+    async def get_text(document_id: int, db: AsyncSession) -> str:
+        """Full extracted text ("" if none was stored)"""
+        pages = await DocumentService._load_pages(document_id, db)
+        return DocumentProcessor.join_pages(pages)[0] if pages else ""
+    
+    @staticmethod
+    async def upload_document(
+        file: BinaryIO,
+        filename: str,
+        user: User,
+        project_type: str,
+        db: AsyncSession
+    ) -> Document:
+        """
+        Store an upload and extract its text
+        Byte-identical re-uploads reuse the cached extraction.
+        """
+        DocumentService._validate_extension(filename)
+        with span("storage"):
+            stored = await storage_service.save_upload(file, filename, project_type)
+        return await DocumentService.process_stored(stored, filename, user, project_type, db)
+    
+    @staticmethod
+    async def process_stored(
+        stored: StoredFile,
+        filename: str,
+        user: User,
+        project_type: str,
+        db: AsyncSession
+    ) -> Document:
+        """Extract text from an already stored file and save its Document"""
+        document = DocumentService._new_document(stored, filename, user, project_type)
+        
+        try:
+            extraction = await extraction_cache.lookup(stored.sha256, db)
+            if extraction is not None:
+                logger.info(f"♻️ Extraction cache hit: {filename} ({stored.sha256[:12]})")
+                pages = await asyncio.to_thread(DocumentService._compress_pages, extraction)
+            else:
+                extraction, pages = await DocumentService._extract(stored.path)
+                await DocumentService._cache_extraction(stored.sha256, extraction)
+            
+            DocumentService._apply_extraction(document, extraction, pages)
+        except Exception as e:
+            logger.error(f"Document processing failed for {filename}: {e}")
+            document.status = "failed"
+        
+        db.add(document)
+        await db.commit()
+        await db.refresh(document)
+        
+        logger.info(f"✅ Document uploaded: {document.id} ({document.status})")
+        return document
+    
+    @staticmethod
+    def _expand_archives(uploads: List[Tuple[BinaryIO, str]]) -> Tuple[List[_Upload], List[IngestResult]]:
+        """Replace .zip uploads with their entries; reject oversized batches"""
+        expanded: List[_Upload] = []
+        rejected: List[IngestResult] = []
+        
+        for file, filename in uploads:
+            if Path(filename).suffix.lower() != ".zip":
+                expanded.append(_Upload(file, filename))
+                continue
+            try:
+                archive = zipfile.ZipFile(file)
+                entries = [
+                    info for info in archive.infolist()
+                    if not info.is_dir()
+                    and not info.filename.startswith("__MACOSX/")
+                    and not Path(info.filename).name.startswith(".")
+                ]
+                declared = sum(info.file_size for info in entries)
+                if declared > settings.BULK_UPLOAD_MAX_ARCHIVE_BYTES:
+                    raise ValidationException(f"Archive expands to {declared} bytes")
+            except (zipfile.BadZipFile, ValidationException) as e:
+                rejected.append(IngestResult(filename=filename, error=str(e)))
+                continue
+            
+            lock = asyncio.Lock()
+            for info in entries:
+                expanded.append(_Upload(archive.open(info), f"{filename}/{info.filename}", lock))
+        
+        if len(expanded) > settings.BULK_UPLOAD_MAX_FILES:
+            raise ValidationException(
+                f"Too many files: {len(expanded)} (limit {settings.BULK_UPLOAD_MAX_FILES})"
+            )
+        return expanded, rejected
+    
+    @staticmethod
+    async def ingest_many(
+        uploads: List[Tuple[BinaryIO, str]],
+        user: User,
+        project_type: str,
+        db: AsyncSession
+    ) -> List[IngestResult]:
+        """
+        Store and extract many uploads (zip archives are expanded)
+        Files are streamed to storage and extracted in parallel; identical
+        files are extracted once. Documents are added to the session but
+        not committed, so callers can create dependent rows in the same
+        transaction.
+        """
+        files, results = DocumentService._expand_archives(uploads)
+        semaphore = asyncio.Semaphore(settings.BULK_UPLOAD_CONCURRENCY)
+        
+        async def store(upload: _Upload) -> StoredFile:
+            DocumentService._validate_extension(upload.filename)
+            async with semaphore:
+                if upload.lock is None:
+                    return await storage_service.save_upload(upload.file, upload.filename, project_type)
+                async with upload.lock:
+                    return await storage_service.save_upload(upload.file, upload.filename, project_type)
+        
+        stored = await asyncio.gather(*[store(f) for f in files], return_exceptions=True)
+        hashes = [s.sha256 for s in stored if isinstance(s, StoredFile)]
+        extractions: Dict[str, object] = await extraction_cache.lookup_many(hashes, db)
+        
+        # Extract each distinct new file once; the semaphore keeps queued files
+        # from burning their extraction timeout while waiting for a worker
+        pending = {s.sha256: s.path for s in stored if isinstance(s, StoredFile) and s.sha256 not in extractions}
+        
+        async def extract(path: Path) -> Tuple[dict, List[_CompressedPage]]:
+            async with semaphore:
+                return await DocumentService._extract(path)
+        
+        # Each distinct text is compressed once; documents sharing a hash get their own rows
+        compressed: Dict[str, List[_CompressedPage]] = {}
+        extracted = await asyncio.gather(*[extract(path) for path in pending.values()], return_exceptions=True)
+        for content_hash, outcome in zip(pending, extracted):
+            if isinstance(outcome, BaseException):
+                extractions[content_hash] = outcome
+                continue
+            extractions[content_hash], compressed[content_hash] = outcome
+            await DocumentService._cache_extraction(content_hash, outcome[0])
+        for content_hash, extraction in extractions.items():
+            if content_hash not in compressed and not isinstance(extraction, BaseException):
+                compressed[content_hash] = await asyncio.to_thread(DocumentService._compress_pages, extraction)
+        
+        documents = []
+        for upload, item in zip(files, stored):
+            if isinstance(item, BaseException):
+                results.append(IngestResult(filename=upload.filename, error=str(item) or item.__class__.__name__))
+                continue
+            document = DocumentService._new_document(item, Path(upload.filename).name, user, project_type)
+            extraction = extractions[item.sha256]
+            if isinstance(extraction, BaseException):
+                document.status = "failed"
+                error = str(extraction) or extraction.__class__.__name__
+                logger.error(f"Document processing failed for {upload.filename}: {error}")
+            else:
+                DocumentService._apply_extraction(document, extraction, compressed[item.sha256])
+                error = None
+            documents.append(document)
+            results.append(IngestResult(filename=upload.filename, document=document, error=error))
+        
+        db.add_all(documents)
+        await db.flush()
+        
+        logger.info(
+            f"✅ Bulk ingest: {len(documents)} documents "
+            f"({sum(d.status == 'completed' for d in documents)} extracted, "
+            f"{len(hashes) - len(pending)} from cache), {len(results) - len(documents)} rejected"
+        )
+        return results
@@ -1,11 +1,91 @@
 """Error Logging Service"""
+import random
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 
 from shared.models.error_log import ErrorLog
+from core.batch_writer import BatchWriter
+from core.config import settings
+
+
+class ErrorLogWriter(BatchWriter):
+    """
+    BatchWriter for error_logs that folds identical errors waiting in the
+    buffer into one row with an occurrence count, so an error storm costs
+    one row per distinct error per flush instead of one per request
+    """
+
+    def __init__(self):
+        super().__init__(
+            ErrorLog,
+            max_batch=settings.ERROR_LOG_BATCH_SIZE,
+            flush_interval=settings.ERROR_LOG_FLUSH_SECONDS,
+            max_pending=settings.ERROR_LOG_MAX_PENDING,
+        )
+        self._by_key: Dict[Tuple, Dict[str, Any]] = {}
+        self.deduplicated = 0
+        self.sampled_out = 0
+
+    def _take_pending(self):
+        self._by_key.clear()
+        return super()._take_pending()
+
+    def add_error(self, key: Tuple, row: Dict[str, Any]) -> bool:
+        pending = self._by_key.get(key)
+        if pending is not None:
+            pending["occurrences"] += 1
+            self.deduplicated += 1
+            return True
+        if not self.add(row):
+            return False
+        self._by_key[key] = row
+        return True
+
+    def info(self) -> Dict[str, Any]:
+        return {**super().info(), "deduplicated": self.deduplicated, "sampled_out": self.sampled_out}
+
+
+error_log_writer = ErrorLogWriter()
 
 
 class ErrorService:
+    @staticmethod
+    def record_error(
+        error_code: str,
+        message: str,
+        severity: str,
+        method: str,
+        path: str,
+        status_code: int = 500,
+        user_id: int = None,
+        stack_trace: str = None
+    ) -> bool:
+        """
+        Queue an error for the batched writer; never touches the database
+        Returns False if it was sampled out or dropped (buffer full).
+        """
+        if status_code < 500 and random.random() >= settings.ERROR_LOG_CLIENT_ERROR_SAMPLE_RATE:
+            error_log_writer.sampled_out += 1
+            return False
+        
+        now = datetime.utcnow()
+        key = (error_code, severity, method, path, message, user_id)
+        return error_log_writer.add_error(key, {
+            "created_at": now,
+            "updated_at": now,
+            "is_active": True,
+            "error_code": error_code,
+            "message": message,
+            "severity": severity,
+            "method": method,
+            "path": path[:500],
+            "user_id": user_id,
+            "stack_trace": stack_trace,
+            "occurrences": 1,
+        })
+    
     @staticmethod
     async def log_error(
         error_code: str,
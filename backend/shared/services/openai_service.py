@@ -0,0 +1,364 @@
+"""
+OpenAI Service
+Chat completions through the configured AI provider, with a two-tier
+response cache in front
+"""
+import asyncio
+import hashlib
+import json
+import time
+import unicodedata
+from typing import Any, AsyncIterator, Dict, List, Optional, Type, TypeVar
+
+from loguru import logger
+from pydantic import BaseModel
+
+from core.ai import structured
+from core.ai.providers import AIProvider, ChatResponse, EmbeddingResponse, Message, StreamChunk, get_provider
+from core.ai.structured import StructuredResponse
+from core.cache import DiskCache, TTLCache
+from core.config import settings
+from shared.services.usage_service import usage_service
+
+T = TypeVar("T", bound=BaseModel)
+
+
+class _RequestAbandoned(Exception):
+    """The caller that owned a shared in-flight request was cancelled"""
+
+
+class ResponseCache:
+    """
+    Cache of chat completions keyed on a normalized request hash.
+    In-memory LRU in front of a persistent on-disk tier, both with TTL.
+    """
+
+    def __init__(self):
+        self.enabled = settings.AI_RESPONSE_CACHE_ENABLED
+        self.ttl_seconds = settings.AI_RESPONSE_CACHE_TTL_SECONDS
+        self.memory = TTLCache(settings.AI_RESPONSE_CACHE_MAX_ENTRIES, self.ttl_seconds)
+        self.disk = DiskCache(settings.AI_RESPONSE_CACHE_DIR, settings.AI_RESPONSE_CACHE_MAX_BYTES)
+
+    @staticmethod
+    def make_key(
+        messages: List[Message],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        provider: str = "",
+        json_mode: bool = False,
+    ) -> str:
+        """Stable hash of everything that determines the completion"""
+        normalized = {
+            "provider": provider,
+            "model": model,
+            "temperature": round(float(temperature), 4),
+            "max_tokens": max_tokens,
+            "messages": [
+                {
+                    "role": m.role.strip().lower(),
+                    "content": unicodedata.normalize("NFC", m.content).replace("\r\n", "\n").strip()
+                }
+                for m in messages
+            ],
+        }
+        if json_mode:
+            normalized["json_mode"] = True
+        encoded = json.dumps(normalized, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[ChatResponse]:
+        cached = self.memory.get(key)
+        if cached is not None:
+            return cached
+
+        blob = await self.disk.get(key)
+        if blob is None:
+            return None
+        entry = json.loads(blob)
+        remaining = entry["expires_at"] - time.time()
+        if remaining <= 0:
+            await self.disk.delete(key)
+            return None
+
+        response = ChatResponse(**entry["response"])
+        self.memory.set(key, response, ttl_seconds=remaining)
+        return response
+
+    async def set(self, key: str, response: ChatResponse):
+        self.memory.set(key, response)
+        entry = {"expires_at": time.time() + self.ttl_seconds, "response": response.model_dump()}
+        try:
+            await self.disk.set(key, json.dumps(entry).encode("utf-8"))
+        except OSError as e:
+            logger.warning(f"AI response cache write failed: {e}")
+
+    def info(self) -> Dict[str, Any]:
+        return {"memory": self.memory.info(), "disk": self.disk.info()}
+
+
+class OpenAIService:
+    """Chat completions (OpenAI-compatible providers)"""
+
+    def __init__(self, provider: Optional[AIProvider] = None):
+        self._provider = provider
+        self.cache = ResponseCache()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @property
+    def provider(self) -> AIProvider:
+        """Configured provider, resolved lazily so tests can swap it"""
+        return self._provider or get_provider()
+
+    async def chat_completion(
+        self,
+        messages: List[Message],
+        model: str = "gpt-4",
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        use_cache: bool = True,
+        json_mode: bool = False,
+    ) -> ChatResponse:
+        """
+        Run a chat completion
+        Identical requests are served from cache (or share one in-flight
+        call) unless use_cache=False. json_mode asks the provider for a
+        JSON object (only pass it for models that support it).
+        """
+        if not (use_cache and self.cache.enabled):
+            return await self._complete(messages, model, temperature, max_tokens, json_mode)
+
+        key = ResponseCache.make_key(messages, model, temperature, max_tokens, self.provider.name, json_mode)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            logger.info(
+                f"AI request: model={cached.model} cache_hit=True tokens_saved={cached.tokens_used}"
+            )
+            _record_chat("chat", cached, cache_hit=True)
+            return cached.model_copy(update={"cached": True, "latency_ms": 0})
+
+        inflight = self._inflight.get(key)
+        while inflight is not None:
+            try:
+                response = await asyncio.shield(inflight)
+            except _RequestAbandoned:
+                # Not our cancellation: run the call ourselves, or join whoever took it over
+                inflight = self._inflight.get(key)
+                continue
+            _record_chat("chat", response, cache_hit=True)
+            return response.model_copy(update={"cached": True, "latency_ms": 0})
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            response = await self._complete(messages, model, temperature, max_tokens, json_mode)
+            await self.cache.set(key, response)
+            future.set_result(response)
+            return response
+        except asyncio.CancelledError:
+            # cancel() would raise CancelledError in the waiters, which looks
+            # like their own cancellation (a job worker treats it as shutdown)
+            future.set_exception(_RequestAbandoned())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def stream_chat_completion(
+        self,
+        messages: List[Message],
+        model: str = "gpt-4",
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        use_cache: bool = True,
+        json_mode: bool = False,
+    ) -> AsyncIterator[StreamChunk]:
+        """
+        Stream a chat completion token by token
+        A cache hit is replayed as a single delta. Closing the iterator
+        early cancels the upstream request.
+        """
+        key = None
+        if use_cache and self.cache.enabled:
+            key = ResponseCache.make_key(messages, model, temperature, max_tokens, self.provider.name, json_mode)
+            cached = await self.cache.get(key)
+            if cached is not None:
+                logger.info(
+                    f"AI stream: model={cached.model} cache_hit=True tokens_saved={cached.tokens_used}"
+                )
+                _record_chat("stream", cached, cache_hit=True)
+                yield StreamChunk(delta=cached.content)
+                yield StreamChunk(
+                    done=True,
+                    response=cached.model_copy(update={"cached": True, "latency_ms": 0})
+                )
+                return
+
+        provider = self.provider
+        try:
+            async for chunk in provider.stream_chat_completion(messages, model, temperature, max_tokens, json_mode):
+                if chunk.done and chunk.response is not None:
+                    response = chunk.response
+                    _record_chat("stream", response)
+                    if key is not None:
+                        await self.cache.set(key, response)
+                    logger.info(
+                        f"AI stream: provider={response.provider} model={response.model} cache_hit=False "
+                        f"tokens={response.tokens_used} ttft={response.time_to_first_token_ms}ms "
+                        f"latency={response.latency_ms}ms"
+                    )
+                yield chunk
+        except Exception as e:
+            usage_service.record("stream", model, provider.name, error=f"{e.__class__.__name__}: {e}")
+            raise
+
+    async def structured_completion(
+        self,
+        messages: List[Message],
+        schema: Type[T],
+        model: str = "gpt-4",
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        use_cache: bool = True,
+    ) -> StructuredResponse:
+        """
+        Chat completion parsed and validated against a pydantic schema
+        Uses the provider's JSON mode where the model supports it.
+        """
+        response = await self.chat_completion(
+            messages, model, temperature, max_tokens, use_cache, json_mode=structured.supports_json_mode(model)
+        )
+        return await self.finish_structured(messages, response, schema, model, temperature, max_tokens, use_cache)
+
+    async def finish_structured(
+        self,
+        messages: List[Message],
+        response: ChatResponse,
+        schema: Type[T],
+        model: str = "gpt-4",
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        use_cache: bool = True,
+    ) -> StructuredResponse:
+        """
+        Parse and validate a (possibly streamed) JSON response
+        Output cut off at max_tokens is completed with continuation calls
+        that only generate the missing tail, rather than re-running the prompt.
+        """
+        content = response.content
+        tokens_used = response.tokens_used
+        billed_tokens = response.billed_tokens
+        parsed = structured.parse_json(content)
+        continuations = 0
+        while (
+            parsed.found
+            and not parsed.complete
+            and continuations < settings.AI_JSON_MAX_CONTINUATIONS
+        ):
+            continuations += 1
+            tail = await self.chat_completion(
+                structured.continuation_messages(messages, content),
+                model,
+                temperature,
+                max_tokens,
+                use_cache
+            )
+            tokens_used += tail.tokens_used
+            billed_tokens += tail.billed_tokens
+            content = structured.join_continuation(content, tail.content)
+            parsed = structured.parse_json(content)
+            logger.info(
+                f"AI JSON continuation {continuations}: model={model} "
+                f"tokens={tail.tokens_used} complete={parsed.complete}"
+            )
+
+        data, error = structured.validate(parsed, schema)
+        if error:
+            logger.warning(f"AI structured output unusable for {schema.__name__}: {error}")
+        elif parsed.repaired:
+            logger.info(f"AI structured output repaired for {schema.__name__} (complete={parsed.complete})")
+        return StructuredResponse(
+            data=data,
+            response=response.model_copy(update={"content": content, "tokens_used": tokens_used}),
+            billed_tokens=billed_tokens,
+            continuations=continuations,
+            repaired=parsed.repaired,
+            error=error,
+        )
+
+    async def embed(self, texts: List[str], model: Optional[str] = None) -> EmbeddingResponse:
+        """
+        Embed texts in EMBEDDING_BATCH_SIZE requests
+        Batches run concurrently under the provider's limits; vectors keep input order.
+        """
+        model = model or settings.EMBEDDING_MODEL
+        size = settings.EMBEDDING_BATCH_SIZE
+        batches = await asyncio.gather(*[
+            self._embed_batch(texts[i:i + size], model) for i in range(0, len(texts), size)
+        ])
+        response = EmbeddingResponse(
+            vectors=[vector for batch in batches for vector in batch.vectors],
+            model=batches[0].model if batches else model,
+            tokens_used=sum(batch.tokens_used for batch in batches),
+            latency_ms=max((batch.latency_ms for batch in batches), default=0),
+            provider=self.provider.name,
+        )
+        logger.info(
+            f"AI embeddings: provider={response.provider} model={response.model} texts={len(texts)} "
+            f"requests={len(batches)} tokens={response.tokens_used} latency={response.latency_ms}ms"
+        )
+        return response
+
+    async def _embed_batch(self, texts: List[str], model: str) -> EmbeddingResponse:
+        provider = self.provider
+        try:
+            response = await provider.embed(texts, model)
+        except Exception as e:
+            usage_service.record("embedding", model, provider.name, error=f"{e.__class__.__name__}: {e}")
+            raise
+        usage_service.record(
+            "embedding", response.model, response.provider,
+            prompt_tokens=response.tokens_used, latency_ms=response.latency_ms
+        )
+        return response
+
+    async def _complete(
+        self,
+        messages: List[Message],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool = False,
+    ) -> ChatResponse:
+        provider = self.provider
+        try:
+            response = await provider.chat_completion(messages, model, temperature, max_tokens, json_mode)
+        except Exception as e:
+            usage_service.record("chat", model, provider.name, error=f"{e.__class__.__name__}: {e}")
+            raise
+        _record_chat("chat", response)
+        logger.info(
+            f"AI request: provider={response.provider} model={response.model} cache_hit=False "
+            f"tokens={response.tokens_used} latency={response.latency_ms}ms"
+        )
+        return response
+
+
+def _record_chat(request_type: str, response: ChatResponse, cache_hit: bool = False):
+    usage_service.record(
+        request_type,
+        response.model,
+        response.provider,
+        prompt_tokens=response.prompt_tokens,
+        completion_tokens=response.completion_tokens,
+        latency_ms=0 if cache_hit else response.latency_ms,
+        time_to_first_token_ms=None if cache_hit else response.time_to_first_token_ms,
+        cache_hit=cache_hit,
+    )
+
+
+openai_service = OpenAIService()
@@ -0,0 +1,44 @@
+"""
+Profiling Service
+Admin access to on-demand profiles and slow-request traces (core.profiling)
+"""
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends
+
+from shared.models.user import User
+from shared.schemas.base import DataResponse
+from shared.schemas.profiling import ProfilingArmRequest, ProfilingStatus
+from core.dependencies import get_admin_user
+from core.exceptions import NotFoundException
+from core.profiling import profiler
+
+# Router
+router = APIRouter()
+
+
+@router.post("/arm", response_model=DataResponse[ProfilingStatus])
+async def arm_profiler(request: ProfilingArmRequest, admin: User = Depends(get_admin_user)):
+    """
+    Run the next `count` requests under path_prefix with cProfile
+    Arming applies to the worker that receives this request. Fetch results
+    by the X-Request-ID of the profiled requests.
+    """
+    profiler.arm(request.count, request.path_prefix)
+    return DataResponse(
+        data=ProfilingStatus(armed=profiler.armed, path_prefix=profiler.armed_prefix),
+        message="Profiler armed" if request.count else "Profiler disarmed"
+    )
+
+
+@router.get("/{trace_id}", response_model=DataResponse[Dict[str, Any]])
+async def get_profile(trace_id: str, admin: User = Depends(get_admin_user)):
+    """
+    Saved trace by request id (X-Request-ID) or job id ("job-<id>")
+    Contains phase totals (extraction, db, ai, ...), spans, and the cProfile
+    report for profiled requests.
+    """
+    data = await profiler.get(trace_id)
+    if data is None:
+        raise NotFoundException("Profile")
+    return DataResponse(data=data)
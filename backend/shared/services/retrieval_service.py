@@ -0,0 +1,160 @@
+"""
+Retrieval Service
+Per-document vector indexes for finding the passages relevant to a query
+"""
+import asyncio
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from shared.models.document import Document
+from shared.services.document_service import DocumentService
+from shared.services.openai_service import openai_service
+from core.ai import chunking
+from core.ai.vector_index import VectorIndex, VectorIndexStore
+from core.cache import TTLCache
+from core.config import settings
+from core.database import AsyncSessionLocal
+from core.exceptions import ValidationException
+
+
+@dataclass
+class RetrievedChunk:
+    """A document passage returned for a query"""
+    position: int  # chunk position in the document's index
+    text: str
+    score: float
+    tokens: int
+    start_page: Optional[int] = None
+    end_page: Optional[int] = None
+    section: Optional[str] = None
+
+    @property
+    def pages(self) -> List[int]:
+        if self.start_page is None:
+            return []
+        return list(range(self.start_page, (self.end_page or self.start_page) + 1))
+
+
+class RetrievalService:
+    """
+    Embed a document's chunks once and search them per query.
+    Indexes are keyed by content hash and embedding model, so re-uploads
+    of the same file reuse the stored index.
+    """
+
+    def __init__(self):
+        self.store = VectorIndexStore(
+            settings.VECTOR_INDEX_DIR,
+            settings.VECTOR_INDEX_MAX_BYTES,
+            settings.VECTOR_INDEX_CACHE_ENTRIES
+        )
+        self.query_cache = TTLCache(max_entries=1024, ttl_seconds=3600)
+        self._building: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def index_key(document: Document, model: str) -> str:
+        source = document.content_hash or f"document-{document.id}"
+        return f"{source}-{model}"
+
+    async def get_index(self, document: Document) -> VectorIndex:
+        """Load the document's index, building it on first use"""
+        model = settings.EMBEDDING_MODEL
+        key = RetrievalService.index_key(document, model)
+        index = await self.store.get(key)
+        if index is not None:
+            return index
+
+        # Concurrent callers (e.g. one per criterion) share a single build
+        building = self._building.get(key)
+        if building is not None:
+            return await asyncio.shield(building)
+
+        future = asyncio.get_running_loop().create_future()
+        self._building[key] = future
+        try:
+            index = await self._build_index(document, model)
+            await self.store.set(key, index)
+            future.set_result(index)
+            return index
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        finally:
+            del self._building[key]
+
+    async def _build_index(self, document: Document, model: str) -> VectorIndex:
+        if not document.text_length:
+            raise ValidationException("Document text not available")
+
+        # Only index builds read the text; later retrievals search the stored index
+        async with AsyncSessionLocal() as db:
+            pages = await DocumentService.get_pages(document.id, db)
+        chunks = await asyncio.to_thread(
+            chunking.chunk_pages,
+            pages,
+            settings.VECTOR_INDEX_CHUNK_TOKENS,
+            settings.VECTOR_INDEX_CHUNK_OVERLAP_TOKENS,
+            model
+        )
+        embeddings = await openai_service.embed([c.text for c in chunks], model)
+        index = await asyncio.to_thread(
+            VectorIndex.build,
+            embeddings.vectors,
+            [asdict(c) for c in chunks],
+            model,
+            settings.VECTOR_INDEX_ANN_MIN_VECTORS
+        )
+        logger.info(
+            f"Vector index built for document {document.id}: {len(index)} chunks, "
+            f"{'ivf' if index.is_ann else 'exact'}, {embeddings.tokens_used} tokens"
+        )
+        return index
+
+    async def _embed_queries(self, queries: List[str], model: str) -> List[np.ndarray]:
+        vectors = {q: self.query_cache.get((model, q)) for q in dict.fromkeys(queries)}
+        missing = [q for q, v in vectors.items() if v is None]
+        if missing:
+            response = await openai_service.embed(missing, model)
+            for query, vector in zip(missing, response.vectors):
+                vectors[query] = np.asarray(vector, dtype=np.float32)
+                self.query_cache.set((model, query), vectors[query])
+        return [vectors[q] for q in queries]
+
+    async def retrieve_many(
+        self,
+        document: Document,
+        queries: List[str],
+        top_k: Optional[int] = None
+    ) -> List[List[RetrievedChunk]]:
+        """Top-k chunks for each query, embedding all queries in one request"""
+        index = await self.get_index(document)
+        top_k = top_k or settings.RFP_CRITERION_TOP_K
+        results = []
+        for vector in await self._embed_queries(queries, index.model):
+            hits = index.search(vector, top_k, nprobe=settings.VECTOR_INDEX_ANN_NPROBE)
+            results.append([
+                RetrievedChunk(
+                    position=position,
+                    text=index.chunks[position]["text"],
+                    score=score,
+                    tokens=index.chunks[position]["tokens"],
+                    start_page=index.chunks[position].get("start_page"),
+                    end_page=index.chunks[position].get("end_page"),
+                    section=index.chunks[position].get("section"),
+                )
+                for position, score in hits
+            ])
+        return results
+
+    def info(self) -> Dict:
+        return {"indexes": self.store.info(), "queries": self.query_cache.info()}
+
+
+retrieval_service = RetrievalService()
@@ -0,0 +1,378 @@
+"""
+Storage Service
+Persist uploaded files to local disk
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Dict, Optional, Tuple
+from fastapi import APIRouter, Depends, Header, Request, status
+from loguru import logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locks, see StorageService._acquire
+    fcntl = None
+
+from shared.models.user import User
+from shared.schemas.base import DataResponse
+from shared.schemas.upload import UploadCreateRequest, UploadSessionResponse
+from core.config import settings
+from core.dependencies import get_current_user
+from core.exceptions import (
+    ConflictException,
+    NotFoundException,
+    PayloadTooLargeException,
+    ValidationException
+)
+
+CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+
+@dataclass
+class StoredFile:
+    """Result of persisting an upload"""
+    filename: str
+    path: Path
+    size: int
+    sha256: str
+
+
+@dataclass
+class UploadSession:
+    """A resumable upload in progress; `received` is the size of its .part file"""
+    upload_id: str
+    user_id: int
+    filename: str
+    total_size: int
+    created_at: float
+    received: int = 0
+
+    @property
+    def complete(self) -> bool:
+        return self.received == self.total_size
+
+
+class StorageService:
+    """
+    Local file storage
+    Files are streamed in fixed-size chunks and hashed in the same pass, so
+    memory per upload is constant; disk I/O runs in worker threads.
+    Resumable uploads live under <root>/.partial until completed; requests
+    touching one hold an exclusive flock on its .part file, so concurrent
+    requests in different worker processes can't interleave writes.
+    """
+
+    def __init__(self, root: str = settings.UPLOAD_DIR):
+        self.root = Path(root)
+        self.partial_dir = self.root / ".partial"
+        # Running hash of each in-progress upload as (offset, sha256), kept by
+        # the worker that wrote it; any other worker re-hashes on completion
+        self._digests: Dict[str, Tuple[int, "hashlib._Hash"]] = {}
+        self._held: set = set()  # upload ids locked by this process, without fcntl
+
+    @staticmethod
+    def _copy_and_hash(source: BinaryIO, destination: Path, max_bytes: int) -> tuple[int, str]:
+        """Copy in fixed-size chunks, hashing in the same pass; abort past max_bytes"""
+        digest = hashlib.sha256()
+        size = 0
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with open(destination, "wb") as out:
+                while chunk := source.read(CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise PayloadTooLargeException(f"File exceeds the {max_bytes} byte upload limit")
+                    digest.update(chunk)
+                    out.write(chunk)
+        except BaseException:
+            destination.unlink(missing_ok=True)
+            raise
+        return size, digest.hexdigest()
+
+    @staticmethod
+    def _stored_name(original_filename: str) -> str:
+        return f"{uuid.uuid4().hex}{Path(original_filename).suffix.lower()}"
+
+    async def save_upload(
+        self,
+        file: BinaryIO,
+        original_filename: str,
+        folder: str,
+        max_bytes: Optional[int] = None
+    ) -> StoredFile:
+        """Stream an upload to disk, returning its size and SHA-256"""
+        filename = self._stored_name(original_filename)
+        path = self.root / folder / filename
+
+        size, sha256 = await asyncio.to_thread(
+            self._copy_and_hash, file, path, max_bytes or settings.MAX_UPLOAD_BYTES
+        )
+
+        logger.info(f"File stored: {path} ({size} bytes)")
+        return StoredFile(filename=filename, path=path, size=size, sha256=sha256)
+
+    # Resumable uploads
+
+    def _part_path(self, upload_id: str) -> Path:
+        return self.partial_dir / f"{upload_id}.part"
+
+    def _meta_path(self, upload_id: str) -> Path:
+        return self.partial_dir / f"{upload_id}.json"
+
+    def _purge_expired(self):
+        """Delete resumable uploads idle for longer than the TTL"""
+        cutoff = time.time() - settings.RESUMABLE_UPLOAD_TTL_SECONDS
+        for meta in self.partial_dir.glob("*.json"):
+            part = meta.with_suffix(".part")
+            try:
+                last_write = max(meta.stat().st_mtime, part.stat().st_mtime if part.exists() else 0)
+                if last_write < cutoff:
+                    part.unlink(missing_ok=True)
+                    meta.unlink(missing_ok=True)
+                    self._digests.pop(meta.stem, None)
+                    logger.info(f"Expired upload purged: {meta.stem}")
+            except OSError:
+                continue
+
+    def _create_files(self, session: UploadSession):
+        self.partial_dir.mkdir(parents=True, exist_ok=True)
+        self._purge_expired()
+        metadata = {k: v for k, v in asdict(session).items() if k != "received"}
+        self._meta_path(session.upload_id).write_text(json.dumps(metadata))
+        self._part_path(session.upload_id).touch()
+
+    def _read_session(self, upload_id: str) -> Optional[UploadSession]:
+        try:
+            metadata = json.loads(self._meta_path(upload_id).read_text())
+            received = self._part_path(upload_id).stat().st_size
+        except (OSError, ValueError):
+            return None
+        return UploadSession(**metadata, received=received)
+
+    async def create_session(self, filename: str, total_size: int, user: User) -> UploadSession:
+        """Start a resumable upload of total_size bytes"""
+        if Path(filename).suffix.lower() not in settings.ALLOWED_UPLOAD_EXTENSIONS:
+            raise ValidationException(f"Unsupported file format: {Path(filename).suffix.lower()}")
+        if total_size > settings.MAX_UPLOAD_BYTES:
+            raise PayloadTooLargeException(f"File exceeds the {settings.MAX_UPLOAD_BYTES} byte upload limit")
+
+        session = UploadSession(
+            upload_id=uuid.uuid4().hex,
+            user_id=user.id,
+            filename=Path(filename).name,
+            total_size=total_size,
+            created_at=time.time()
+        )
+        await asyncio.to_thread(self._create_files, session)
+        self._digests[session.upload_id] = (0, hashlib.sha256())
+
+        logger.info(f"📦 Resumable upload started: {session.upload_id} ({total_size} bytes)")
+        return session
+
+    def _open_locked(self, upload_id: str) -> Tuple[BinaryIO, int]:
+        """Open the upload's .part file under an exclusive lock, returning it and its size"""
+        path = self._part_path(upload_id)
+        try:
+            f = open(path, "r+b")
+        except FileNotFoundError:
+            raise NotFoundException("Upload")
+        try:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    raise ConflictException("Another request is writing to this upload")
+            # A request holding the lock may have completed or deleted the upload meanwhile
+            try:
+                current = os.stat(path).st_ino == os.fstat(f.fileno()).st_ino
+            except FileNotFoundError:
+                current = False
+            if not current:
+                raise NotFoundException("Upload")
+            return f, f.seek(0, os.SEEK_END)
+        except BaseException:
+            f.close()
+            raise
+
+    async def _acquire(self, upload_id: str) -> Tuple[BinaryIO, int]:
+        if fcntl is None:
+            if upload_id in self._held:
+                raise ConflictException("Another request is writing to this upload")
+            self._held.add(upload_id)
+        try:
+            return await asyncio.to_thread(self._open_locked, upload_id)
+        except BaseException:
+            self._held.discard(upload_id)
+            raise
+
+    async def _release(self, upload_id: str, f: BinaryIO):
+        await asyncio.to_thread(f.close)
+        self._held.discard(upload_id)
+
+    async def get_session(self, upload_id: str, user: User) -> UploadSession:
+        """Load an upload owned by user (the offset is read from disk)"""
+        session = None
+        if upload_id.isalnum():
+            session = await asyncio.to_thread(self._read_session, upload_id)
+        if session is None or session.user_id != user.id:
+            raise NotFoundException("Upload")
+        return session
+
+    @staticmethod
+    def _append(out: BinaryIO, digest: Optional["hashlib._Hash"], data: bytes):
+        if digest is not None:
+            digest.update(data)
+        out.write(data)
+
+    async def append_chunk(self, session: UploadSession, offset: int, body: AsyncIterator[bytes]) -> UploadSession:
+        """
+        Append a request body at offset, which must equal the bytes received
+        so far. Data is flushed in CHUNK_SIZE blocks as it arrives; if the
+        client disconnects, what was written stays and the upload can resume
+        from the new offset.
+        """
+        if offset != session.received:
+            raise ConflictException(f"Upload offset is {session.received}, not {offset}")
+
+        out, session.received = await self._acquire(session.upload_id)
+        try:
+            # Re-checked under the lock: another worker may have appended since the session was read
+            if offset != session.received:
+                raise ConflictException(f"Upload offset is {session.received}, not {offset}")
+            known = self._digests.pop(session.upload_id, None)
+            digest = known[1] if known and known[0] == offset else None
+            buffer = bytearray()
+            try:
+                async for data in body:
+                    if session.received + len(buffer) + len(data) > session.total_size:
+                        raise PayloadTooLargeException(
+                            f"Chunk runs past the declared size of {session.total_size} bytes"
+                        )
+                    buffer += data
+                    if len(buffer) >= CHUNK_SIZE:
+                        await asyncio.to_thread(self._append, out, digest, bytes(buffer))
+                        session.received += len(buffer)
+                        buffer.clear()
+            finally:
+                # Keep whatever arrived before an error or disconnect
+                if buffer:
+                    await asyncio.to_thread(self._append, out, digest, bytes(buffer))
+                    session.received += len(buffer)
+                if digest is not None:
+                    self._digests[session.upload_id] = (session.received, digest)
+        finally:
+            await self._release(session.upload_id, out)
+        return session
+
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _finalize(self, session: UploadSession, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(self._part_path(session.upload_id), path)
+        self._meta_path(session.upload_id).unlink(missing_ok=True)
+
+    async def complete_session(self, session: UploadSession, folder: str) -> StoredFile:
+        """Move a fully received upload into folder, returning it like save_upload"""
+        if not session.complete:
+            raise ValidationException(f"Upload incomplete: {session.received} of {session.total_size} bytes received")
+
+        part, received = await self._acquire(session.upload_id)
+        try:
+            known = self._digests.pop(session.upload_id, None)
+            if known and known[0] == received:
+                sha256 = known[1].hexdigest()
+            else:
+                sha256 = await asyncio.to_thread(self._hash_file, self._part_path(session.upload_id))
+
+            filename = self._stored_name(session.filename)
+            path = self.root / folder / filename
+            await asyncio.to_thread(self._finalize, session, path)
+        finally:
+            await self._release(session.upload_id, part)
+
+        logger.info(f"File stored: {path} ({session.received} bytes, resumable upload {session.upload_id})")
+        return StoredFile(filename=filename, path=path, size=session.received, sha256=sha256)
+
+    def _delete_files(self, upload_id: str):
+        self._part_path(upload_id).unlink(missing_ok=True)
+        self._meta_path(upload_id).unlink(missing_ok=True)
+
+    async def delete_session(self, session: UploadSession):
+        part, _ = await self._acquire(session.upload_id)
+        try:
+            self._digests.pop(session.upload_id, None)
+            await asyncio.to_thread(self._delete_files, session.upload_id)
+        finally:
+            await self._release(session.upload_id, part)
+        logger.info(f"Resumable upload cancelled: {session.upload_id}")
+
+
+storage_service = StorageService()
+
+
+def _session_response(session: UploadSession) -> UploadSessionResponse:
+    return UploadSessionResponse(
+        upload_id=session.upload_id,
+        filename=session.filename,
+        total_size=session.total_size,
+        received=session.received,
+        complete=session.complete,
+        chunk_size=settings.UPLOAD_CHUNK_BYTES,
+        created_at=datetime.utcfromtimestamp(session.created_at)
+    )
+
+
+# Router
+router = APIRouter()
+
+
+@router.post("/", status_code=status.HTTP_201_CREATED, response_model=DataResponse[UploadSessionResponse])
+async def create_upload(request: UploadCreateRequest, user: User = Depends(get_current_user)):
+    """
+    Start a resumable upload
+    Send the file with PUT requests carrying an Upload-Offset header, then
+    pass the upload_id to an application endpoint (e.g. /rfp/upload/resumable).
+    """
+    session = await storage_service.create_session(request.filename, request.total_size, user)
+    return DataResponse(data=_session_response(session), message="Upload started")
+
+
+@router.get("/{upload_id}", response_model=DataResponse[UploadSessionResponse])
+async def get_upload(upload_id: str, user: User = Depends(get_current_user)):
+    """Upload status; `received` is the offset to resume from"""
+    session = await storage_service.get_session(upload_id, user)
+    return DataResponse(data=_session_response(session))
+
+
+@router.put("/{upload_id}", response_model=DataResponse[UploadSessionResponse])
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., ge=0),
+    user: User = Depends(get_current_user)
+):
+    """Append the raw request body at Upload-Offset"""
+    session = await storage_service.get_session(upload_id, user)
+    session = await storage_service.append_chunk(session, upload_offset, request.stream())
+    return DataResponse(data=_session_response(session))
+
+
+@router.delete("/{upload_id}", response_model=DataResponse[dict])
+async def delete_upload(upload_id: str, user: User = Depends(get_current_user)):
+    """Cancel an upload and discard the received data"""
+    session = await storage_service.get_session(upload_id, user)
+    await storage_service.delete_session(session)
+    return DataResponse(data={"upload_id": upload_id}, message="Upload cancelled")
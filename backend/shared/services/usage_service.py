@@ -0,0 +1,230 @@
+"""
+Usage Service
+Per-call AI usage accounting (ai_request_logs) and aggregated usage reports
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional, Tuple
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared.models.ai_request_log import AIRequestLog
+from shared.models.user import User
+from shared.schemas.base import DataResponse
+from shared.schemas.usage import UsageReport, UsageRow
+from core.batch_writer import BatchWriter
+from core.config import settings
+from core.database import get_read_db
+from core.dependencies import get_admin_user, get_current_user
+from core.metrics import metrics
+from core.profiling import record_span
+
+AI_REQUESTS = metrics.counter(
+    "aihub_ai_requests_total", "Model calls by outcome (success, error, cache_hit)", ["type", "model", "status"]
+)
+AI_REQUEST_DURATION = metrics.histogram(
+    "aihub_ai_request_duration_seconds", "Model call latency, excluding cache hits", ["type", "model"]
+)
+AI_TOKENS = metrics.counter(
+    "aihub_ai_tokens_total", "Tokens billed by the provider (cache hits excluded)", ["model", "kind"]
+)
+
+# (user_id, feature) that AI calls in the current task are attributed to
+_usage_scope: ContextVar[Tuple[Optional[int], Optional[str]]] = ContextVar("ai_usage_scope", default=(None, None))
+
+
+@contextmanager
+def usage_scope(user_id: Optional[int] = None, feature: Optional[str] = None) -> Iterator[None]:
+    """
+    Attribute AI calls made inside the block to a user and feature
+    Tasks started inside the block inherit the scope. Do not hold the
+    block open across a `yield` in an async generator.
+    """
+    token = _usage_scope.set((user_id, feature))
+    try:
+        yield
+    finally:
+        _usage_scope.reset(token)
+
+
+class UsageService:
+    """
+    Records every model call through a BatchWriter, so accounting costs
+    an in-memory append on the request path; rows reach the database in
+    bulk inserts a few seconds later.
+    """
+
+    def __init__(self):
+        self.enabled = settings.AI_USAGE_LOG_ENABLED
+        self.writer = BatchWriter(
+            AIRequestLog,
+            max_batch=settings.AI_USAGE_LOG_BATCH_SIZE,
+            flush_interval=settings.AI_USAGE_LOG_FLUSH_SECONDS,
+            max_pending=settings.AI_USAGE_LOG_MAX_PENDING,
+        )
+
+    @staticmethod
+    def cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        """USD cost from AI_MODEL_PRICING (0 for unknown models)"""
+        matches = [prefix for prefix in settings.AI_MODEL_PRICING if model.startswith(prefix)]
+        if not matches:
+            return 0.0
+        input_price, output_price = settings.AI_MODEL_PRICING[max(matches, key=len)]
+        return round((prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000, 6)
+
+    def record(
+        self,
+        request_type: str,
+        model: str,
+        provider: Optional[str] = None,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        latency_ms: int = 0,
+        time_to_first_token_ms: Optional[int] = None,
+        cache_hit: bool = False,
+        error: Optional[str] = None,
+    ):
+        """Count one call in /metrics and traces, and queue it for logging (never blocks, never raises on the DB)"""
+        status = "error" if error else "cache_hit" if cache_hit else "success"
+        AI_REQUESTS.inc(request_type, model, status)
+        if status == "success":
+            record_span("ai", (latency_ms or 0) / 1000)
+            AI_REQUEST_DURATION.observe((latency_ms or 0) / 1000, request_type, model)
+            AI_TOKENS.inc(model, "prompt", amount=prompt_tokens or 0)
+            AI_TOKENS.inc(model, "completion", amount=completion_tokens or 0)
+        if not self.enabled:
+            return
+        user_id, feature = _usage_scope.get()
+        now = datetime.utcnow()
+        self.writer.add({
+            "created_at": now,
+            "updated_at": now,
+            "is_active": True,
+            "user_id": user_id,
+            "feature": feature,
+            "request_type": request_type,
+            "provider": provider,
+            "model": model,
+            "prompt_tokens": prompt_tokens or 0,
+            "completion_tokens": completion_tokens or 0,
+            "total_tokens": (prompt_tokens or 0) + (completion_tokens or 0),
+            "latency_ms": latency_ms or 0,
+            "time_to_first_token_ms": time_to_first_token_ms,
+            "cache_hit": cache_hit,
+            "cost_usd": 0.0 if cache_hit or error else self.cost(model, prompt_tokens or 0, completion_tokens or 0),
+            "status": "error" if error else "success",
+            "error": error[:500] if error else None,
+        })
+
+    async def report(
+        self,
+        db: AsyncSession,
+        since: datetime,
+        until: datetime,
+        user_id: Optional[int] = None,
+        by_user: bool = False
+    ) -> UsageReport:
+        """Usage per model (and per user) over [since, until)"""
+        billed = AIRequestLog.cache_hit.is_(False)
+        columns = [
+            func.count().label("requests"),
+            func.sum(case((AIRequestLog.cache_hit.is_(True), 1), else_=0)).label("cache_hits"),
+            func.sum(case((AIRequestLog.status == "error", 1), else_=0)).label("errors"),
+            func.sum(case((billed, AIRequestLog.prompt_tokens), else_=0)).label("prompt_tokens"),
+            func.sum(case((billed, AIRequestLog.completion_tokens), else_=0)).label("completion_tokens"),
+            func.sum(case((billed, 0), else_=AIRequestLog.total_tokens)).label("tokens_saved"),
+            func.sum(AIRequestLog.cost_usd).label("cost_usd"),
+            func.avg(case((billed, AIRequestLog.latency_ms))).label("avg_latency_ms"),
+        ]
+        groups = [AIRequestLog.user_id, AIRequestLog.model] if by_user else [AIRequestLog.model]
+
+        query = (
+            select(*groups, *columns)
+            .where(AIRequestLog.created_at >= since, AIRequestLog.created_at < until)
+            .group_by(*groups)
+            .order_by(func.sum(AIRequestLog.cost_usd).desc())
+        )
+        if user_id is not None:
+            query = query.where(AIRequestLog.user_id == user_id)
+        result = await db.execute(query)
+
+        rows = [_usage_row(row._mapping) for row in result]
+        totals = UsageRow(
+            requests=sum(r.requests for r in rows),
+            cache_hits=sum(r.cache_hits for r in rows),
+            errors=sum(r.errors for r in rows),
+            prompt_tokens=sum(r.prompt_tokens for r in rows),
+            completion_tokens=sum(r.completion_tokens for r in rows),
+            total_tokens=sum(r.total_tokens for r in rows),
+            tokens_saved=sum(r.tokens_saved for r in rows),
+            cost_usd=round(sum(r.cost_usd for r in rows), 6),
+        )
+        return UsageReport(since=since, until=until, rows=rows, totals=totals)
+
+
+def _usage_row(values) -> UsageRow:
+    prompt_tokens = int(values["prompt_tokens"] or 0)
+    completion_tokens = int(values["completion_tokens"] or 0)
+    avg_latency = values["avg_latency_ms"]
+    return UsageRow(
+        user_id=values.get("user_id"),
+        model=values["model"],
+        requests=values["requests"],
+        cache_hits=int(values["cache_hits"] or 0),
+        errors=int(values["errors"] or 0),
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        total_tokens=prompt_tokens + completion_tokens,
+        tokens_saved=int(values["tokens_saved"] or 0),
+        cost_usd=round(float(values["cost_usd"] or 0), 6),
+        avg_latency_ms=round(float(avg_latency), 1) if avg_latency is not None else None,
+    )
+
+
+def _naive_utc(dt: Optional[datetime]) -> Optional[datetime]:
+    """Request datetimes as stored: naive UTC. Naive values are taken to be UTC already."""
+    if dt is None or dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _period(since: Optional[datetime], until: Optional[datetime], days: int) -> Tuple[datetime, datetime]:
+    since, until = _naive_utc(since), _naive_utc(until) or datetime.utcnow()
+    return since or until - timedelta(days=days), until
+
+
+usage_service = UsageService()
+
+
+# Router
+router = APIRouter()
+
+
+@router.get("/me", response_model=DataResponse[UsageReport])
+async def my_usage(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    days: int = Query(30, ge=1, le=366),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """AI usage of the current user per model (default: last 30 days)"""
+    since, until = _period(since, until, days)
+    return DataResponse(data=await usage_service.report(db, since, until, user_id=user.id))
+
+
+@router.get("/", response_model=DataResponse[UsageReport])
+async def all_usage(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    days: int = Query(30, ge=1, le=366),
+    user_id: Optional[int] = None,
+    admin: User = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """AI usage per user and model (admin only)"""
+    since, until = _period(since, until, days)
+    return DataResponse(data=await usage_service.report(db, since, until, user_id=user_id, by_user=True))
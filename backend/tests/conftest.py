@@ -0,0 +1,31 @@
+"""
+Test configuration
+Settings are read at import time, so the environment is set up before any
+application module is imported. Run from backend/: python -m pytest
+"""
+import os
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key-not-for-production-use")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("AI_PROVIDER", "fake")
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import shared.models  # noqa: F401 - registers every table on Base.metadata
+from core.database import Base
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    """Sessions on a fresh SQLite database with all tables"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
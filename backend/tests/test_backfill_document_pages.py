@@ -0,0 +1,70 @@
+"""Backfilling legacy documents.extracted_text into document_pages"""
+import json
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core.database import Base
+from core.ai.extraction_cache import ExtractionCache
+from scripts.backfill_document_pages import backfill
+from shared.models.document import Document
+from shared.services.document_service import DocumentService
+
+pytestmark = pytest.mark.anyio
+
+PDF_TEXT = "Section 1: Scope\n\fSection 2: Pricing\nFixed fee.\n\fSection 3: Terms\n"
+PAGE_STARTS = [0, PDF_TEXT.index("Section 2"), PDF_TEXT.index("Section 3")]
+
+
+@pytest.fixture
+async def legacy_engine(tmp_path):
+    """A database created before document_pages: text on the documents row"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'legacy.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text("DROP TABLE document_pages"))
+        await conn.execute(text("ALTER TABLE documents DROP COLUMN text_length"))
+        await conn.execute(text("ALTER TABLE documents ADD COLUMN extracted_text TEXT"))
+        await conn.execute(text("ALTER TABLE documents ADD COLUMN page_starts JSON"))
+        for document_id, file_type, body, page_starts in [
+            (1, "pdf", PDF_TEXT, json.dumps(PAGE_STARTS)),
+            (2, "txt", "Plain text RFP", None),
+            (3, "pdf", None, None),  # extraction failed
+        ]:
+            await conn.execute(
+                text(
+                    "INSERT INTO documents (id, user_id, filename, original_filename, file_path, file_size, "
+                    "file_type, content_hash, status, num_pages, created_at, updated_at, is_active, "
+                    "extracted_text, page_starts) VALUES (:id, 1, 'f', 'f', 'uploads/f', 1, :type, :hash, "
+                    "'completed', 3, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 1, :text, :starts)"
+                ),
+                {"id": document_id, "type": file_type, "hash": f"hash{document_id}", "text": body, "starts": page_starts},
+            )
+    yield engine
+    await engine.dispose()
+
+
+async def test_backfill_moves_legacy_text_into_pages(legacy_engine, tmp_path):
+    assert await backfill(legacy_engine, batch_size=1) == 2
+
+    async with async_sessionmaker(legacy_engine)() as db:
+        assert await DocumentService.get_text(1, db) == PDF_TEXT
+        assert await DocumentService.get_pages(1, db, page_numbers=[2]) == [
+            {"page": 2, "text": "Section 2: Pricing\nFixed fee."}
+        ]
+        assert await DocumentService.get_text(2, db) == "Plain text RFP"
+        assert (await db.get(Document, 1)).text_length == len(PDF_TEXT)
+        assert (await db.get(Document, 3)).text_length is None
+
+        cached = await ExtractionCache(str(tmp_path / "extractions"), 10**6).lookup("hash1", db)
+        assert cached["text"] == PDF_TEXT
+        assert cached["page_starts"] == PAGE_STARTS
+
+
+async def test_backfill_can_be_rerun(legacy_engine):
+    await backfill(legacy_engine)
+
+    assert await backfill(legacy_engine) == 0
+    async with legacy_engine.connect() as conn:
+        assert await conn.scalar(text("SELECT count(*) FROM document_pages")) == 4
@@ -0,0 +1,51 @@
+"""Token-aware chunking: budgets, headings and page spans"""
+import re
+
+from core.ai.chunking import chunk_pages, chunk_text, count_tokens
+
+
+def _paragraph(sentences: int, topic: str) -> str:
+    return " ".join(f"The vendor shall report on {topic} item {n}." for n in range(sentences))
+
+
+def test_heading_starts_the_chunk_of_an_oversized_block():
+    chunks = chunk_text("1. SCOPE\n\n" + "word " * 3000, max_tokens=500)
+
+    assert chunks[0].text.startswith("1. SCOPE\n\nword")
+    assert all(chunk.text.strip() != "1. SCOPE" for chunk in chunks)
+    assert all(chunk.tokens <= 500 for chunk in chunks)
+    assert all(chunk.section == "1. SCOPE" for chunk in chunks)
+
+
+def test_heading_is_packed_with_the_sentences_of_a_long_paragraph():
+    body = _paragraph(200, "pricing")
+    chunks = chunk_text("2. PRICING\n\n" + body, max_tokens=count_tokens(body) // 3)
+
+    assert chunks[0].text.startswith("2. PRICING\n\nThe vendor shall")
+    assert all(chunk.tokens <= count_tokens(body) // 3 for chunk in chunks)
+
+
+def test_heading_at_the_end_of_a_full_chunk_moves_to_the_next_one():
+    first, second = _paragraph(10, "staffing"), _paragraph(20, "pricing")
+    budget = count_tokens(second) + 20
+    chunks = chunk_text(f"{first}\n\n3. PRICING\n\n{second}", max_tokens=budget, overlap_tokens=0, min_fill=0.9)
+
+    assert [chunk.text for chunk in chunks] == [first, f"3. PRICING\n\n{second}"]
+    assert chunks[1].section == "3. PRICING"
+
+
+def test_every_word_is_kept_within_the_budget():
+    text = "\n\n".join(f"{n}. SECTION {n}\n\n{_paragraph(n * 7, f'topic {n}')}" for n in range(1, 8))
+    chunks = chunk_text(text, max_tokens=120, overlap_tokens=0)
+
+    assert all(chunk.tokens <= 120 for chunk in chunks)
+    assert " ".join(" ".join(chunk.text.split()) for chunk in chunks) == " ".join(text.split())
+    assert not any(re.fullmatch(r"\d+\. SECTION \d+", chunk.text) for chunk in chunks)
+
+
+def test_chunks_carry_their_page_span():
+    pages = [{"page": n, "text": _paragraph(15, f"page {n}")} for n in range(1, 5)]
+    budget = count_tokens(pages[0]["text"]) * 2 + 10
+    chunks = chunk_pages(pages, max_tokens=budget, overlap_tokens=0)
+
+    assert [(chunk.start_page, chunk.end_page) for chunk in chunks] == [(1, 2), (3, 4)]
@@ -0,0 +1,45 @@
+"""Read-only sessions: autocommit, no writes, primary vs replica"""
+import pytest
+from sqlalchemy import event, text
+
+from core import database
+from shared.models.user import User
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+async def dispose_engine():
+    """These tests use the application engine: close its connections so pytest can exit"""
+    yield
+    await database.engine.dispose()
+
+
+async def test_primary_read_session_queries_the_primary_without_a_transaction():
+    statements, commits = [], []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    def record_commit(conn):
+        commits.append(conn)
+
+    event.listen(database.engine.sync_engine, "before_cursor_execute", record)
+    event.listen(database.engine.sync_engine, "commit", record_commit)
+    try:
+        async for session in database.get_primary_read_db():
+            assert await session.scalar(text("SELECT 1")) == 1
+            assert session.bind.url == database.engine.url
+            assert session.bind.get_execution_options()["isolation_level"] == "AUTOCOMMIT"
+    finally:
+        event.remove(database.engine.sync_engine, "before_cursor_execute", record)
+        event.remove(database.engine.sync_engine, "commit", record_commit)
+    assert statements == ["SELECT 1"]
+    assert commits == []
+
+
+async def test_primary_read_session_refuses_writes():
+    async with database.PrimaryReadSessionLocal() as session:
+        session.add(User(email="analyst@example.com", hashed_password="x"))
+        with pytest.raises(RuntimeError, match="Read-only session cannot write"):
+            await session.flush()
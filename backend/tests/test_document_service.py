@@ -0,0 +1,38 @@
+"""Document extraction into compressed pages"""
+import pytest
+
+from benchmarks.synthetic_pdf import make_pdf
+from core.ai.document_processor import DocumentProcessor
+from core.config import settings
+from shared.services.document_service import DocumentService
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def pdf(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "EXTRACTION_PAGES_PER_TASK", 3)  # several batches in flight
+    yield make_pdf(tmp_path / "rfp.pdf", 10, lines_per_page=5)
+    DocumentProcessor.shutdown_executor()
+
+
+async def test_streamed_pdf_pages_match_whole_extraction(pdf):
+    whole = await DocumentProcessor.extract_text(pdf)
+
+    extraction, pages = await DocumentService._extract(pdf)
+
+    assert pages == DocumentService._compress_pages(whole)
+    assert [page.page_number for page in pages] == list(range(1, 11))
+    assert sum(page.char_count for page in pages) == len(whole["text"])
+    assert "text" not in extraction
+    assert extraction["num_pages"] == 10
+
+
+async def test_other_formats_are_extracted_whole(tmp_path):
+    path = tmp_path / "rfp.txt"
+    path.write_text("Scope of work\n\nPricing", encoding="utf-8")
+
+    extraction, pages = await DocumentService._extract(path)
+
+    assert extraction["text"] == "Scope of work\n\nPricing"
+    assert [(page.page_number, page.char_count) for page in pages] == [(None, 22)]
@@ -0,0 +1,45 @@
+"""Extraction cache: disk tier round trip and DB fallback"""
+import zlib
+
+import pytest
+
+from core.ai.extraction_cache import ExtractionCache
+from shared.models.document import Document, DocumentPage
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_disk_tier_round_trip(tmp_path, session_factory):
+    cache = ExtractionCache(str(tmp_path / "cache"), max_bytes=1 << 20)
+    extraction = {"text": "one\n\ntwo", "page_starts": [0, 5], "num_pages": 2, "metadata": {}, "format": "pdf"}
+    await cache.store("a" * 64, extraction)
+
+    async with session_factory() as db:
+        found = await cache.lookup("a" * 64, db)
+
+    assert found == extraction
+    assert cache.db_hits == 0
+
+
+async def test_db_pages_serve_and_backfill_a_miss(tmp_path, session_factory):
+    cache = ExtractionCache(str(tmp_path / "cache"), max_bytes=1 << 20)
+    async with session_factory() as db:
+        document = Document(
+            user_id=1, filename="a.pdf", original_filename="a.pdf", file_path="a.pdf", file_size=1,
+            file_type="pdf", content_hash="b" * 64, status="completed", text_length=8, num_pages=2
+        )
+        db.add(document)
+        await db.flush()
+        db.add_all([
+            DocumentPage(document_id=document.id, position=n, page_number=n + 1, char_count=len(text),
+                         compressed_text=zlib.compress(text.encode("utf-8")))
+            for n, text in enumerate(["one\n\n", "two"])
+        ])
+        await db.commit()
+
+        found = await cache.lookup("b" * 64, db)
+
+    assert found["text"] == "one\n\ntwo"
+    assert found["page_starts"] == [0, 5]
+    assert cache.db_hits == 1
+    assert await cache.disk.get("b" * 64) is not None
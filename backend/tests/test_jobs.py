@@ -0,0 +1,202 @@
+"""Job queue: claiming, retries, backoff and requeueing, on SQLite"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.config import settings
+from core.exceptions import NotFoundException
+from core.jobs import JobQueue
+from shared.models.job import Job
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def queue(session_factory):
+    return JobQueue(session_factory, concurrency=2, poll_interval=0.05)
+
+
+async def _get(session_factory, job_id: int) -> Job:
+    async with session_factory() as db:
+        return await db.get(Job, job_id)
+
+
+async def _enqueue(queue, session_factory, job_type: str, **options) -> Job:
+    async with session_factory() as db:
+        return await queue.enqueue(job_type, {"n": 1}, db, **options)
+
+
+async def test_claim_is_exclusive(queue, session_factory):
+    @queue.handler("noop")
+    async def noop(payload, db):
+        return None
+
+    job = await _enqueue(queue, session_factory, "noop")
+    claims = await asyncio.gather(queue._claim_next(), queue._claim_next())
+
+    assert [c.id for c in claims if c is not None] == [job.id]
+    claimed = await _get(session_factory, job.id)
+    assert claimed.status == "running"
+    assert claimed.attempts == 1
+
+
+async def test_claim_skips_jobs_not_yet_due(queue, session_factory):
+    @queue.handler("noop")
+    async def noop(payload, db):
+        return None
+
+    job = await _enqueue(queue, session_factory, "noop")
+    async with session_factory() as db:
+        (await db.get(Job, job.id)).run_after = datetime.utcnow() + timedelta(minutes=5)
+        await db.commit()
+
+    assert await queue._claim_next() is None
+
+
+async def test_workers_run_job_to_completion(queue, session_factory):
+    @queue.handler("echo")
+    async def echo(payload, db):
+        return {"echo": payload["n"]}
+
+    await queue.start()
+    try:
+        job = await _enqueue(queue, session_factory, "echo")
+        for _ in range(100):
+            finished = await _get(session_factory, job.id)
+            if finished.status == "completed":
+                break
+            await asyncio.sleep(0.02)
+    finally:
+        await queue.stop()
+
+    assert finished.status == "completed"
+    assert finished.result == {"echo": 1}
+    assert finished.finished_at is not None
+
+
+async def test_failure_is_retried_with_backoff(queue, session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_RETRY_BACKOFF_SECONDS", 10.0)
+    calls = []
+
+    @queue.handler("flaky")
+    async def flaky(payload, db):
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("upstream timeout")
+        return {"ok": True}
+
+    job = await _enqueue(queue, session_factory, "flaky", max_attempts=3)
+    await queue._execute(await queue._claim_next())
+
+    retried = await _get(session_factory, job.id)
+    assert retried.status == "queued"
+    assert retried.error == "upstream timeout"
+    delay = (retried.run_after - datetime.utcnow()).total_seconds()
+    assert 7 < delay <= 12  # 10s, +-20% jitter
+
+    async with session_factory() as db:
+        (await db.get(Job, job.id)).run_after = datetime.utcnow()
+        await db.commit()
+    await queue._execute(await queue._claim_next())
+
+    done = await _get(session_factory, job.id)
+    assert done.status == "completed"
+    assert done.attempts == 2
+
+
+def test_backoff_grows_exponentially_and_is_capped(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_RETRY_BACKOFF_SECONDS", 5.0)
+    monkeypatch.setattr(settings, "JOB_RETRY_BACKOFF_MAX_SECONDS", 60.0)
+
+    assert 4.0 <= JobQueue._backoff(1) <= 6.0
+    assert 16.0 <= JobQueue._backoff(3) <= 24.0
+    assert 48.0 <= JobQueue._backoff(20) <= 72.0
+
+
+async def test_failure_without_attempts_left_runs_failure_handler(queue, session_factory):
+    failures = []
+
+    async def on_failure(payload, error, db):
+        failures.append((payload, error))
+
+    @queue.handler("broken", on_failure=on_failure)
+    async def broken(payload, db):
+        raise RuntimeError("boom")
+
+    job = await _enqueue(queue, session_factory, "broken", max_attempts=1)
+    await queue._execute(await queue._claim_next())
+
+    failed = await _get(session_factory, job.id)
+    assert failed.status == "failed"
+    assert failed.error == "boom"
+    assert failures == [({"n": 1}, "boom")]
+
+
+async def test_client_errors_are_not_retried(queue, session_factory):
+    failures = []
+
+    async def on_failure(payload, error, db):
+        failures.append(error)
+
+    @queue.handler("missing", on_failure=on_failure)
+    async def missing(payload, db):
+        raise NotFoundException("RFP Evaluation")
+
+    job = await _enqueue(queue, session_factory, "missing", max_attempts=3)
+    await queue._execute(await queue._claim_next())
+
+    failed = await _get(session_factory, job.id)
+    assert failed.status == "failed"
+    assert failed.attempts == 1
+    assert failures == ["RFP Evaluation not found"]
+
+
+async def test_stop_requeues_in_flight_jobs(queue, session_factory):
+    failures = []
+    started = asyncio.Event()
+
+    async def on_failure(payload, error, db):
+        failures.append(error)
+
+    @queue.handler("slow", on_failure=on_failure)
+    async def slow(payload, db):
+        started.set()
+        await asyncio.sleep(60)
+
+    await queue.start()
+    requeued = await _enqueue(queue, session_factory, "slow", max_attempts=3)
+    exhausted = await _enqueue(queue, session_factory, "slow", max_attempts=1)
+    for _ in range(100):
+        if len(queue._in_flight) == 2:
+            break
+        await asyncio.sleep(0.02)
+    await queue.stop()
+
+    job = await _get(session_factory, requeued.id)
+    assert job.status == "queued"
+    assert job.attempts == 1
+    assert job.run_after <= datetime.utcnow()
+    job = await _get(session_factory, exhausted.id)
+    assert job.status == "failed"
+    assert failures == ["Interrupted by shutdown"]
+
+
+async def test_start_requeues_stale_jobs(queue, session_factory):
+    @queue.handler("noop")
+    async def noop(payload, db):
+        return None
+
+    stale_since = datetime.utcnow() - timedelta(seconds=settings.JOB_TIMEOUT_SECONDS * 3)
+    async with session_factory() as db:
+        stale = Job(job_type="noop", status="running", attempts=1, max_attempts=3, started_at=stale_since)
+        exhausted = Job(job_type="noop", status="running", attempts=3, max_attempts=3, started_at=stale_since)
+        recent = Job(job_type="noop", status="running", attempts=1, max_attempts=3, started_at=datetime.utcnow())
+        db.add_all([stale, exhausted, recent])
+        await db.commit()
+
+    await queue._requeue_stale_jobs()
+
+    assert (await _get(session_factory, stale.id)).status == "queued"
+    assert (await _get(session_factory, exhausted.id)).status == "failed"
+    assert (await _get(session_factory, recent.id)).status == "running"
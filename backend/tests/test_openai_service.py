@@ -0,0 +1,59 @@
+"""Response cache and token accounting, against the fake provider"""
+import asyncio
+
+import pytest
+
+from core.ai.providers import FakeProvider, Message
+from core.config import settings
+from projects.rfp_evaluation.schemas import RFPAnalysisOutput
+from shared.services.openai_service import OpenAIService
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "AI_RESPONSE_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "AI_RESPONSE_CACHE_DIR", str(tmp_path / "ai_responses"))
+    return OpenAIService(FakeProvider(responses={"gpt-4": '{"summary": "Facilities RFP", "compliance_score": 80}'}))
+
+
+async def test_cache_hits_bill_no_tokens(service):
+    messages = [Message(role="user", content="Analyze this RFP")]
+
+    first = await service.structured_completion(messages, RFPAnalysisOutput, model="gpt-4")
+    second = await service.structured_completion(messages, RFPAnalysisOutput, model="gpt-4")
+
+    assert service.provider.calls == 1
+    assert first.billed_tokens == first.response.tokens_used > 0
+    assert second.response.cached
+    assert second.response.tokens_used == first.response.tokens_used
+    assert second.billed_tokens == 0
+    assert second.data.summary == "Facilities RFP"
+
+
+async def test_uncached_requests_bill_every_call(service):
+    messages = [Message(role="user", content="Analyze this RFP")]
+
+    first = await service.chat_completion(messages, model="gpt-4", use_cache=False)
+    second = await service.chat_completion(messages, model="gpt-4", use_cache=False)
+
+    assert service.provider.calls == 2
+    assert first.billed_tokens == second.billed_tokens == first.tokens_used > 0
+
+
+async def test_cancelled_owner_does_not_cancel_callers_sharing_its_request(service):
+    service._provider = FakeProvider(latency_seconds=0.2)
+    messages = [Message(role="user", content="Analyze this RFP")]
+
+    owner = asyncio.create_task(service.chat_completion(messages, model="gpt-4"))
+    await asyncio.sleep(0.05)
+    waiter = asyncio.create_task(service.chat_completion(messages, model="gpt-4"))
+    await asyncio.sleep(0.05)
+    owner.cancel()
+
+    response = await waiter
+    assert owner.cancelled()
+    assert not response.cached
+    assert service.provider.calls == 2
+    assert service._inflight == {}
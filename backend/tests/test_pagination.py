@@ -0,0 +1,57 @@
+"""Keyset pagination cursors"""
+import base64
+import json
+from datetime import datetime
+
+import pytest
+
+from core.exceptions import ValidationException
+from core.pagination import Cursor, decode_cursor, encode_cursor
+
+
+def _forge(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+
+def test_cursor_round_trip():
+    cursor = Cursor(datetime(2024, 5, 1, 9, 30, 15, 123456), 42, 3)
+
+    encoded = encode_cursor(cursor)
+
+    assert "=" not in encoded
+    assert decode_cursor(encoded) == cursor
+
+
+@pytest.mark.parametrize("value", [
+    "not a cursor",
+    "%%%",
+    "é",
+    base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+    _forge("abc"),
+    _forge({"created_at": "2024-05-01T09:30:15", "id": 1, "page": 2}),
+    _forge(["2024-05-01T09:30:15", 1]),
+    _forge(["yesterday", 1, 2]),
+    _forge([None, 1, 2]),
+    "W" * 4000,
+])
+def test_malformed_cursor_is_rejected(value):
+    with pytest.raises(ValidationException, match="Invalid pagination cursor") as error:
+        decode_cursor(value)
+
+    assert error.value.status_code == 422
+
+
+@pytest.mark.parametrize("value", [
+    ["2024-05-01T09:30:15+05:00", 1, 2],  # aware: columns are naive UTC
+    ["2024-05-01T09:30:15", 1e400, 2],
+    ["2024-05-01T09:30:15", 1.5, 2],
+    ["2024-05-01T09:30:15", "1", 2],
+    ["2024-05-01T09:30:15", True, 2],
+    ["2024-05-01T09:30:15", 10**30, 2],
+    ["2024-05-01T09:30:15", -1, 2],
+    ["2024-05-01T09:30:15", 1, 0],
+    ["2024-05-01T09:30:15", 1, -3],
+])
+def test_forged_cursor_is_rejected(value):
+    with pytest.raises(ValidationException, match="Invalid pagination cursor"):
+        decode_cursor(_forge(value))
@@ -0,0 +1,18 @@
+"""Provider rate limiting"""
+import pytest
+
+from core.ai.providers import FakeProvider, Message, estimate_tokens
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_stream_closed_early_settles_its_reservation():
+    provider = FakeProvider(tokens_per_minute=10000, responses={"gpt-4": "x" * 400})
+    messages = [Message(role="user", content="Summarize the RFP")]
+
+    stream = provider.stream_chat_completion(messages, "gpt-4", max_tokens=1000)
+    streamed = "".join([(await stream.__anext__()).delta for _ in range(5)])
+    await stream.aclose()
+
+    charged = provider.limiter.capacity - provider.limiter._available
+    assert charged == pytest.approx(estimate_tokens(messages) + len(streamed) // 4, abs=2)
@@ -0,0 +1,117 @@
+"""RFP analysis: input checks, merging, stream status and job failure handling"""
+import pytest
+
+from core.exceptions import ValidationException
+from projects.rfp_evaluation.models import RFPEvaluation
+from projects.rfp_evaluation.schemas import RFPAnalysisOutput
+from projects.rfp_evaluation.services import RFPEvaluationService, _analysis_failed, _merge_analyses
+from shared.models.document import Document
+from shared.models.user import User
+from shared.services.document_service import DocumentService
+
+pytestmark = pytest.mark.anyio
+
+
+async def _create_evaluation(db, text: str, page_starts=None, status: str = "pending") -> RFPEvaluation:
+    user = User(email="analyst@example.com", full_name="Analyst", hashed_password="x")
+    db.add(user)
+    await db.flush()
+    document = Document(
+        user_id=user.id,
+        filename="rfp.pdf",
+        original_filename="rfp.pdf",
+        file_path="uploads/rfp.pdf",
+        file_size=1,
+        file_type="pdf",
+    )
+    extraction = {"text": text, "page_starts": page_starts, "num_pages": len(page_starts or [0])}
+    DocumentService._apply_extraction(document, extraction, DocumentService._compress_pages(extraction))
+    db.add(document)
+    await db.flush()
+    evaluation = RFPEvaluation(user_id=user.id, document_id=document.id, rfp_title="RFP", status=status)
+    db.add(evaluation)
+    await db.commit()
+    return evaluation
+
+
+async def test_whitespace_only_document_is_rejected_before_processing(session_factory):
+    async with session_factory() as db:
+        # A scanned, image-only PDF: one page break per page and no text
+        evaluation = await _create_evaluation(db, "\n\n\n\n", page_starts=[0, 1, 2, 3])
+        user = await db.get(User, evaluation.user_id)
+
+        with pytest.raises(ValidationException, match="Document text not available"):
+            await RFPEvaluationService.analyze_rfp(evaluation.id, user, db)
+
+    async with session_factory() as db:
+        assert (await db.get(RFPEvaluation, evaluation.id)).status == "pending"
+
+
+@pytest.mark.parametrize("status, expected", [
+    ("pending", "failed"),
+    ("processing", "failed"),
+    ("completed", "completed"),
+])
+async def test_failure_hook_fails_unfinished_evaluations(session_factory, status, expected):
+    async with session_factory() as db:
+        evaluation = await _create_evaluation(db, "Scope of work", status=status)
+
+    async with session_factory() as db:
+        await _analysis_failed({"evaluation_id": evaluation.id}, "boom", db)
+
+    async with session_factory() as db:
+        assert (await db.get(RFPEvaluation, evaluation.id)).status == expected
+
+
+async def test_stream_leaves_status_alone_until_it_starts(session_factory, monkeypatch):
+    monkeypatch.setattr("projects.rfp_evaluation.services.AsyncSessionLocal", session_factory)
+    async with session_factory() as db:
+        evaluation = await _create_evaluation(db, "Scope of work")
+        user = await db.get(User, evaluation.user_id)
+        _, rfp_text = await RFPEvaluationService.start_stream(evaluation.id, user, db)
+
+    # The client disconnected before the response body was iterated
+    await RFPEvaluationService.stream_analysis(evaluation.id, rfp_text).aclose()
+
+    async with session_factory() as db:
+        assert (await db.get(RFPEvaluation, evaluation.id)).status == "pending"
+
+
+async def test_stream_refuses_an_evaluation_already_processing(session_factory, monkeypatch):
+    monkeypatch.setattr("projects.rfp_evaluation.services.AsyncSessionLocal", session_factory)
+    async with session_factory() as db:
+        evaluation = await _create_evaluation(db, "Scope of work", status="processing")
+
+    events = [event async for event in RFPEvaluationService.stream_analysis(evaluation.id, "Scope of work")]
+
+    assert events == [{"event": "error", "data": {"message": "RFP analysis already in progress"}}]
+    async with session_factory() as db:
+        assert (await db.get(RFPEvaluation, evaluation.id)).status == "processing"
+
+
+def test_risk_categories_are_parsed_as_lists():
+    output = RFPAnalysisOutput.model_validate({"risk_assessment": {
+        "overall": "High",
+        "timeline_risks": "None identified",
+        "financial_risks": ["Fixed price"],
+        "legal_risks": None,
+    }})
+
+    assert output.risk_assessment == {
+        "overall": ["High"],
+        "timeline_risks": ["None identified"],
+        "financial_risks": ["Fixed price"],
+    }
+    assert RFPAnalysisOutput.model_validate({"risk_assessment": "Low"}).risk_assessment == {"risks": ["Low"]}
+
+
+def test_merge_keeps_string_risks_whole():
+    merged = _merge_analyses(
+        [
+            {"risk_assessment": {"overall": "High", "legal": ["Uncapped liability"]}},
+            {"risk_assessment": {"overall": "Low", "legal": "Uncapped liability"}},
+        ],
+        [1, 1],
+    )
+
+    assert merged["risk_assessment"] == {"overall": ["High", "Low"], "legal": ["Uncapped liability"]}
@@ -0,0 +1,58 @@
+"""Resumable uploads: appends are serialized through a lock on the .part file"""
+import hashlib
+
+import pytest
+
+from core.exceptions import ConflictException
+from shared.models.user import User
+from shared.services.storage_service import StorageService
+
+fcntl = pytest.importorskip("fcntl")
+pytestmark = pytest.mark.anyio
+
+USER = User(id=1, email="analyst@example.com", roles=["user"], auth_provider="local")
+
+
+async def _body(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.fixture
+async def upload(tmp_path):
+    storage = StorageService(str(tmp_path))
+    session = await storage.create_session("rfp.pdf", 8, USER)
+    return storage, session
+
+
+async def test_chunks_complete_into_the_stored_file(upload):
+    storage, session = upload
+    await storage.append_chunk(session, 0, _body(b"abc"))
+    session = await storage.get_session(session.upload_id, USER)
+    await storage.append_chunk(session, 3, _body(b"de", b"fgh"))
+
+    stored = await storage.complete_session(session, "rfp")
+
+    assert stored.path.read_bytes() == b"abcdefgh"
+    assert stored.sha256 == hashlib.sha256(b"abcdefgh").hexdigest()
+
+
+async def test_append_refused_while_another_worker_holds_the_upload(upload):
+    storage, session = upload
+    with open(storage._part_path(session.upload_id), "r+b") as other:
+        fcntl.flock(other.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        with pytest.raises(ConflictException):
+            await storage.append_chunk(session, 0, _body(b"abc"))
+
+    await storage.append_chunk(session, 0, _body(b"abc"))
+    assert session.received == 3
+
+
+async def test_offset_rechecked_after_another_worker_appended(upload):
+    storage, session = upload
+    stale = await storage.get_session(session.upload_id, USER)
+    await storage.append_chunk(session, 0, _body(b"abc"))
+
+    with pytest.raises(ConflictException):
+        await storage.append_chunk(stale, 0, _body(b"xyz"))
+    assert storage._part_path(session.upload_id).read_bytes() == b"abc"
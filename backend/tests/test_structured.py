@@ -0,0 +1,64 @@
+"""Structured output: parsing and repairing model JSON"""
+import pytest
+
+from core.ai.structured import _remove_trailing_commas, parse_json
+
+
+@pytest.mark.parametrize("text", [
+    '```json\n{"a": 1}\n```',
+    '```\n{"a": 1}\n```',
+    '  {"a": 1}\n',
+])
+def test_fenced_json_parses_strictly(text):
+    parsed = parse_json(text)
+
+    assert parsed.value == {"a": 1}
+    assert parsed.complete
+    assert not parsed.repaired
+
+
+def test_trailing_commas_are_removed():
+    parsed = parse_json('```json\n{"a": [1, 2,], "b": {"c": 3,},}\n```')
+
+    assert parsed.value == {"a": [1, 2], "b": {"c": 3}}
+    assert parsed.complete
+    assert parsed.repaired
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"a": ",}", "b": [1, ]}', '{"a": ",}", "b": [1 ]}'),
+    ('{"a": "x, ]"}', '{"a": "x, ]"}'),
+    ('{"a": "quote \\", ]", }', '{"a": "quote \\", ]" }'),
+    ('["back\\\\", ]', '["back\\\\" ]'),
+])
+def test_commas_inside_strings_are_kept(text, expected):
+    assert _remove_trailing_commas(text) == expected
+
+
+def test_object_is_found_in_surrounding_prose():
+    parsed = parse_json('Here is the analysis: {"a": 1} Let me know if you need more.')
+
+    assert parsed.value == {"a": 1}
+    assert parsed.complete
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"a": "done", "b": "cut off mid', {"a": "done"}),
+    ('{"a": "done", "b": ["x", "y', {"a": "done", "b": ["x"]}),
+    ('{"a": "done", "b": "ends on an escape \\', {"a": "done"}),
+])
+def test_truncation_mid_string_keeps_complete_values(text, expected):
+    parsed = parse_json(text)
+
+    assert parsed.value == expected
+    assert parsed.found
+    assert not parsed.complete
+    assert parsed.repaired
+
+
+@pytest.mark.parametrize("text", ["", None, "no JSON here", "```json\n```"])
+def test_output_without_an_object(text):
+    parsed = parse_json(text)
+
+    assert parsed.value is None
+    assert not parsed.found
@@ -0,0 +1,31 @@
+"""Usage reports: request periods"""
+from datetime import datetime, timedelta, timezone
+
+from shared.services.usage_service import _period
+
+
+def test_aware_bounds_are_converted_to_naive_utc():
+    since = datetime(2024, 5, 1, 12, 0, tzinfo=timezone(timedelta(hours=2)))
+    until = datetime(2024, 5, 2, 0, 0, tzinfo=timezone(timedelta(hours=-5)))
+
+    assert _period(since, until, 30) == (datetime(2024, 5, 1, 10, 0), datetime(2024, 5, 2, 5, 0))
+
+
+def test_naive_bounds_are_taken_as_utc():
+    since, until = datetime(2024, 5, 1), datetime(2024, 5, 2)
+
+    assert _period(since, until, 30) == (since, until)
+
+
+def test_default_period_ends_now_and_spans_days():
+    since, until = _period(None, None, 7)
+
+    assert until.tzinfo is None
+    assert abs((datetime.utcnow() - until).total_seconds()) < 5
+    assert until - since == timedelta(days=7)
+
+
+def test_aware_until_with_default_since():
+    until = datetime(2024, 5, 2, 2, 0, tzinfo=timezone(timedelta(hours=2)))
+
+    assert _period(None, until, 1) == (datetime(2024, 5, 1, 0, 0), datetime(2024, 5, 2, 0, 0))
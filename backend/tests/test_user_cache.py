@@ -0,0 +1,47 @@
+"""User cache: hits are independent copies, writes invalidate"""
+import pytest
+from sqlalchemy import update
+
+from core.config import settings
+from core.user_cache import UserCache, user_cache
+from shared.models.user import User
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_cached_users_share_no_mutable_values():
+    cache = UserCache()
+    user = User(id=1, email="analyst@example.com", roles=["user"], auth_provider="local")
+    await cache.set(user)
+
+    user.roles.append("admin")
+    first = await cache.get(1)
+    first.roles.append("admin")
+    second = await cache.get(1)
+
+    assert second.roles == ["user"]
+    assert first is not second
+
+
+async def test_bulk_update_drops_matching_entries(session_factory):
+    async with session_factory() as db:
+        db.add_all([
+            User(id=1, email="a@example.com", roles=["user"], auth_provider="local"),
+            User(id=2, email="b@example.com", roles=["user"], auth_provider="local"),
+        ])
+        await db.commit()
+        for user_id in (1, 2):
+            await user_cache.set(await db.get(User, user_id))
+
+        await db.execute(update(User).where(User.id == 1).values(roles=["user", "admin"]))
+        await db.commit()
+
+    assert await user_cache.get(1) is None
+    assert await user_cache.get(2) is not None
+    user_cache.local.clear()
+
+
+def test_local_tier_is_short_lived_behind_a_shared_tier(monkeypatch):
+    monkeypatch.setattr(settings, "SHARED_CACHE_URL", "redis://localhost:6379/0")
+
+    assert UserCache().local.ttl_seconds == settings.USER_CACHE_LOCAL_TTL_SECONDS
@@ -0,0 +1,35 @@
+"""Vector index store: memory tier over a size-bounded disk tier"""
+import numpy as np
+import pytest
+
+from core.ai.vector_index import VectorIndex, VectorIndexStore
+
+pytestmark = pytest.mark.anyio
+
+
+def _index(n: int = 4, seed: int = 0) -> VectorIndex:
+    vectors = np.random.default_rng(seed).normal(size=(n, 8))
+    return VectorIndex.build(vectors, [{"text": f"chunk {i}"} for i in range(n)], "test-model")
+
+
+async def test_indexes_survive_a_fresh_store(tmp_path):
+    await VectorIndexStore(str(tmp_path), max_bytes=1 << 20).set("doc-a/model", _index())
+
+    loaded = await VectorIndexStore(str(tmp_path), max_bytes=1 << 20).get("doc-a/model")
+
+    assert loaded is not None
+    assert loaded.chunks == [{"text": f"chunk {i}"} for i in range(4)]
+    np.testing.assert_array_equal(loaded.vectors, _index().vectors)
+
+
+async def test_disk_tier_evicts_past_max_bytes(tmp_path):
+    size = len(_index().to_bytes())
+    store = VectorIndexStore(str(tmp_path), max_bytes=size * 2, cache_entries=1)
+    for n in range(4):
+        await store.set(f"doc-{n}", _index(seed=n))
+
+    info = store.info()["disk"]
+    assert info["entries"] == 2
+    assert info["size_bytes"] <= size * 2
+    assert await store.get("doc-0") is None
+    assert await store.get("doc-2") is not None